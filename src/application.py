@@ -1,25 +1,45 @@
+import time
+
+# Time at which the application started, used to report the time spent
+# importing modules and the time until the window is first painted.
+START_TIME = time.perf_counter()
+START_CPU_TIME = time.process_time()
+
 import wx
 
 import logger as log
 import window as win
 
+# Wall time and cpu time spent importing the modules above.
+IMPORT_TIME = time.perf_counter() - START_TIME
+IMPORT_CPU_TIME = time.process_time() - START_CPU_TIME
+
 def main():
-	# Initialize logger class.
-	logger = log.Logger(loglevel=log.LogLevel.ERROR)
+	# Initialize logger class. Messages are streamed to the log file as they
+	# arrive, only the most recent messages are kept in memory.
+	logger = log.Logger(loglevel=log.LogLevel.ERROR, streaming=True)
 
 	# Create log program start message.
 	logger.log_info("Application started")
+	logger.record_timing("startup/imports", IMPORT_TIME, IMPORT_CPU_TIME)
 
-	# Run user interface.
-	app = wx.App(False)
-	window = win.MainWindow(None, "Duolingo Data Visualizer", "Rubenanz", \
-		logger)
+	# Run user interface. The window is shown with the images of the
+	# previous run before the plots are regenerated.
+	with logger.timer("startup/create_app"):
+		app = wx.App(False)
+	with logger.timer("startup/create_window"):
+		window = win.MainWindow(None, "Duolingo Data Visualizer", \
+			"Rubenanz", logger, start_time=START_TIME)
 	app.MainLoop()
 
 	# Create log program end message.
 	logger.log_info("Application stopped")
 
-	# Export log to `logs` folder.
+	# Log the timing summary of all stages and export the timings as json.
+	logger.log_timing_summary()
+	logger.export_timings()
+
+	# Export log to `logs` folder, writes the remaining messages.
 	logger.output_to_file()
 
 if __name__ == "__main__":
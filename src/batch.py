@@ -0,0 +1,157 @@
+import argparse
+from concurrent.futures import as_completed, ProcessPoolExecutor
+import contextlib
+import multiprocessing
+import os
+import sys
+
+import generate_plots as gp
+import logger as log
+import plot_catalog as cat
+
+# Exit codes: all users succeeded, at least one user failed, or no users
+# were found.
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+EXIT_NO_USERS = 2
+
+def render_user(username: str, force: bool, plot_workers: int):
+	"""
+	Assumes `username` is a string. Regenerates the plots of the user, runs
+	in a worker process. The messages and timings are collected by a logger
+	in the worker and returned, so the main process can add them to its own
+	log. Returns a tuple containing the username, the summary returned by
+	gp.regenerate_plots() (False if the user folder does not exist), the 
+	list of message records and the list of timings.
+	"""
+	# Create logger collecting the messages, they are output by the main
+	# process, so the console output of the worker is discarded.
+	with open(os.devnull, "w") as devnull, \
+		contextlib.redirect_stdout(devnull):
+		logger = log.Logger(loglevel=log.LogLevel.INFO)
+		logger.messages.clear()
+
+		# Regenerate plots, catch any error so it is reported for this user.
+		try:
+			with logger.timer(f"render_user/{username}"):
+				result = gp.regenerate_plots(username, logger, force=force, \
+					workers=plot_workers)
+		except Exception as e:
+			logger.log_error(f"Failed to regenerate plots for user " \
+				f"`{username}`: {e}")
+			result = False
+
+	# Return result, messages and timings.
+	return username, result, list(logger.messages), list(logger.timings)
+
+def render_users(usernames: list, logger, workers=None, force=False, \
+	plot_workers=1):
+	"""
+	Assumes `usernames` is a list of strings. Regenerates the plots of all
+	users in a pool of `workers` processes (one per cpu if None), every
+	process handles one user at a time and renders its plots using
+	`plot_workers` processes. Adds the messages of every user to the logger.
+	Returns a dictionary mapping every username to its summary as returned
+	by gp.regenerate_plots(), or False if it failed.
+	"""
+	# Initialize results dictionary.
+	results = {}
+
+	# Run the users in a process pool. The spawn start method is used, as
+	# the render workers of the users are spawned as well.
+	context = multiprocessing.get_context("spawn")
+	with ProcessPoolExecutor(max_workers=workers, mp_context=context) \
+		as executor:
+		futures = {executor.submit(render_user, username, force, \
+			plot_workers): username for username in usernames}
+
+		# Collect results as they complete.
+		for future in as_completed(futures):
+			username = futures[future]
+			try:
+				username, result, records, timings = future.result()
+			except Exception as e:
+				logger.log_error(f"Worker for user `{username}` failed: {e}")
+				results[username] = False
+				continue
+
+			# Add the messages and timings of the worker to the log.
+			for timestamp, loglevel, message in records:
+				logger.add_message(loglevel, message, timestamp=timestamp)
+			logger.timings.extend(timings)
+
+			results[username] = result
+
+	# Return results.
+	return results
+
+def print_summary(results: dict):
+	"""
+	Assumes `results` is a dictionary as returned by render_users(). Prints a
+	table with the amount of rebuilt, skipped, failed and unavailable plots
+	of every user. Unavailable plots lack their column in the data, they do
+	not make a user fail.
+	"""
+	print(f"{'user':<24} {'status':>7} {'rebuilt':>8} {'skipped':>8} " \
+		f"{'failed':>7} {'unavailable':>12}")
+	for username in sorted(results.keys()):
+		result = results[username]
+		if result is False:
+			print(f"{username:<24} {'FAILED':>7} {'-':>8} {'-':>8} " \
+				f"{'-':>7} {'-':>12}")
+		else:
+			status = "OK" if result["failed"] == 0 else "FAILED"
+			print(f"{username:<24} {status:>7} {result['rebuilt']:>8} " \
+				f"{result['skipped']:>8} {result['failed']:>7} " \
+				f"{result['unavailable']:>12}")
+
+def main():
+	# Parse arguments.
+	parser = argparse.ArgumentParser(description="Render the plots of " \
+		"multiple users without user interface. Exits with 0 if all users " \
+		f"succeeded, {EXIT_FAILURE} if any user failed and {EXIT_NO_USERS} " \
+		"if there were no users.")
+	parser.add_argument("usernames", nargs="*", \
+		help="users to render, the folders in `data/` are used if omitted")
+	parser.add_argument("--workers", type=int, default=None, \
+		help="amount of users rendered in parallel (default: one per cpu)")
+	parser.add_argument("--plot-workers", type=int, default=1, \
+		help="amount of processes rendering the plots of one user")
+	parser.add_argument("--force", action="store_true", \
+		help="regenerate all plots, also if the data did not change")
+	args = parser.parse_args()
+
+	# Initialize logger, messages are streamed to the log file.
+	logger = log.Logger(loglevel=log.LogLevel.ERROR, streaming=True)
+	logger.log_info("Batch rendering started")
+
+	# Get usernames.
+	usernames = args.usernames or cat.find_usernames()
+	if len(usernames) == 0:
+		logger.log_error("No users to render")
+		logger.output_to_file()
+		return EXIT_NO_USERS
+
+	# Render users.
+	with logger.timer("render_users"):
+		results = render_users(usernames, logger, workers=args.workers, \
+			force=args.force, plot_workers=args.plot_workers)
+
+	# Print summary and determine exit code.
+	print_summary(results)
+	failed_users = [username for username, result in results.items() \
+		if result is False or result["failed"] > 0]
+	succeeded_users = len(results) - len(failed_users)
+	logger.log_info(f"Batch rendering stopped ({succeeded_users} users " \
+		f"succeeded, {len(failed_users)} failed)")
+
+	# Export log to `logs` folder.
+	logger.log_timing_summary()
+	logger.export_timings()
+	logger.output_to_file()
+
+	# Return exit code.
+	return EXIT_FAILURE if len(failed_users) > 0 else EXIT_SUCCESS
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,799 @@
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import contextlib
+from datetime import datetime, timedelta
+import multiprocessing
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import matplotlib.image as mpimg
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+import data_watcher as dw
+import generate_data as gd
+import generate_plots as gp
+import logger as log
+
+def time_function(function, *args, repeats=3, setup=None):
+	"""
+	Assumes `function` is a callable. Calls `function` with the supplied
+	arguments `repeats` times and returns a tuple containing the fastest
+	wall time in seconds and the return value of the last call. If `setup`
+	is not None, it is called without arguments before every call, outside
+	of the timing.
+	"""
+	# Initialize best time and result.
+	best_time = None
+	result = None
+
+	# Call the function `repeats` times and keep the fastest time.
+	for _ in range(repeats):
+		if setup is not None:
+			setup()
+		start = time.perf_counter()
+		result = function(*args)
+		elapsed = time.perf_counter() - start
+
+		if best_time is None or elapsed < best_time:
+			best_time = elapsed
+
+	# Return fastest time and result.
+	return best_time, result
+
+def make_date_dataframe(rows: int):
+	"""
+	Assumes `rows` is an integer. Returns a dataframe with a `date` column
+	containing `rows` date strings in the format `dd-mm-yyyy`. The dates
+	repeat every ten years, comparable to multiple daily histories of several
+	years concatenated.
+	"""
+	# Construct the date strings for ten years of daily entries.
+	start_date = datetime(2012, 1, 1)
+	dates = [(start_date + timedelta(days=day)).strftime(gp.DATE_FORMAT) \
+		for day in range(3650)]
+
+	# Repeat the dates until the requested amount of rows is reached.
+	return pd.DataFrame({"date": np.resize(np.array(dates, dtype=object), \
+		rows)})
+
+def make_language_dataframe(rows: int, seed=0):
+	"""
+	Assumes `rows` is an integer. Returns a dataframe shaped like a language
+	data file after add_time_column() and derive_metrics(), with `rows`
+	consecutive days of synthetic data as generated by 
+	generate_data.make_language_data().
+	"""
+	# Construct data ending at a fixed date, so results are reproducible.
+	df = gd.make_language_data(rows, end_date=datetime(2022, 2, 15), \
+		seed=seed)
+
+	# Add time column and derived metrics.
+	df["seconds_since_epoch"] = gp.dates_to_seconds_since_epoch(df["date"])
+	metrics = gp.compute_derived_metrics({column: df[column].to_numpy() \
+		for column in gp.METRIC_INPUT_COLUMNS})
+	for column, values in metrics.items():
+		df[column] = values
+
+	# Return dataframe.
+	return df
+
+def add_time_column_loop(lang_dict: dict):
+	"""
+	Assumes `lang_dict` is a dictionary containing dataframes. Reference
+	implementation of add_time_column() which converts the `date` column row
+	by row, used to compare against the batched conversion.
+	"""
+	# Define epoch date.
+	epoch_date = datetime.strptime("01-01-2010", "%d-%m-%Y")
+
+	# Loop over all entries in the dictionary.
+	for lang, df in lang_dict.items():
+		# Initialize list of seconds since epoch.
+		seconds_since_epoch_list = []
+
+		# Loop all rows in the dataframe.
+		for index, row in df.iterrows():
+			# Convert `date` entry to seconds since epoch and add to list.
+			current_date = datetime.strptime(row["date"], "%d-%m-%Y")
+			seconds_since_epoch = (current_date - epoch_date).total_seconds()
+			seconds_since_epoch_list.append(seconds_since_epoch)
+
+		# Add column to dataframe.
+		df["seconds_since_epoch"] = seconds_since_epoch_list
+		# Convert column from float64 to int64.
+		df["seconds_since_epoch"] = df["seconds_since_epoch"].astype(np.int64)
+
+	# Return dictionary.
+	return lang_dict
+
+def benchmark_add_time_column(row_counts=(10_000, 100_000, 1_000_000)):
+	"""
+	Assumes `row_counts` is an iterable of integers. Times the row by row
+	reference implementation against add_time_column() for every amount of
+	rows, checks that both produce identical columns and prints the results.
+	"""
+	# Create logger which does not print info messages.
+	logger = log.Logger(loglevel=log.LogLevel.ERROR)
+
+	print("add_time_column()")
+	print(f"{'rows':>10} {'loop (s)':>10} {'cold (s)':>10} " \
+		f"{'warm (s)':>10} {'speedup':>8}")
+
+	for rows in row_counts:
+		# The row by row implementation is slow, only run it once.
+		loop_time, loop_dict = time_function(add_time_column_loop, \
+			{"lang": make_date_dataframe(rows)}, repeats=1)
+
+		# Clear the parsed date cache so the first batched call starts cold,
+		# the following calls use the cache. add_time_column() skips 
+		# dataframes which already have the column, so it is dropped before
+		# every warm call.
+		batched_dict = {"lang": make_date_dataframe(rows)}
+		gp._parsed_date_cache.clear()
+		cold_time, _ = time_function(gp.add_time_column, batched_dict, \
+			logger, repeats=1)
+		drop_column = lambda: batched_dict["lang"].drop( \
+			columns="seconds_since_epoch", inplace=True)
+		warm_time, batched_dict = time_function(gp.add_time_column, \
+			batched_dict, logger, setup=drop_column)
+
+		# Check that both implementations produce the same column.
+		loop_col = loop_dict["lang"]["seconds_since_epoch"]
+		batched_col = batched_dict["lang"]["seconds_since_epoch"]
+		assert loop_col.dtype == batched_col.dtype == np.int64
+		assert np.array_equal(loop_col.to_numpy(), batched_col.to_numpy())
+
+		print(f"{rows:>10} {loop_time:>10.3f} {cold_time:>10.3f} " \
+			f"{warm_time:>10.3f} {loop_time / cold_time:>7.1f}x")
+
+def benchmark_export_plots_workers(worker_counts=(1, 2, 4, 8), \
+	languages=4, rows=3650):
+	"""
+	Assumes `worker_counts` is an iterable of positive integers. Times
+	export_plots() for `languages` languages of `rows` rows each, for every
+	amount of render workers, and prints the results. The plots are written
+	to a temporary folder.
+	"""
+	# Create logger which does not print info messages.
+	logger = log.Logger(loglevel=log.LogLevel.ERROR)
+
+	# Create language dataframes.
+	lang_dict = {f"lang{index}": make_language_dataframe(rows, seed=index) \
+		for index in range(languages)}
+	plots = languages * len(gp.PLOT_NAMES)
+
+	print(f"export_plots() ({languages} languages, {plots} plots, " \
+		f"{rows} rows)")
+	print(f"{'workers':>10} {'time (s)':>10} {'plots/s':>10} {'speedup':>8}")
+
+	# Export plots from within a temporary folder, export_plots() writes to
+	# the relative folder `figures/`.
+	working_directory = os.getcwd()
+	with tempfile.TemporaryDirectory() as folder:
+		os.chdir(folder)
+		try:
+			serial_time = None
+			for workers in worker_counts:
+				elapsed, _ = time_function(gp.export_plots, lang_dict, \
+					"benchmark", logger, workers, repeats=1)
+				if serial_time is None:
+					serial_time = elapsed
+
+				print(f"{workers:>10} {elapsed:>10.3f} " \
+					f"{plots / elapsed:>10.2f} {serial_time / elapsed:>7.2f}x")
+		finally:
+			os.chdir(working_directory)
+
+def export_plots_new_figures(lang_dict: dict, username: str, logger):
+	"""
+	Assumes `lang_dict` is a dictionary containing dataframes. Reference
+	implementation of export_plots() which creates a new figure for every
+	plot and only closes all figures at the end, used to compare against the
+	reused template figure.
+	"""
+	# Construct monthly xticks from 2010 until the current year.
+	xticks = []
+	xlabels = []
+	for year in range(2010, datetime.now().year + 1):
+		for month in range(1, 13):
+			xticks.append((datetime(year, month, 1) - gp.EPOCH_DATE)\
+				.total_seconds())
+			xlabels.append(f"{month:02}/{year}")
+
+	# Loop over all dataframes and export a new figure for every plot.
+	for lang, df in lang_dict.items():
+		os.makedirs(f"figures/{username}/{lang}", exist_ok=True)
+		x = df["seconds_since_epoch"]
+		xmin = min(x) - (86400 * gp.EXTRA_DAYS)
+		xmax = max(x) + (86400 * gp.EXTRA_DAYS)
+
+		for plot_name, spec in gp.PLOT_SPECS.items():
+			fig, ax = plt.subplots()
+			ax.plot(x, df[spec["column"]], **spec["style"])
+			ax.set_xlabel("Date")
+			ax.set_ylabel(spec["ylabel"])
+			ax.set_title(spec["title"])
+			ax.set_xticks(xticks, xlabels, rotation=gp.XTICKS_ROTATION)
+			ax.set_xlim(xmin, xmax)
+			fig.tight_layout()
+			fig.savefig(f"figures/{username}/{lang}/{plot_name}.png", \
+				dpi=gp.PLOT_DPI)
+
+	# Close all figures.
+	plt.close("all")
+
+def run_measured(folder: str, function, args: tuple):
+	"""
+	Assumes `folder` is a string and `function` is a callable. Runs the
+	function with the supplied arguments from within `folder` using the Agg
+	backend. Returns a tuple containing the wall time in seconds, the
+	resident memory before the call and the peak resident memory of the
+	process in megabytes. Meant to be run in a fresh process.
+	"""
+	# Change working directory and select Agg backend.
+	os.chdir(folder)
+	plt.switch_backend("Agg")
+
+	# Get resident memory before the call, ru_maxrss is in kilobytes.
+	start_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+	# Call the function.
+	start = time.perf_counter()
+	function(*args)
+	elapsed = time.perf_counter() - start
+
+	# Get peak resident memory.
+	peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+	# Return measurements.
+	return elapsed, start_rss, peak_rss
+
+def measure_in_subprocess(function, *args):
+	"""
+	Assumes `function` is a callable. Runs the function with the supplied
+	arguments in a fresh process from within a temporary folder, so its peak
+	resident memory is not influenced by earlier benchmarks. Returns the
+	measurements returned by run_measured().
+	"""
+	# Run the function in a fresh spawned process.
+	context = multiprocessing.get_context("spawn")
+	with tempfile.TemporaryDirectory() as folder:
+		with ProcessPoolExecutor(max_workers=1, mp_context=context) \
+			as executor:
+			return executor.submit(run_measured, folder, function, args)\
+				.result()
+
+def benchmark_template_figure(languages=30, rows=3650):
+	"""
+	Times the peak resident memory and wall time of creating a new figure for
+	every plot against reusing one template figure, for `languages`
+	languages of `rows` rows each, and prints the results.
+	"""
+	# Create logger which does not print info messages.
+	logger = log.Logger(loglevel=log.LogLevel.ERROR)
+
+	# Create language dataframes.
+	lang_dict = {f"lang{index}": make_language_dataframe(rows, seed=index) \
+		for index in range(languages)}
+
+	print(f"Figure reuse ({languages} languages, " \
+		f"{languages * len(gp.PLOT_NAMES)} plots, {rows} rows)")
+	print(f"{'method':>15} {'time (s)':>10} {'peak RSS growth (MB)':>21}")
+
+	# Measure both implementations in fresh processes.
+	for name, function in [("new figures", export_plots_new_figures), \
+		("template figure", gp.export_plots)]:
+		elapsed, start_rss, peak_rss = measure_in_subprocess(function, \
+			lang_dict, "benchmark", logger)
+		print(f"{name:>15} {elapsed:>10.3f} {peak_rss - start_rss:>21.1f}")
+
+def make_dense_series(points: int, days=3650, seed=0):
+	"""
+	Assumes `points` is a positive integer. Returns a tuple containing `x`
+	and `y` arrays of `points` evenly spaced samples spanning `days` days,
+	shaped like the `daily_xp` column with occasional spikes, to simulate
+	data logged at a finer grain than one entry per day.
+	"""
+	# Create random number generator.
+	rng = np.random.default_rng(seed)
+
+	# Construct evenly spaced seconds since the epoch.
+	x = np.linspace(0, days * 86400, points).astype(np.int64)
+
+	# Construct values with spikes.
+	y = rng.integers(10, 150, size=points).astype(np.int32)
+	spikes = rng.random(points) < 0.0005
+	y[spikes] += rng.integers(300, 1500, size=spikes.sum()).astype(np.int32)
+
+	# Return series.
+	return x, y
+
+def render_downsampled(renderer, x, y, method):
+	"""
+	Reduces the series using `method` and renders it to memory using
+	`renderer`, as export_plots() does. Returns a tuple containing the 
+	amount of plotted points and the RGB array.
+	"""
+	# Reduce and render series.
+	width = gp.get_plot_width(gp.PLOT_DPI)
+	x, y = gp.downsample(x, y, width, method=method)
+	image = renderer.render(x, y, "daily_xp", None, x[0], x[-1], \
+		gp.PLOT_DPI)
+
+	# Return amount of points and image.
+	return len(x), image
+
+def benchmark_downsample(point_counts=(10_000, 100_000, 1_000_000)):
+	"""
+	Assumes `point_counts` is an iterable of integers. Times rendering a 
+	series of every amount of points to memory without reducing it and with
+	every downsample method, and prints the results including whether the
+	highest spike is still drawn.
+	"""
+	# Create renderer.
+	renderer = gp.PlotRenderer()
+
+	print(f"Downsampling ({gp.get_plot_width(gp.PLOT_DPI)} pixels wide)")
+	print(f"{'points':>10} {'method':>7} {'plotted':>8} {'time (s)':>10} " \
+		f"{'speedup':>8} {'spike kept':>10}")
+
+	try:
+		for points in point_counts:
+			x, y = make_dense_series(points)
+			full_time = None
+			for method in [None, "minmax", "lttb"]:
+				elapsed, (plotted, image) = time_function( \
+					render_downsampled, renderer, x, y, method)
+				if full_time is None:
+					full_time = elapsed
+
+				# The y-limits only cover the highest spike if it was kept.
+				spike_kept = renderer.ax.get_ylim()[1] >= y.max()
+
+				print(f"{points:>10} {str(method):>7} {plotted:>8} " \
+					f"{elapsed:>10.3f} {full_time / elapsed:>7.2f}x " \
+					f"{'yes' if spike_kept else 'no':>10}")
+	finally:
+		renderer.close()
+
+def make_anomalous_dataframe(rows: int, seed=0):
+	"""
+	Assumes `rows` is an integer of at least 1000. Returns a dataframe with
+	the `seconds_since_epoch` column and the data columns, with one entry 
+	per hour so a million rows stay within the dates supported by pandas.
+	The anomalies checked by validate_frame() are injected: a block of rows
+	stamped one year early, a duplicate date, negative daily experience and
+	a dip in the total experience.
+	"""
+	# Create random number generator.
+	rng = np.random.default_rng(seed)
+
+	# Construct hourly entries.
+	seconds = np.arange(rows, dtype=np.int64) * 3600
+	daily_xp = rng.integers(0, 150, size=rows)
+	total_xp = np.cumsum(daily_xp)
+	words = np.cumsum(rng.integers(0, 8, size=rows))
+	level = np.searchsorted(gd.LEVEL_THRESHOLDS, total_xp, side="right")
+
+	# Inject anomalies.
+	block = slice(rows // 2, rows // 2 + rows // 100)
+	seconds[block] -= 365 * 86400
+	seconds[rows // 4 + 1] = seconds[rows // 4]
+	daily_xp[rows // 3] = -10
+	total_xp[3 * rows // 4] -= 1000
+
+	# Return dataframe.
+	return pd.DataFrame({"seconds_since_epoch": seconds, \
+		"daily_xp": daily_xp, "total_xp": total_xp, \
+		"total_words_learned": words, "level": level})
+
+def benchmark_validate(row_counts=(10_000, 100_000, 1_000_000)):
+	"""
+	Assumes `row_counts` is an iterable of integers. Times validate_frame()
+	on dataframes with injected anomalies for every amount of rows and 
+	prints the results, the time per row shows whether it scales linearly.
+	"""
+	print("validate_frame()")
+	print(f"{'rows':>10} {'time (s)':>10} {'ns/row':>8} {'findings':>9} " \
+		f"{'kept':>10}")
+
+	for rows in row_counts:
+		df = make_anomalous_dataframe(rows)
+		elapsed, (validated, findings) = time_function(gp.validate_frame, df)
+		print(f"{rows:>10} {elapsed:>10.3f} {elapsed / rows * 1e9:>8.1f} " \
+			f"{len(findings):>9} {len(validated):>10}")
+
+def write_language_files(username: str, languages: int, rows: int):
+	"""
+	Writes `languages` data files of `rows` rows each to the folder
+	`data/{username}/` in the semicolon separated format read by
+	load_data(). Files of more than ten years of rows repeat a ten year
+	history, as dates cannot go back further than year 1.
+	"""
+	# Create user folder.
+	os.makedirs(f"data/{username}", exist_ok=True)
+
+	# Write data files with only the columns of the data files.
+	for index in range(languages):
+		df = make_language_dataframe(min(rows, 3650), seed=index)
+		df = df[list(gp.DATA_SCHEMA.keys())]
+		if rows > len(df):
+			df = df.iloc[np.resize(np.arange(len(df)), rows)]
+		df.to_csv(f"data/{username}/lang{index}.csv", sep=";", index=False)
+
+def load_csv_frames(username: str, logger):
+	"""
+	Loads the dataframes of the user from the csv files and adds the time
+	column, without using the frame cache or the parsed date cache.
+	"""
+	# Clear parsed date cache, load data and add time column.
+	gp._parsed_date_cache.clear()
+	return gp.add_time_column(gp.load_data(username, logger), logger)
+
+def load_cached_frames(username: str, logger):
+	"""
+	Loads the dataframes of the user using the frame cache, without using
+	the parsed date cache. The dataframes are not validated and get no
+	derived metrics, so they compare to load_csv_frames().
+	"""
+	# Clear parsed date cache, load data from the cache and add the time 
+	# column to dataframes of which the cache is outdated.
+	gp._parsed_date_cache.clear()
+	return gp.add_time_column(gp.load_data(username, logger, \
+		use_cache=True), logger)
+
+def benchmark_frame_cache(row_counts=(3650, 100_000, 1_000_000), \
+	languages=4):
+	"""
+	Times loading the dataframes of `languages` data files from the csv files
+	against loading them from the frame cache, for every amount of rows, and
+	prints the results. The files are written to a temporary folder.
+	"""
+	# Create logger which does not print info messages.
+	logger = log.Logger(loglevel=log.LogLevel.ERROR)
+
+	print(f"Frame cache ({languages} languages)")
+	print(f"{'rows':>10} {'csv (s)':>10} {'cache (s)':>10} {'speedup':>8}")
+
+	# Load data from within a temporary folder, the data and cache folders
+	# are relative.
+	working_directory = os.getcwd()
+	for rows in row_counts:
+		with tempfile.TemporaryDirectory() as folder:
+			os.chdir(folder)
+			try:
+				# Write data files and fill the frame cache.
+				write_language_files("benchmark", languages, rows)
+				gp.load_frames("benchmark", logger)
+
+				# Time both paths.
+				csv_time, csv_dict = time_function(load_csv_frames, \
+					"benchmark", logger)
+				cache_time, cache_dict = time_function(load_cached_frames, \
+					"benchmark", logger)
+			finally:
+				os.chdir(working_directory)
+
+		# Check that both paths produce the same dataframes.
+		for lang, df in csv_dict.items():
+			pd.testing.assert_frame_equal(df, cache_dict[lang])
+
+		print(f"{rows:>10} {csv_time:>10.3f} {cache_time:>10.3f} " \
+			f"{csv_time / cache_time:>7.1f}x")
+
+def append_rows(username: str, lang: str, rows: int):
+	"""
+	Appends `rows` copies of the last row of the data file of the language
+	of the user to the file, as if new days were added.
+	"""
+	# Find last row.
+	filename = f"data/{username}/{lang}.csv"
+	with open(filename, "rb") as file:
+		file.seek(max(file.seek(0, os.SEEK_END) - 4096, 0))
+		last_row = file.read().rstrip(b"\r\n").split(b"\n")[-1]
+
+	# Append copies of the last row.
+	with open(filename, "ab") as file:
+		file.write((last_row + b"\n") * rows)
+
+def benchmark_tail_ingest(row_counts=(3650, 100_000, 1_000_000), \
+	languages=4, appended=1):
+	"""
+	Times loading the dataframes of `languages` data files after appending
+	`appended` rows to every file, reading the entire csv files against 
+	reading only the appended rows and appending them to the cached frames,
+	for every amount of rows, and prints the results. The files are written
+	to a temporary folder.
+	"""
+	# Create logger which does not print info messages.
+	logger = log.Logger(loglevel=log.LogLevel.ERROR)
+
+	print(f"Tail ingest ({languages} languages, {appended} appended rows)")
+	print(f"{'rows':>10} {'csv (s)':>10} {'tail (s)':>10} {'speedup':>8}")
+
+	# Load data from within a temporary folder, the data and cache folders
+	# are relative.
+	working_directory = os.getcwd()
+	for rows in row_counts:
+		with tempfile.TemporaryDirectory() as folder:
+			os.chdir(folder)
+			try:
+				# Write data files, fill the frame cache and append rows.
+				write_language_files("benchmark", languages, rows)
+				gp.load_frames("benchmark", logger)
+				for index in range(languages):
+					append_rows("benchmark", f"lang{index}", appended)
+
+				# Time both paths, the frame cache is not updated by
+				# load_cached_frames(), so every repeat reads the appended
+				# rows.
+				csv_time, csv_dict = time_function(load_csv_frames, \
+					"benchmark", logger)
+				tail_time, tail_dict = time_function(load_cached_frames, \
+					"benchmark", logger)
+			finally:
+				os.chdir(working_directory)
+
+		# Check that both paths produce the same dataframes.
+		for lang, df in csv_dict.items():
+			pd.testing.assert_frame_equal(df, tail_dict[lang])
+
+		print(f"{rows:>10} {csv_time:>10.3f} {tail_time:>10.3f} " \
+			f"{csv_time / tail_time:>7.1f}x")
+
+def benchmark_watcher(languages=30, idle_time=10.0, changes=5):
+	"""
+	Measures the cpu time used by the data watcher while watching a folder
+	of `languages` data files which does not change for `idle_time` 
+	seconds, and the time between changing a data file and the change
+	being reported, averaged over `changes` changes. Prints the results. The
+	files are written to a temporary folder.
+	"""
+	print(f"Data watcher ({languages} languages, interval " \
+		f"{dw.POLL_INTERVAL} s, debounce {dw.DEBOUNCE_TIME} s)")
+
+	# Run from within a temporary folder, the data folder is relative.
+	working_directory = os.getcwd()
+	with tempfile.TemporaryDirectory() as folder:
+		os.chdir(folder)
+		try:
+			write_language_files("benchmark", languages, 10)
+
+			# Report changes by setting an event.
+			reported = threading.Event()
+			watcher = dw.DataWatcher("data/benchmark", \
+				lambda langs: reported.set())
+			watcher.start()
+
+			# Measure the cpu time of the process while the folder is idle.
+			wall_start = time.perf_counter()
+			cpu_start = time.process_time()
+			time.sleep(idle_time)
+			cpu_time = time.process_time() - cpu_start
+			wall_time = time.perf_counter() - wall_start
+
+			# Measure the latency of reporting a change.
+			latencies = []
+			for index in range(changes):
+				reported.clear()
+				start = time.perf_counter()
+				with open(f"data/benchmark/lang{index % languages}.csv", \
+					"a") as file:
+					file.write("\n")
+				reported.wait()
+				latencies.append(time.perf_counter() - start)
+
+			watcher.stop()
+		finally:
+			os.chdir(working_directory)
+
+	print(f"{'idle cpu (%)':>13} {'latency (s)':>12} {'max (s)':>8}")
+	print(f"{cpu_time / wall_time * 100:>13.3f} " \
+		f"{sum(latencies) / len(latencies):>12.2f} {max(latencies):>8.2f}")
+
+def log_messages(logger, calls: int, printed: bool):
+	"""
+	Submits `calls` messages to the logger, comparable to the messages
+	submitted per file and per plot in load_data() and export_plots(). The
+	messages are output to the console if `printed` is True.
+	"""
+	# Submit messages.
+	for index in range(calls):
+		if printed:
+			logger.log_info(f"Successfully exported plot `daily_xp` for " \
+				f"language `lang{index}`")
+		else:
+			logger.log_debug(f"Successfully exported plot `daily_xp` for " \
+				f"language `lang{index}`")
+
+def benchmark_logger(calls=100_000):
+	"""
+	Times the per-call overhead of the logger in the default mode and in
+	streaming mode, for messages which are output to the console and
+	messages which are not, and prints the results. The console output is
+	discarded and the log files are written to a temporary folder.
+	"""
+	print(f"Logger ({calls} calls)")
+	print(f"{'mode':>10} {'printed':>8} {'per call (us)':>14} " \
+		f"{'kept in memory':>15}")
+
+	# Log from within a temporary folder, the logs folder is relative.
+	working_directory = os.getcwd()
+	with tempfile.TemporaryDirectory() as folder, \
+		open(os.devnull, "w") as devnull, \
+		contextlib.redirect_stdout(devnull):
+		os.chdir(folder)
+		try:
+			results = []
+			for streaming in [False, True]:
+				for printed in [False, True]:
+					# Loglevel INFO outputs info messages but no debug
+					# messages.
+					logger = log.Logger(loglevel=log.LogLevel.INFO, \
+						streaming=streaming)
+					elapsed, _ = time_function(log_messages, logger, calls, \
+						printed, repeats=1)
+
+					# Include writing the remaining messages to the file.
+					start = time.perf_counter()
+					logger.output_to_file()
+					elapsed += time.perf_counter() - start
+
+					results.append(("streaming" if streaming else "memory", \
+						printed, elapsed, len(logger.messages)))
+		finally:
+			os.chdir(working_directory)
+
+	for mode, printed, elapsed, kept in results:
+		print(f"{mode:>10} {str(printed):>8} " \
+			f"{elapsed / calls * 1e6:>14.2f} {kept:>15}")
+
+def benchmark_end_to_end(users=2, languages=4, days=1825, workers=1):
+	"""
+	Generates synthetic data for `users` users with `languages` languages of
+	`days` days each, then times every stage of the pipeline for every 
+	user: the stages of load_frames() (loading, adding the time column,
+	caching, validating and deriving metrics), export_plots() and decoding
+	the exported images, without a user interface. Prints the time, rows per
+	second and plots per second of every stage. Raises a RuntimeError if any
+	plot fails to export. Runs in a temporary folder.
+	"""
+	# Create logger which does not print info messages, the stages are
+	# timed using its timer.
+	logger = log.Logger(loglevel=log.LogLevel.ERROR)
+
+	# Run from within a temporary folder, all folders are relative.
+	working_directory = os.getcwd()
+	with tempfile.TemporaryDirectory() as folder:
+		os.chdir(folder)
+		try:
+			usernames = gd.generate_user_data(users, languages, days)
+			rows = 0
+			plots = 0
+
+			for username in usernames:
+				# Load frames, load_frames() times its own stages.
+				gp._parsed_date_cache.clear()
+				lang_dict = gp.load_frames(username, logger)
+				with logger.timer("export_plots"):
+					exported = gp.export_plots(lang_dict, username, logger, \
+						workers=workers)
+
+				# Every plot of every language has to be exported.
+				failed = sum(len(gp.PLOT_NAMES) - len(exported.get(lang, [])) \
+					for lang in lang_dict.keys())
+				if failed > 0:
+					raise RuntimeError(f"{failed} plots of user `{username}` " \
+						"failed to export")
+				with logger.timer("load_images"):
+					for lang, plot_names in exported.items():
+						for plot_name in plot_names:
+							mpimg.imread( \
+								f"figures/{username}/{lang}/{plot_name}.png")
+
+				rows += sum(len(df) for df in lang_dict.values())
+				plots += sum(len(names) for names in exported.values())
+		finally:
+			os.chdir(working_directory)
+
+	# Print results.
+	print(f"End to end ({users} users, {languages} languages, {days} days, " \
+		f"{workers} workers)")
+	print(f"{'stage':>18} {'time (s)':>10} {'rows/s':>12} {'plots/s':>10}")
+	summary = logger.get_timing_summary()
+	for stage in ["load_data", "add_time_column", "save_cached_frames", \
+		"validate_frames", "derive_metrics", "export_plots", "load_images"]:
+		elapsed = summary[stage]["total_wall_time"]
+		print(f"{stage:>18} {elapsed:>10.3f} {rows / elapsed:>12.0f} " \
+			f"{plots / elapsed:>10.2f}")
+
+def get_import_times(module: str):
+	"""
+	Imports `module` in a new Python process with the `-X importtime` 
+	option. Returns a tuple containing a dictionary mapping every imported
+	module to its cumulative import time in seconds, and the list of heavy
+	modules (matplotlib, numpy, pandas) which were imported.
+	"""
+	# Import the module, the import times are written to stderr.
+	heavy_modules = ["matplotlib", "numpy", "pandas"]
+	process = subprocess.run([sys.executable, "-X", "importtime", "-c", \
+		f"import sys, {module}; print(' '.join(name for name in " \
+		f"{heavy_modules} if name in sys.modules))"], \
+		cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, \
+		text=True, check=True)
+
+	# Parse lines of the format `import time: self | cumulative | name`,
+	# the name is indented by the nesting depth.
+	import_times = {}
+	for line in process.stderr.splitlines():
+		if not line.startswith("import time:") or "[us]" in line:
+			continue
+		_, cumulative, name = line[len("import time:"):].split("|")
+		import_times[name.strip()] = int(cumulative) / 1e6
+
+	# Return import times and imported heavy modules.
+	return import_times, process.stdout.split()
+
+def benchmark_startup(modules=("window", "generate_plots"), top=10):
+	"""
+	Measures the cumulative import time of every module in `modules` in a
+	new process, and prints it together with the heavy modules imported 
+	and the `top` slowest imports. Importing `window` should not import
+	matplotlib, numpy or pandas, so the window can be shown quickly. The
+	time to first paint is reported by the application itself, see
+	window.MainWindow.on_first_paint().
+	"""
+	print("Startup imports")
+	for module in modules:
+		import_times, imported = get_import_times(module)
+		print(f"{module}: {import_times[module]:.3f} s, heavy modules: " \
+			f"{', '.join(imported) or 'none'}")
+
+		# Print slowest imports, excluding the module itself.
+		slowest = sorted(((elapsed, name) for name, elapsed \
+			in import_times.items() if name != module), reverse=True)
+		for elapsed, name in slowest[:top]:
+			print(f"{elapsed:>10.3f} s  {name}")
+
+# Benchmarks which can be selected on the command line.
+BENCHMARKS = {
+	"add_time_column": benchmark_add_time_column,
+	"export_plots_workers": benchmark_export_plots_workers,
+	"template_figure": benchmark_template_figure,
+	"downsample": benchmark_downsample,
+	"frame_cache": benchmark_frame_cache,
+	"tail_ingest": benchmark_tail_ingest,
+	"validate": benchmark_validate,
+	"watcher": benchmark_watcher,
+	"startup": benchmark_startup,
+	"logger": benchmark_logger,
+	"end_to_end": benchmark_end_to_end
+}
+
+def main():
+	# Parse arguments.
+	parser = argparse.ArgumentParser(description="Run benchmarks, all " \
+		"benchmarks are run if none are selected.")
+	parser.add_argument("benchmarks", nargs="*", metavar="benchmark", \
+		help=f"one of: {', '.join(BENCHMARKS.keys())}")
+	args = parser.parse_args()
+
+	# Check benchmark names.
+	for name in args.benchmarks:
+		if not name in BENCHMARKS:
+			parser.error(f"unknown benchmark `{name}`")
+
+	# Run benchmarks.
+	for name in args.benchmarks or BENCHMARKS.keys():
+		BENCHMARKS[name]()
+		print()
+
+if __name__ == "__main__":
+	main()
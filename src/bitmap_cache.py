@@ -0,0 +1,96 @@
+from collections import OrderedDict
+
+class BitmapCache:
+	"""
+	Class holding a bounded least recently used cache of bitmaps or images,
+	anything with a GetSize() method. The size of the cache is bounded by the
+	estimated memory of the bitmaps instead of their amount, as a bitmap at
+	full screen size is many times larger than a small one.
+	"""
+	def __init__(self, max_bytes):
+		"""
+		Assumes `max_bytes` is a positive integer. Initializes an empty cache
+		which holds at most `max_bytes` bytes of bitmaps.
+		"""
+		# Set maximum size.
+		self.max_bytes = max_bytes
+
+		# Initialize ordered dictionary mapping keys to tuples containing the
+		# bitmap and its size in bytes, the least recently used entry first.
+		self.entries = OrderedDict()
+
+		# Initialize the total size of all bitmaps in bytes.
+		self.total_bytes = 0
+
+	def __contains__(self, key):
+		"""
+		Returns True if a bitmap is stored under `key`, without marking it as
+		most recently used.
+		"""
+		# Check if the key is present.
+		return key in self.entries
+
+	def get(self, key):
+		"""
+		Returns the bitmap stored under `key` and marks it as most recently
+		used, or returns None if the key is not present.
+		"""
+		# Check if the key is present.
+		if not key in self.entries:
+			return None
+
+		# Mark entry as most recently used and return the bitmap.
+		self.entries.move_to_end(key)
+		return self.entries[key][0]
+
+	def put(self, key, bitmap):
+		"""
+		Stores `bitmap` under `key` as most recently used entry. Evicts the
+		least recently used entries until the cache fits within max_bytes.
+		Bitmaps larger than max_bytes are not stored.
+		"""
+		# Estimate the size of the bitmap, assuming 4 bytes per pixel.
+		width, height = bitmap.GetSize()
+		size = width * height * 4
+
+		# Do not store bitmaps which do not fit in the cache at all.
+		if size > self.max_bytes:
+			return
+
+		# Remove the previous entry with the same key.
+		self.remove(key)
+
+		# Add entry.
+		self.entries[key] = (bitmap, size)
+		self.total_bytes += size
+
+		# Evict least recently used entries until the cache fits.
+		while self.total_bytes > self.max_bytes:
+			_, (_, evicted_size) = self.entries.popitem(last=False)
+			self.total_bytes -= evicted_size
+
+	def remove(self, key):
+		"""
+		Removes the entry stored under `key` if it is present.
+		"""
+		# Remove entry and update total size.
+		if key in self.entries:
+			_, size = self.entries.pop(key)
+			self.total_bytes -= size
+
+	def remove_where(self, predicate):
+		"""
+		Removes all entries of which the key satisfies `predicate`, a 
+		function taking a key and returning a boolean.
+		"""
+		# Remove matching entries.
+		for key in [key for key in self.entries.keys() if predicate(key)]:
+			self.remove(key)
+
+	def clear(self):
+		"""
+		Removes all entries.
+		"""
+		# Clear entries and reset total size.
+		self.entries.clear()
+		self.total_bytes = 0
@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+
+# Time in seconds between two scans of the watched folder.
+POLL_INTERVAL = 1.0
+
+# Time in seconds without changes before the changed languages are reported,
+# so a burst of writes results in a single report.
+DEBOUNCE_TIME = 2.0
+
+class DataWatcher:
+	"""
+	Class which watches the csv files in a data folder for changes by
+	polling their size and modification time in a background thread. The
+	thread sleeps between scans, so watching costs almost no cpu time while
+	nothing changes.
+	"""
+	def __init__(self, folder: str, on_change, interval=POLL_INTERVAL, \
+		debounce=DEBOUNCE_TIME):
+		"""
+		Assumes `folder` is a string and `on_change` is a function taking a
+		sorted list of languages. `on_change` is called from the watcher
+		thread with the languages whose csv file was added, changed or
+		removed, once no change was seen for `debounce` seconds. The folder
+		is scanned every `interval` seconds.
+		"""
+		# Save variables.
+		self.folder = folder
+		self.on_change = on_change
+		self.interval = interval
+		self.debounce = debounce
+
+		# Event used to stop the watcher thread, every started thread gets a
+		# new event so a stopped thread cannot be resumed.
+		self.stop_event = None
+		self.thread = None
+
+	def scan(self):
+		"""
+		Returns a dictionary mapping the language of every csv file in the
+		folder to a tuple containing its size and modification time. Returns
+		an empty dictionary if the folder does not exist.
+		"""
+		# Scan the folder, the file attributes come with the directory
+		# entries on most platforms.
+		files = {}
+		try:
+			with os.scandir(self.folder) as entries:
+				for entry in entries:
+					if not entry.name.endswith(".csv") or not entry.is_file():
+						continue
+					stat = entry.stat()
+					files[entry.name[:-len(".csv")]] = \
+						(stat.st_size, stat.st_mtime_ns)
+		except OSError:
+			return {}
+
+		# Return files.
+		return files
+
+	def start(self):
+		"""
+		Starts the watcher thread. Changes are reported relative to the
+		state of the folder at this moment.
+		"""
+		# Stop the previous thread and start a new one.
+		self.stop()
+		self.stop_event = threading.Event()
+		self.thread = threading.Thread(target=self.run, \
+			args=(self.scan(), self.stop_event), daemon=True)
+		self.thread.start()
+
+	def stop(self):
+		"""
+		Stops the watcher thread, pending changes are not reported.
+		"""
+		# Signal the thread to stop, it stops within one interval.
+		if self.stop_event is not None:
+			self.stop_event.set()
+
+	def run(self, snapshot: dict, stop_event):
+		"""
+		Runs in the watcher thread. Scans the folder every interval and
+		collects the changed languages, and reports them once the folder has
+		not changed for the debounce time.
+		"""
+		# Initialize the changed languages and the time of the last change.
+		changed = set()
+		last_change = None
+
+		# Scan until stopped.
+		while not stop_event.wait(self.interval):
+			# Compare the folder to the previous scan.
+			current = self.scan()
+			for lang in snapshot.keys() | current.keys():
+				if snapshot.get(lang) != current.get(lang):
+					changed.add(lang)
+					last_change = time.monotonic()
+			snapshot = current
+
+			# Report the changed languages once the folder is quiet.
+			if len(changed) > 0 and not stop_event.is_set() \
+				and time.monotonic() - last_change >= self.debounce:
+				self.on_change(sorted(changed))
+				changed = set()
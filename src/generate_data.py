@@ -0,0 +1,129 @@
+import argparse
+from datetime import datetime, timedelta
+import os
+
+import numpy as np
+import pandas as pd
+
+# Total experience needed to reach every Duolingo level, the first entry is
+# level 1.
+LEVEL_THRESHOLDS = np.array([0, 60, 120, 200, 300, 450, 750, 1125, 1650, \
+	2250, 3000, 3900, 4900, 6000, 7500, 9000, 10500, 12000, 13500, 15000, \
+	17000, 19000, 22500, 26000, 30000])
+
+# Names used for the generated languages.
+LANGUAGE_NAMES = ["spanish", "swedish", "norwegian", "korean", "french", \
+	"german", "italian", "japanese", "dutch", "portuguese"]
+
+def make_language_data(days: int, end_date=None, seed=0):
+	"""
+	Assumes `days` is a positive integer. Returns a dataframe containing
+	`days` consecutive daily entries ending at `end_date` (today if None),
+	with the columns `date`, `daily_xp`, `total_xp`, `total_words_learned`
+	and `level` as found in the data files. Days without practice, regular
+	practice and occasional spikes in the daily experience are included.
+	"""
+	# Create random number generator.
+	rng = np.random.default_rng(seed)
+
+	# Construct consecutive dates.
+	if end_date is None:
+		end_date = datetime.now()
+	start_date = end_date - timedelta(days=days - 1)
+	dates = pd.date_range(start_date.date(), periods=days, freq="D")\
+		.strftime("%d-%m-%Y")
+
+	# Construct daily experience: about a fifth of the days are skipped, on
+	# the other days regular practice with an occasional spike.
+	practiced = rng.random(days) > 0.2
+	daily_xp = rng.integers(10, 150, size=days)
+	spikes = rng.random(days) < 0.02
+	daily_xp[spikes] += rng.integers(300, 1500, size=spikes.sum())
+	daily_xp[~practiced] = 0
+
+	# Construct cumulative columns. Words are only learned on practiced days.
+	total_xp = np.cumsum(daily_xp)
+	words = rng.integers(0, 8, size=days)
+	words[~practiced] = 0
+	total_words_learned = np.cumsum(words)
+	level = np.searchsorted(LEVEL_THRESHOLDS, total_xp, side="right")
+
+	# Return dataframe.
+	return pd.DataFrame({"date": dates, "daily_xp": daily_xp, \
+		"total_xp": total_xp, "total_words_learned": total_words_learned, \
+		"level": level})
+
+def inject_date_rollover_bug(df):
+	"""
+	Assumes `df` is a dataframe as returned by make_language_data(). Injects
+	the bug described in PLAN.md: the entries after December 31st keep the
+	year of the previous year, so the entry after 31-12-2021 has the date
+	01-01-2021. Returns the dataframe.
+	"""
+	# Find the year of the first entry, every later entry gets that year.
+	first_year = df["date"].iloc[0][-4:]
+	df["date"] = df["date"].str[:-4] + first_year
+
+	# Return dataframe.
+	return df
+
+def generate_user_data(users: int, languages: int, days: int, \
+	anomalies=False, folder="data", seed=0):
+	"""
+	Assumes `users`, `languages` and `days` are positive integers. Writes
+	`languages` data files of `days` days each for `users` users to
+	`{folder}/{user}/{lang}.csv`, in the semicolon separated format read by
+	load_data(). The users are named `user0`, `user1` and so on. If
+	`anomalies` is True, the date rollover bug is injected into the first
+	language of every user. Returns the list of generated usernames.
+	"""
+	# Initialize list of usernames.
+	usernames = []
+
+	# Loop over all users and languages.
+	for user_index in range(users):
+		username = f"user{user_index}"
+		os.makedirs(f"{folder}/{username}", exist_ok=True)
+
+		for lang_index in range(languages):
+			# Construct language name, numbered if there are more languages
+			# than names.
+			lang = LANGUAGE_NAMES[lang_index % len(LANGUAGE_NAMES)]
+			if lang_index >= len(LANGUAGE_NAMES):
+				lang = f"{lang}{lang_index // len(LANGUAGE_NAMES)}"
+
+			# Construct data, inject anomalies if requested.
+			df = make_language_data(days, \
+				seed=seed + user_index * languages + lang_index)
+			if anomalies and lang_index == 0:
+				df = inject_date_rollover_bug(df)
+
+			# Write data file.
+			df.to_csv(f"{folder}/{username}/{lang}.csv", sep=";", index=False)
+
+		usernames.append(username)
+
+	# Return usernames.
+	return usernames
+
+def main():
+	# Parse arguments.
+	parser = argparse.ArgumentParser(description="Generate synthetic " \
+		"Duolingo data files in `data/{user}/{lang}.csv`.")
+	parser.add_argument("--users", type=int, default=1)
+	parser.add_argument("--languages", type=int, default=4)
+	parser.add_argument("--days", type=int, default=365)
+	parser.add_argument("--anomalies", action="store_true", \
+		help="inject the date rollover bug described in PLAN.md")
+	parser.add_argument("--folder", default="data")
+	parser.add_argument("--seed", type=int, default=0)
+	args = parser.parse_args()
+
+	# Generate data.
+	usernames = generate_user_data(args.users, args.languages, args.days, \
+		anomalies=args.anomalies, folder=args.folder, seed=args.seed)
+	print(f"Generated {args.languages} languages of {args.days} days for " \
+		f"{len(usernames)} users in `{args.folder}/`")
+
+if __name__ == "__main__":
+	main()
@@ -1,17 +1,135 @@
-from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import as_completed, ProcessPoolExecutor
+from datetime import datetime, timedelta
 import errno
+import functools
+import hashlib
+import io
+import json
+import multiprocessing
 import os
+import tempfile
+import threading
+import time
 
+import matplotlib
+# Plots are only saved to files, never shown, so the non-interactive Agg
+# backend is used. This also allows rendering from a background thread.
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
-def load_data(username: str, logger):
+from plot_catalog import AGGREGATE_PLOT_NAMES, ALL_LANGUAGES, \
+	PLOT_NAMES, PLOT_SPECS
+
+# Format of the `date` column in the data files.
+DATE_FORMAT = "%d-%m-%Y"
+
+# Columns read from the data files and their types, other columns are not
+# read. The integer types are the smallest types fitting the values.
+DATA_SCHEMA = {
+	"date": str,
+	"daily_xp": np.int32,
+	"total_xp": np.int32,
+	"total_words_learned": np.int32,
+	"level": np.int16
+}
+
+# Amount of rows read from a data file at once.
+CSV_CHUNK_ROWS = 100_000
+
+# Date from which the `seconds_since_epoch` column is counted.
+EPOCH_DATE = datetime(2010, 1, 1)
+
+# Settings used when rendering the plots. The amount of days added to both
+# sides of the x-axis, the rotation of the x-axis labels and the resolution.
+EXTRA_DAYS = 10
+XTICKS_ROTATION = 60
+PLOT_DPI = 400
+
+# Method used to reduce the amount of points of long series before they are
+# plotted, either "minmax", "lttb" or None to plot every point. Series are
+# only reduced if they have more points than DOWNSAMPLE_POINTS_PER_PIXEL 
+# times the width of the rendered image in pixels.
+DOWNSAMPLE_METHOD = "minmax"
+DOWNSAMPLE_POINTS_PER_PIXEL = 4
+
+# Maximum amount of monthly ticks on the x-axis, if the data spans more 
+# months only every second, third, etc. month gets a tick.
+MAX_XTICKS = 24
+
+# Version of the aggregate cache file format, cached aggregates written by
+# another version are ignored.
+AGGREGATE_CACHE_VERSION = 1
+
+# Version of the manifest file format, stored in the manifest so manifests
+# written by an incompatible version cause a full regeneration.
+MANIFEST_VERSION = 1
+
+# Columns of which the values never decrease, rows where they do are
+# quarantined by validate_frame().
+CUMULATIVE_COLUMNS = ["total_xp", "total_words_learned", "level"]
+
+# Windows in days of the rolling daily experience averages, they are added
+# to the dataframes as the columns `xp_{days}_day_average`.
+ROLLING_WINDOWS = [7, 30]
+
+# Columns from which the derived metrics are computed.
+METRIC_INPUT_COLUMNS = ["seconds_since_epoch", "daily_xp", "total_xp", \
+	"total_words_learned", "level"]
+
+# Columns each derived metric is computed from, besides the 
+# `seconds_since_epoch` column which all metrics need.
+METRIC_INPUTS = {
+	**{f"xp_{days}_day_average": ["daily_xp"] for days in ROLLING_WINDOWS},
+	"streak": ["daily_xp"],
+	"words_per_day": ["total_words_learned"],
+	"xp_per_level": ["total_xp", "level"]
+}
+
+# Maximum amount of users of which derive_metrics() keeps the derived 
+# metrics in memory, the least recently used user is forgotten first.
+DERIVED_METRICS_CACHE_USERS = 4
+
+# Version of the frame cache file format, cached frames written by another
+# version are ignored.
+FRAME_CACHE_VERSION = 4
+
+# If True, rows appended to a data file since its frame was cached are read
+# and appended to the cached frame, instead of reading the entire file.
+APPEND_ONLY_INGEST = True
+
+# Amount of bytes read at once when searching the start of the last row of
+# a data file, from the end of the file.
+TAIL_BLOCK_BYTES = 4096
+
+# Cache mapping date strings to seconds since EPOCH_DATE, filled by
+# dates_to_seconds_since_epoch().
+_parsed_date_cache = {}
+
+# Cache mapping a username to a dictionary mapping every language to the
+# input version, the input columns and the derived metrics computed by 
+# derive_metrics(). The least recently used user comes first.
+_derived_metrics_cache = OrderedDict()
+
+# PlotRenderer of a render worker process, created by render_worker_task().
+_worker_renderer = None
+
+# Threads saving the images rendered to memory of every user, started by
+# persist_images_async().
+_persist_threads = {}
+
+def load_data(username: str, logger, langs=None, use_cache=False):
 	"""
 	Assumes `username` is a string. Loads data from all csv files present in
 	the folder `data/{username}/` into a dictionary of dataframes, where the
-	keys are the respective filenames without extension. Returns the
-	aforementioned dictionary.
+	keys are the respective filenames without extension. If `langs` is not
+	None, only the files of the languages in `langs` are loaded. If
+	`use_cache` is True, dataframes are loaded from the frame cache written
+	by save_cached_frames() if it is up to date with the csv file or the 
+	file was only appended to, these dataframes already contain the
+	`seconds_since_epoch` column. Returns the aforementioned dictionary.
 	"""
 	# Create start log message.
 	logger.log_info(f"Loading data files for user `{username}`...")
@@ -34,19 +152,34 @@ def load_data(username: str, logger):
 		if not file.endswith(".csv"):
 			continue
 
+		# Skip languages which were not requested.
+		if langs is not None and not file[:-len(".csv")] in langs:
+			continue
+
 		# Construct full relative filename.
 		filename = userfolder + file
 
 		# Log start of loading file.
 		logger.log_info(f"Loading data file `{filename}`...")
 
+		# Load the dataframe from the frame cache if requested and the cache
+		# is up to date.
+		cached_df = None
+		if use_cache:
+			cached_df = load_cached_frame(username, file[:-len(".csv")], \
+				logger)
+
 		# Load file into dataframe using pandas. Catch any error while reading
-		# the file and log it.
-		try:
-			df = pd.read_csv(filename, delimiter=";")
-		except Exception as e:
-			logger.log_error(f"Failed to load file `{filename}`: {e}")
-		
+		# the file and log it, and skip the file.
+		if cached_df is not None:
+			df = cached_df
+		else:
+			try:
+				df = read_data_file(filename, logger)
+			except Exception as e:
+				logger.log_error(f"Failed to load file `{filename}`: {e}")
+				continue
+
 		# Add dataframe to dictionary.
 		lang_dict[".".join(file.split(".")[:-1])] = df
 
@@ -59,6 +192,199 @@ def load_data(username: str, logger):
 	# Return dictionary.
 	return lang_dict
 
+def fit_schema(chunk):
+	"""
+	Assumes `chunk` is a dataframe read from a data file with inferred 
+	types. Converts every integer column to its compact type in DATA_SCHEMA
+	if all its values fit that type. Columns which do not fit, such as 
+	columns with missing values, keep their inferred type. Returns a tuple
+	containing the dataframe and the list of columns which do not fit.
+	"""
+	# Convert the integer columns which fit their schema type.
+	misfits = []
+	for column, dtype in DATA_SCHEMA.items():
+		if not column in chunk.columns or dtype is str:
+			continue
+		values = chunk[column].to_numpy()
+		limits = np.iinfo(dtype)
+		if len(values) == 0 or (values.dtype.kind in "iu" \
+			and values.min() >= limits.min and values.max() <= limits.max):
+			chunk[column] = values.astype(dtype)
+		else:
+			misfits.append(column)
+
+	# Return dataframe and the columns which do not fit.
+	return chunk, misfits
+
+class BoundedReader(io.RawIOBase):
+	"""
+	Class reading at most `size` bytes of an open binary file from its 
+	current position. Used to read a data file only up to the size it had
+	when it was opened, while rows may be appended to it.
+	"""
+	def __init__(self, file, size: int):
+		"""
+		Assumes `file` is a file opened in binary mode and `size` is an
+		integer. Sets the file and the amount of bytes left to read.
+		"""
+		self.file = file
+		self.remaining = size
+
+	def readable(self):
+		"""
+		Returns True, the reader can be read.
+		"""
+		return True
+
+	def readinto(self, buffer):
+		"""
+		Reads bytes into `buffer` until it is full or `size` bytes have been
+		read in total. Returns the amount of bytes read, 0 at the end.
+		"""
+		data = self.file.read(min(len(buffer), self.remaining))
+		buffer[:len(data)] = data
+		self.remaining -= len(data)
+		return len(data)
+
+def read_data_file(filename: str, logger):
+	"""
+	Assumes `filename` is a string. Reads the columns in DATA_SCHEMA from the
+	semicolon separated data file into a dataframe, other columns are not
+	read. The file is read in chunks of CSV_CHUNK_ROWS rows, every chunk is
+	converted to the compact types from DATA_SCHEMA using fit_schema() as it
+	is read, so only one chunk is held in the larger inferred types at once.
+	Columns of a chunk which do not fit these types (e.g. they have missing
+	values) keep their inferred types. The file is only read up to the size
+	it had when it was opened, and the signature and tail of that version 
+	of the file are stored in the dataframe using set_frame_source(), so 
+	rows appended while reading are never mistaken for cached rows. Logs 
+	the amount of rows and bytes, and returns the dataframe.
+	"""
+	# Define which columns to read.
+	usecols = lambda column: column in DATA_SCHEMA
+
+	with open(filename, "rb") as file:
+		# Get the signature and tail of the file before reading it.
+		stat = os.fstat(file.fileno())
+		signature = get_frame_cache_signature(stat=stat)
+		tail, checksums = get_tail_info(file, stat.st_size)
+		file.seek(0)
+
+		# Read the file in chunks and convert every chunk to the schema 
+		# types.
+		chunks = []
+		misfits = set()
+		reader = io.BufferedReader(BoundedReader(file, stat.st_size))
+		for chunk in pd.read_csv(reader, delimiter=";", usecols=usecols, \
+			dtype={"date": str}, chunksize=CSV_CHUNK_ROWS):
+			chunk, chunk_misfits = fit_schema(chunk)
+			chunks.append(chunk)
+			misfits.update(chunk_misfits)
+		if len(misfits) > 0:
+			logger.log_error(f"File `{filename}` does not match the " \
+				f"schema, keeping inferred types for columns " \
+				f"{sorted(misfits)}")
+
+		# Combine chunks, a file without rows yields no chunks.
+		if len(chunks) > 0:
+			df = pd.concat(chunks, ignore_index=True)
+		else:
+			file.seek(0)
+			reader = io.BufferedReader(BoundedReader(file, stat.st_size))
+			df = pd.read_csv(reader, delimiter=";", usecols=usecols)
+	set_frame_source(df, signature, tail, checksums)
+
+	# Log size of the file and the dataframe.
+	logger.log_info(f"Read {len(df)} rows from `{filename}` " \
+		f"({stat.st_size} bytes on disk, " \
+		f"{df.memory_usage(deep=True).sum()} bytes in memory)")
+
+	# Return dataframe.
+	return df
+
+def dates_to_seconds_since_epoch(date_col):
+	"""
+	Assumes `date_col` is a pandas Series (or any sequence) of date strings
+	in the format `dd-mm-yyyy`. Converts all dates to the amount of seconds
+	passed since EPOCH_DATE in one batch and returns them as a numpy int64
+	array. Every unique date string is only parsed once, parsed dates are
+	kept in a module level cache so that subsequent calls (other languages,
+	regenerating plots) do not have to parse them again.
+	"""
+	# Split the column into unique date strings and the index of the unique
+	# date string for every row. A daily history of many years only contains
+	# a few thousand unique dates, regardless of the amount of rows.
+	codes, uniques = pd.factorize(pd.Series(date_col, dtype=object))
+
+	# Missing dates get the code -1, these cannot be converted.
+	if (codes < 0).any():
+		raise ValueError("Column contains missing dates")
+
+	# Find the unique date strings that have not been parsed before.
+	unparsed = [date for date in uniques if not date in _parsed_date_cache]
+
+	# Parse the new date strings using the fixed format fast path, and add
+	# them to the cache.
+	if len(unparsed) > 0:
+		parsed = pd.to_datetime(pd.Series(unparsed, dtype=object), \
+			format=DATE_FORMAT)
+		seconds = ((parsed - EPOCH_DATE) // pd.Timedelta(seconds=1))\
+			.to_numpy(dtype=np.int64)
+		_parsed_date_cache.update(zip(unparsed, seconds.tolist()))
+
+	# Look up the seconds for every unique date string and broadcast them to
+	# all rows using the codes.
+	unique_seconds = np.fromiter((_parsed_date_cache[date] \
+		for date in uniques), dtype=np.int64, count=len(uniques))
+	return unique_seconds[codes]
+
+def reconstruct_dates(df):
+	"""
+	Assumes `df` is a dataframe without `date` column, of which every row is
+	one day. Adds the `date` and `seconds_since_epoch` columns assuming the
+	last row is from today and every previous row is one day earlier, as
+	proposed in issue 4. Both columns are constructed at once from the row
+	numbers. Sets `df.attrs["dates_reconstructed"]` to True, so the frame 
+	cache knows the dates depend on the amount of rows. Returns the 
+	dataframe.
+	"""
+	# Calculate the seconds since EPOCH_DATE of today at midnight.
+	today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+	today_seconds = int((today - EPOCH_DATE).total_seconds())
+
+	# Count back one day per row from the last row.
+	seconds = today_seconds \
+		- 86400 * np.arange(len(df) - 1, -1, -1, dtype=np.int64)
+	df["seconds_since_epoch"] = seconds
+
+	# Format the dates as found in the data files.
+	df["date"] = pd.to_datetime(seconds, unit="s", \
+		origin=pd.Timestamp(EPOCH_DATE)).strftime(DATE_FORMAT)
+	df.attrs["dates_reconstructed"] = True
+
+	# Return dataframe.
+	return df
+
+def get_date_report(seconds):
+	"""
+	Assumes `seconds` is a numpy array of seconds since EPOCH_DATE in file
+	order, one entry per day. Compares every date to the previous date in
+	one pass and returns a dictionary containing the amount of `gaps` 
+	(dates more than a day after the previous date), the amount of
+	`missing_days` in these gaps, the amount of `duplicates` (dates equal to
+	the previous date) and the amount of dates going `backwards` (dates 
+	earlier than the previous date).
+	"""
+	# Calculate the amount of days between every date and the previous date.
+	days = np.diff(seconds) // 86400
+
+	# Return report.
+	gaps = days > 1
+	return {"gaps": int(gaps.sum()), \
+		"missing_days": int((days[gaps] - 1).sum()), \
+		"duplicates": int((days == 0).sum()), \
+		"backwards": int((days < 0).sum())}
+
 def add_time_column(lang_dict: dict, logger):
 	"""
 	Assumes `lang_dict` is a dictionary containing dataframes, as returned by
@@ -67,40 +393,38 @@ def add_time_column(lang_dict: dict, logger):
 	since Januari 1st 2010 for every entry. Duolingo was founded late in 2011
 	[https://en.wikipedia.org/wiki/Duolingo] so this should cover all
 	possible dates. This will be used for the x-axis values of the plots.
-	Returns the dictionary with added columns to the dataframes.
+	If a dataframe has no `date` column, the dates are reconstructed using
+	reconstruct_dates() (issue 4). Logs a report of the gaps and duplicates
+	in the dates, see get_date_report(). Returns the dictionary with added
+	columns to the dataframes.
 	"""
 	# Create start log message.
 	logger.log_info("Adding time column to dataframes...")
 
-	# Create list of failed languages.
-	failed_langs = []
-
-	# Define epoch date.
-	epoch_date = datetime.strptime("01-01-2010", "%d-%m-%Y")
-	
 	# Loop over all entries in the dictionary.
 	for lang, df in lang_dict.items():
-		# Initialize list of seconds since epoch.
-		seconds_since_epoch_list = []
-
-		# Check if the language dataframe has a column named `date`.
-		if not "date" in df.columns:
-			logger.log_error("Failed to add time column to dataframe for " \
-				f"language `{lang}`: missing column `date`!")
-			failed_langs.append(lang)
+		# Skip dataframes which already have the column, such as dataframes
+		# loaded from the frame cache.
+		if "seconds_since_epoch" in df.columns:
 			continue
 
-		# Loop all rows in the dataframe.
-		for index, row in df.iterrows():
-			# Convert `date` entry to seconds since epoch and add to list.
-			current_date = datetime.strptime(row["date"], "%d-%m-%Y")
-			seconds_since_epoch = (current_date - epoch_date).total_seconds()
-			seconds_since_epoch_list.append(seconds_since_epoch)
+		# Reconstruct the `date` column if it is missing, otherwise convert
+		# the entire `date` column at once and add it to the dataframe as an
+		# int64 column.
+		if not "date" in df.columns:
+			logger.log_error(f"Dataframe for language `{lang}` is missing " \
+				"column `date`, assuming the last entry is from today")
+			reconstruct_dates(df)
+		else:
+			df["seconds_since_epoch"] = \
+				dates_to_seconds_since_epoch(df["date"])
 
-		# Add column to dataframe.
-		df["seconds_since_epoch"] = seconds_since_epoch_list
-		# Convert column from float64 to int64.
-		df["seconds_since_epoch"] = df["seconds_since_epoch"].astype(np.int64)
+		# Log report of the dates.
+		report = get_date_report(df["seconds_since_epoch"].to_numpy())
+		logger.log_info(f"Dates of language `{lang}`: {report['gaps']} " \
+			f"gaps ({report['missing_days']} missing days), " \
+			f"{report['duplicates']} duplicate days, {report['backwards']} " \
+			"dates earlier than the previous date")
 
 	# Create end log message.
 	logger.log_info("Done adding time column to dataframes")
@@ -108,14 +432,338 @@ def add_time_column(lang_dict: dict, logger):
 	# Return dictionary.
 	return lang_dict
 
-def export_plots(lang_dict: dict, username: str, logger):
+def get_plot_width(dpi: int):
+	"""
+	Assumes `dpi` is a positive integer. Returns the width in pixels of a
+	plot rendered with the resolution `dpi`.
+	"""
+	# Return figure width in pixels.
+	return int(plt.rcParams["figure.figsize"][0] * dpi)
+
+def downsample_minmax(x, y, buckets: int):
+	"""
+	Assumes `x` and `y` are numpy arrays of equal length and `x` is sorted.
+	Divides the x-range into `buckets` buckets of equal width, one per 
+	pixel, and keeps the first, last, lowest and highest point of every 
+	bucket. The line drawn through the remaining points covers the same 
+	pixels as the line through all points, so spikes are kept. Returns a 
+	tuple containing the remaining x and y values in their original order.
+	"""
+	# Nothing to reduce if there are no more points than buckets.
+	if len(x) <= buckets or x[-1] == x[0]:
+		return x, y
+
+	# Calculate the bucket of every point.
+	bucket = ((x - x[0]) * (buckets / (x[-1] - x[0]))).astype(np.int64)
+	np.minimum(bucket, buckets - 1, out=bucket)
+
+	# Find the first and last point of every bucket. The buckets are sorted
+	# as x is sorted.
+	first = np.flatnonzero(np.diff(bucket, prepend=-1))
+	last = np.append(first[1:] - 1, len(x) - 1)
+
+	# Find the lowest and highest point of every bucket, sorting by bucket 
+	# and then by value puts them at the first and last position of every
+	# bucket.
+	order = np.lexsort((y, bucket))
+	lowest = order[first]
+	highest = order[last]
+
+	# Return the remaining points in their original order.
+	keep = np.unique(np.concatenate((first, last, lowest, highest)))
+	return x[keep], y[keep]
+
+def downsample_lttb(x, y, points: int):
+	"""
+	Assumes `x` and `y` are numpy arrays of equal length, `x` is sorted and
+	`points` is an integer larger than 2. Reduces the series to `points` 
+	points using the Largest-Triangle-Three-Buckets algorithm: the first and
+	last point are kept, and from every bucket in between the point forming
+	the largest triangle with the point kept from the previous bucket and 
+	the average of the next bucket. Returns a tuple containing the remaining
+	x and y values.
+	"""
+	# Nothing to reduce if there are no more points than requested.
+	if len(x) <= points or points < 3:
+		return x, y
+
+	# Calculate the bucket boundaries, the first and last point are buckets
+	# of their own.
+	edges = np.linspace(1, len(x) - 1, points - 1).astype(np.int64)
+
+	# Calculate the average of every bucket, used as third triangle point.
+	xf = x.astype(np.float64)
+	yf = y.astype(np.float64)
+	counts = np.diff(edges)
+	x_avg = np.add.reduceat(xf[:-1], edges[:-1]) / counts
+	y_avg = np.add.reduceat(yf[:-1], edges[:-1]) / counts
+	x_avg = np.append(x_avg[1:], xf[-1])
+	y_avg = np.append(y_avg[1:], yf[-1])
+
+	# Select the point of every bucket forming the largest triangle, this
+	# depends on the point selected from the previous bucket.
+	keep = np.empty(points, dtype=np.int64)
+	keep[0] = 0
+	keep[-1] = len(x) - 1
+	for index in range(points - 2):
+		start, end = edges[index], edges[index + 1]
+		prev_x, prev_y = xf[keep[index]], yf[keep[index]]
+		areas = np.abs((prev_x - x_avg[index]) * (yf[start:end] - prev_y) \
+			- (prev_x - xf[start:end]) * (y_avg[index] - prev_y))
+		keep[index + 1] = start + np.argmax(areas)
+
+	# Return the remaining points.
+	return x[keep], y[keep]
+
+def downsample(x, y, width: int, method=DOWNSAMPLE_METHOD):
+	"""
+	Assumes `x` and `y` are numpy arrays of equal length and `width` is the
+	width of the rendered image in pixels. Reduces the series using 
+	`method` ("minmax", "lttb" or None) if it has more than
+	DOWNSAMPLE_POINTS_PER_PIXEL points per pixel. Series of which the x 
+	values are not sorted are not reduced. Returns a tuple containing the
+	remaining x and y values.
+	"""
+	# Check if the series should be reduced.
+	if method is None or len(x) <= width * DOWNSAMPLE_POINTS_PER_PIXEL \
+		or np.any(np.diff(x) < 0):
+		return x, y
+
+	# Reduce series.
+	if method == "minmax":
+		return downsample_minmax(x, y, width)
+	if method == "lttb":
+		return downsample_lttb(x, y, width * DOWNSAMPLE_POINTS_PER_PIXEL)
+	raise ValueError(f"unknown downsample method `{method}`")
+
+@functools.lru_cache(maxsize=None)
+def get_month_ticks(first_month: int, last_month: int):
+	"""
+	Assumes `first_month` and `last_month` are integers counting months as
+	`year * 12 + month - 1`. Returns a tuple containing a tuple of tick
+	positions in seconds since EPOCH_DATE and a tuple of `mm/yyyy` labels,
+	for the first day of the months from `first_month` up to and including
+	`last_month`. At most MAX_XTICKS evenly spaced months are returned. The
+	result is cached, as most plots span the same months.
+	"""
+	# Select evenly spaced months.
+	months = np.arange(first_month, last_month + 1)
+	if len(months) == 0:
+		return (), ()
+	months = months[::-(-len(months) // MAX_XTICKS)]
+
+	# Construct the dates of the first day of the months.
+	dates = pd.to_datetime({"year": months // 12, "month": months % 12 + 1, \
+		"day": 1})
+
+	# Return tick positions and labels.
+	seconds = (dates - EPOCH_DATE) // pd.Timedelta(seconds=1)
+	return tuple(seconds.tolist()), tuple(dates.dt.strftime("%m/%Y"))
+
+def get_xticks(xmin, xmax):
+	"""
+	Assumes `xmin` and `xmax` are numbers of seconds since EPOCH_DATE. 
+	Returns a tuple containing the tick positions and labels of the months
+	starting between `xmin` and `xmax`, see get_month_ticks().
+	"""
+	# Find the first month starting at or after xmin, and the last month 
+	# starting at or before xmax.
+	start = EPOCH_DATE + timedelta(seconds=int(xmin))
+	end = EPOCH_DATE + timedelta(seconds=int(xmax))
+	first_month = start.year * 12 + start.month - 1
+	if start > datetime(start.year, start.month, 1):
+		first_month += 1
+	last_month = end.year * 12 + end.month - 1
+
+	# Return cached ticks.
+	return get_month_ticks(first_month, last_month)
+
+class PlotRenderer:
+	"""
+	Class holding a single template figure which is reused to render all
+	plots. The axes and x-label are set up once, every plot only swaps in
+	its data, style, title, y-label, limits and x-ticks before being saved.
+	"""
+	def __init__(self):
+		"""
+		Creates the template figure and an empty line.
+		"""
+		# Create figure and empty line.
+		self.fig, self.ax = plt.subplots()
+		self.line, = self.ax.plot([], [])
+
+		# Set up the parts which are identical for every plot.
+		self.ax.set_xlabel("Date")
+
+		# The x-ticks are only replaced if they differ from the current ones.
+		self.xticks = None
+
+	def render(self, x, y, plot_name: str, path, xmin, xmax, dpi: int, \
+		xticks=(), xlabels=()):
+		"""
+		Assumes `x` and `y` are sequences of equal length, `plot_name` is one
+		of PLOT_NAMES and `path` is a string or None. Swaps the data, style,
+		title and y-label of the plot into the template figure, sets the
+		x-limits and x-ticks, rescales the y-axis and saves the figure to
+		`path` with the resolution `dpi`. If `path` is None the figure is not
+		saved, but rendered to memory, and returned as an RGB numpy array of
+		shape (height, width, 3).
+		"""
+		# Get plot specification.
+		spec = PLOT_SPECS[plot_name]
+
+		# Swap in data, style and labels.
+		self.line.set_data(x, y)
+		self.line.set(**spec["style"])
+		self.ax.set_ylabel(spec["ylabel"])
+		self.ax.set_title(spec["title"])
+
+		# Swap in x-ticks if they changed.
+		if self.xticks != (xticks, xlabels):
+			self.ax.set_xticks(xticks, xlabels, rotation=XTICKS_ROTATION)
+			self.xticks = (xticks, xlabels)
+
+		# Set x-limits and rescale the y-axis to the new data.
+		self.ax.set_xlim(xmin, xmax)
+		self.ax.relim()
+		self.ax.autoscale_view(scalex=False)
+
+		# Apply tight layout.
+		self.fig.tight_layout()
+
+		# Render to memory if no path is supplied. The canvas buffer is
+		# reused for the next plot, so the pixels are copied into a new
+		# array, the alpha channel is dropped as the plots are opaque.
+		if path is None:
+			self.fig.set_dpi(dpi)
+			self.fig.canvas.draw()
+			rgba = np.asarray(self.fig.canvas.buffer_rgba())
+			return np.ascontiguousarray(rgba[:, :, :3])
+
+		# Export plot to a temporary file and move it into place, so the
+		# user interface never reads a partially written image.
+		replace_file(path, lambda file: self.fig.savefig(file, dpi=dpi, \
+			format="png"))
+
+	def close(self):
+		"""
+		Closes the template figure, freeing its memory.
+		"""
+		# Close figure.
+		plt.close(self.fig)
+
+def export_plot_task(task: tuple, renderer: PlotRenderer):
+	"""
+	Assumes `task` is a tuple containing the language, plot name, x data, y
+	data, path, x-ticks, x-labels, xmin, xmax and dpi, and `renderer` is a
+	PlotRenderer. Exports the plot and returns
+	a tuple containing the language, the plot name, None if the plot was
+	exported successfully or the error message if it was not, the RGB
+	array of the plot if the path is None (the plot is rendered to memory),
+	and a tuple containing the wall time and cpu time of the export.
+	"""
+	# Extract task components.
+	lang, plot_name, x, y, path, xticks, xlabels, xmin, xmax, dpi = task
+
+	# Get start times.
+	start_wall = time.perf_counter()
+	start_cpu = time.process_time()
+
+	# Export plot, catch any error and return it.
+	try:
+		image = renderer.render(x, y, plot_name, path, xmin, xmax, dpi, \
+			xticks, xlabels)
+		error = None
+	except Exception as e:
+		image = None
+		error = f"{e}"
+
+	# Return result and timing.
+	timing = (time.perf_counter() - start_wall, \
+		time.process_time() - start_cpu)
+	return lang, plot_name, error, image, timing
+
+def init_render_worker():
+	"""
+	Initializes a render worker process by selecting the non-interactive Agg
+	backend.
+	"""
+	# Select Agg backend.
+	plt.switch_backend("Agg")
+
+def render_worker_task(task: tuple):
+	"""
+	Assumes `task` is a tuple as accepted by export_plot_task(). Runs the task
+	in a render worker process. Every worker creates one PlotRenderer on its
+	first task and reuses it for all following tasks.
+	"""
+	# Create renderer if this is the first task of the worker.
+	global _worker_renderer
+	if _worker_renderer is None:
+		_worker_renderer = PlotRenderer()
+
+	# Export plot and return result.
+	return export_plot_task(task, _worker_renderer)
+
+def export_plot_tasks_parallel(tasks: list, workers: int, \
+	cancel_event=None):
+	"""
+	Assumes `tasks` is a list of tuples as accepted by export_plot_task() and
+	`workers` is a positive integer. Renders the tasks in a pool of at most
+	`workers` processes. Yields the result of every task as soon as it is
+	done, in the format returned by export_plot_task(). Tasks which have not
+	started yet are cancelled once `cancel_event` is set.
+	"""
+	# The spawn start method is used so the workers do not inherit the state
+	# of the user interface.
+	context = multiprocessing.get_context("spawn")
+	with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), \
+		mp_context=context, initializer=init_render_worker) as executor:
+		# Submit all tasks.
+		futures = {executor.submit(render_worker_task, task): task \
+			for task in tasks}
+
+		# Yield results as they complete. If a worker process died, report
+		# the task as failed.
+		for future in as_completed(futures):
+			# Cancel the remaining tasks if requested.
+			if cancel_event is not None and cancel_event.is_set():
+				for remaining_future in futures.keys():
+					remaining_future.cancel()
+				return
+
+			try:
+				yield future.result()
+			except Exception as e:
+				task = futures[future]
+				yield task[0], task[1], f"worker failed: {e}", None, None
+
+def export_plots(lang_dict: dict, username: str, logger, workers=1, \
+	progress=None, cancel_event=None, images=None, \
+	downsample_method=DOWNSAMPLE_METHOD, unavailable=None, \
+	images_max_bytes=None):
 	"""
 	Assumes `lang_dict` is a dictionary containing dataframes, as returned by
 	the function add_time_column(). Assumes `username` is a string and 
 	identical to the `username` supplied to load_data(). Exports a plot for 
 	every language for the columns `daily_xp`, `total_xp`, 
 	`total_words_learned` and `level`. These plots will have automatic x- and 
-	y-limits and will be saved to `figures/{username}/`.
+	y-limits and will be saved to `figures/{username}/`. If `workers` is
+	larger than 1 the plots are rendered in a pool of `workers` processes
+	using the Agg backend, if it is None one process per cpu is used. If
+	`progress` is not None it is called with the amount of rendered plots and
+	the total amount of plots to render after every plot. Rendering stops
+	once `cancel_event` (a threading.Event) is set. If `images` is a
+	dictionary, the plots are not saved but rendered to memory and stored in
+	it as `images[lang][plot_name]` RGB arrays, they can be saved using
+	persist_images(). If `images_max_bytes` is not None, images which 
+	would make the arrays in `images` exceed this many bytes are saved to
+	disk right away instead. Long series are reduced using `downsample_method` 
+	before they are plotted, see downsample(). If `unavailable` is a 
+	dictionary, the plots which cannot be exported from the data, because
+	their column is missing or the language has no rows, are stored in it
+	as `unavailable[lang]` lists. Returns a dictionary containing the list
+	of successfully exported plot names for every language.
 	"""
 	# Create start log message.
 	logger.log_info("Exporting plots...")
@@ -135,170 +783,146 @@ def export_plots(lang_dict: dict, username: str, logger):
 
 	# Create folders for every language if it does not exist.
 	for lang in lang_dict.keys():
-		# Check if the language has a date column, when issue 4 is 
-		# implemented, this check can be removed, as plots will be exported
-		# regardless.
-		if not "date" in lang_dict[lang].columns:
+		# Check if the language has a time column, add_time_column() adds
+		# it to every dataframe.
+		if not "seconds_since_epoch" in lang_dict[lang].columns:
 			logger.log_error(f"Folder `figures/{username}/{lang}/` not " \
-				"created: missing column `date`")
+				"created: missing column `seconds_since_epoch`")
 			continue
 		if not os.path.isdir(f"figures/{username}/{lang}"):
 			os.mkdir(f"figures/{username}/{lang}")
 
-	# Calculate xticks values and construct ticks list and labels list.
-	# Initialize lists.
-	xticks = []
-	xlabels = []
-
-	# Initialize epoch datetime object.
-	epoch = datetime.strptime("01-01-2010", "%d-%m-%Y")
-	# Loop from 2010 until the current year.
-	for year in range(2010, datetime.now().year + 1):
-		# Loop from month 1 to month 12.
-		for month in range(1, 13):
-			# Create datetime object from year and month.
-			cur_date = datetime.strptime(f"01-{month}-{year}", "%d-%m-%Y")
-
-			# Calculate seconds since epoch and add to xticks list.
-			delta_seconds = (cur_date - epoch).total_seconds()
-			xticks.append(delta_seconds)
-
-			# Construct label and add to xlabels list.
-			month_str = f"{month}" if month > 9 else f"0{month}"
-			year_str = f"{year}"
-			label = f"{month_str}/{year_str}"
-			xlabels.append(label)
-
-	# Loop over all dataframes and generate plots.
+	# Initialize dictionary holding the names of the exported plots for every
+	# language, and list of plots to render.
+	exported = {}
+	tasks = []
+
+	# Get the width of the plots in pixels, the series are reduced to it.
+	width = get_plot_width(PLOT_DPI)
+
+	# Loop over all dataframes and collect the plots to export.
 	for lang, df in lang_dict.items():
-		# If the date column is not present, skip the language.
-		if "date" in df.columns:
-			seconds_since_epoch_col = df["seconds_since_epoch"]
+		# Initialize list of exported plots, only some plots are shown for
+		# all languages combined.
+		exported[lang] = []
+		plot_names = AGGREGATE_PLOT_NAMES if lang == ALL_LANGUAGES \
+			else PLOT_NAMES
+
+		# If the time column is not present, skip the language.
+		if "seconds_since_epoch" in df.columns:
+			seconds_since_epoch = df["seconds_since_epoch"].to_numpy()
 		else:
-			failed += 4
+			failed += len(plot_names)
+			if unavailable is not None:
+				unavailable[lang] = list(plot_names)
 			continue
 
-		# Define save paths.
-		daily_xp_path = f"figures/{username}/{lang}/daily_xp.png"
-		total_xp_path = f"figures/{username}/{lang}/total_xp.png"
-		total_words_learned_path = \
-			f"figures/{username}/{lang}/total_words_learned.png"
-		level_path = f"figures/{username}/{lang}/level.png"
-
-		# Calculate xmin and xmax, subtract month from xmin and add month to
-		# xmax.
-		extra_days = 10
-		xmin = min(seconds_since_epoch_col) - (86400 * extra_days)
-		xmax = max(seconds_since_epoch_col) + (86400 * extra_days)
-		xticks_rotation = 60
-		plot_dpi = 400
-
-		# Plot daily xp and save to file.
-		if "daily_xp" in df.columns:
-			# Get data.
-			daily_xp_col = df["daily_xp"]
-
-			# Create and export plot.
-			fig, ax = plt.subplots()
-			ax.plot(seconds_since_epoch_col, daily_xp_col, "b-", linewidth=1)
-			ax.set_xlabel("Date")
-			ax.set_ylabel("Experience")
-			ax.set_title("Daily Experience")
-			ax.set_xticks(xticks, xlabels, rotation=xticks_rotation)
-			ax.set_xlim(xmin, xmax)
-			fig.tight_layout()
-			fig.savefig(daily_xp_path, dpi=plot_dpi)
-
-			logger.log_info(f"Successfully exported plot `daily_xp` for " \
-				f"language `{lang}`")
+		# Skip languages without rows, such as data files with only a 
+		# header, as there is nothing to plot.
+		if len(seconds_since_epoch) == 0:
+			logger.log_error(f"Failed to export plots for language " \
+				f"`{lang}`: no rows")
+			failed += len(plot_names)
+			if unavailable is not None:
+				unavailable[lang] = list(plot_names)
+			continue
 
-			successful += 1
-		else:
-			logger.log_error(f"Failed to export plot `daily_xp` for " \
-				f"language `{lang}`: missing column `daily_xp`!")
+		# Calculate xmin and xmax, subtract EXTRA_DAYS days from xmin and add
+		# EXTRA_DAYS days to xmax. The x-ticks are limited to this range and
+		# shared by all plots of the language.
+		xmin = int(seconds_since_epoch.min()) - (86400 * EXTRA_DAYS)
+		xmax = int(seconds_since_epoch.max()) + (86400 * EXTRA_DAYS)
+		xticks, xlabels = get_xticks(xmin, xmax)
 
-			failed += 1
+		# Add a render task for every plot of which the column is present.
+		for plot_name in plot_names:
+			column = PLOT_SPECS[plot_name]["column"]
+			if not column in df.columns:
+				logger.log_error(f"Failed to export plot `{plot_name}` for " \
+					f"language `{lang}`: missing column `{column}`!")
+				failed += 1
+				if unavailable is not None:
+					unavailable.setdefault(lang, []).append(plot_name)
+				continue
 
-		# Plot total xp and save to file.
-		if "total_xp" in df.columns:
-			# Get data.
-			total_xp_col = df["total_xp"]
-
-			# Create and export plot.
-			fig, ax = plt.subplots()
-			ax.plot(seconds_since_epoch_col, total_xp_col, "b-", linewidth=1)
-			ax.set_xlabel("Date")
-			ax.set_ylabel("Experience")
-			ax.set_title("Total Experience")
-			ax.set_xticks(xticks, xlabels, rotation=xticks_rotation)
-			ax.set_xlim(xmin, xmax)
-			fig.tight_layout()
-			fig.savefig(total_xp_path, dpi=plot_dpi)
-
-			logger.log_info(f"Successfully exported plot `total_xp` for " \
-				f"language `{lang}`")
+			# Reduce long series, this also reduces the data sent to the
+			# render workers.
+			x, y = downsample(seconds_since_epoch, df[column].to_numpy(), \
+				width, method=downsample_method)
 
-			successful += 1
-		else:
-			logger.log_error(f"Failed to export plot `total_xp` for " \
-				f"language `{lang}`: missing column `total_xp`!")
+			# Plots rendered to memory have no path.
+			path = f"figures/{username}/{lang}/{plot_name}.png" \
+				if images is None else None
+			tasks.append((lang, plot_name, x, y, path, xticks, xlabels, \
+				xmin, xmax, PLOT_DPI))
 
-			failed += 1
+	# Render the plots, either one after another in this process or in a
+	# process pool.
+	if workers is None:
+		workers = os.cpu_count() or 1
+	if workers > 1 and len(tasks) > 1:
+		logger.log_info(f"Rendering {len(tasks)} plots using " \
+			f"{min(workers, len(tasks))} worker processes...")
+		renderer = None
+		results = export_plot_tasks_parallel(tasks, workers, cancel_event)
+	else:
+		renderer = PlotRenderer()
+		results = (export_plot_task(task, renderer) for task in tasks \
+			if cancel_event is None or not cancel_event.is_set())
 
-		# Plot total words learned and save to file.
-		if "total_words_learned" in df.columns:
-			# Get data.
-			total_words_learned_col = df["total_words_learned"]
-
-			# Create and export plot.
-			fig, ax = plt.subplots()
-			ax.plot(seconds_since_epoch_col, total_words_learned_col, "b-", \
-				linewidth=1)
-			ax.set_xlabel("Date")
-			ax.set_ylabel("Words")
-			ax.set_title("Total Words Learned")
-			ax.set_xticks(xticks, xlabels, rotation=xticks_rotation)
-			ax.set_xlim(xmin, xmax)
-			fig.tight_layout()
-			fig.savefig(total_words_learned_path, dpi=plot_dpi)
-
-			logger.log_info(f"Successfully exported plot " \
-				f"`total_words_learned` for language `{lang}`")
+	# Report initial progress.
+	if progress is not None:
+		progress(0, len(tasks))
 
-			successful += 1
-		else:
-			logger.log_error(f"Failed to export plot " \
-				f"`total_words_learned` for language `{lang}`: missing " \
-				"column `total_words_learned`!")
+	# Get the size of the images already held in memory.
+	kept_bytes = sum(image.nbytes for plots in (images or {}).values() \
+		for image in plots.values())
 
-			failed += 1
+	# Collect the results and update the counters.
+	for index, (lang, plot_name, error, image, timing) \
+		in enumerate(results):
+		# Record the timing of the plot.
+		if timing is not None:
+			logger.record_timing(f"export_plots/{lang}/{plot_name}", \
+				*timing, details={"language": lang, "plot": plot_name})
 
-		# Plot level and save to file.
-		if "level" in df.columns:
-			# Get data.
-			level_col = df["level"]
-
-			# Create and export plot.
-			fig, ax = plt.subplots()
-			ax.plot(seconds_since_epoch_col, level_col, "b-", linewidth=1)
-			ax.set_xlabel("Date")
-			ax.set_ylabel("Level")
-			ax.set_title("Level")
-			ax.set_xticks(xticks, xlabels, rotation=xticks_rotation)
-			ax.set_xlim(xmin, xmax)
-			fig.tight_layout()
-			fig.savefig(level_path, dpi=plot_dpi)
-
-			logger.log_info(f"Successfully exported plot `level` for " \
-				f"language `{lang}`")
+		# Keep the image if the plot was rendered to memory. Once the kept
+		# images would exceed `images_max_bytes`, the image is saved right
+		# away instead, bounding the memory held until they are saved.
+		if error is None and images is not None:
+			if images_max_bytes is None \
+				or kept_bytes + image.nbytes <= images_max_bytes:
+				images.setdefault(lang, {})[plot_name] = image
+				kept_bytes += image.nbytes
+			else:
+				try:
+					save_image(f"figures/{username}/{lang}/{plot_name}.png", \
+						image)
+				except Exception as e:
+					error = f"{e}"
 
+		if error is None:
+			logger.log_info(f"Successfully exported plot `{plot_name}` for " \
+				f"language `{lang}`")
+			exported[lang].append(plot_name)
 			successful += 1
 		else:
-			logger.log_error(f"Failed to export plot `level` for " \
-				f"language `{lang}`: missing column `level`!")
-
+			logger.log_error(f"Failed to export plot `{plot_name}` for " \
+				f"language `{lang}`: {error}")
 			failed += 1
 
+		# Report progress.
+		if progress is not None:
+			progress(index + 1, len(tasks))
+
+	# Log if the export was cancelled.
+	if cancel_event is not None and cancel_event.is_set():
+		logger.log_info("Exporting plots cancelled")
+
+	# Close the template figure as soon as all plots are written.
+	if renderer is not None:
+		renderer.close()
+
 	# Close all figures, if this is not done memory will stay allocated and
 	# wxpython will not be able to exit the mainloop. Also if this is not done
 	# matplotlib will keep the figures in memory and throw a warning once the
@@ -307,4 +931,1284 @@ def export_plots(lang_dict: dict, username: str, logger):
 
 	# Create end log message.
 	logger.log_info(f"Done exporting plots ({successful} successful, " \
-		f"{failed} failed)")
\ No newline at end of file
+		f"{failed} failed)")
+
+	# Return dictionary of exported plots.
+	return exported
+
+def save_image(path: str, image):
+	"""
+	Assumes `path` is a string and `image` is an RGB array as rendered by
+	PlotRenderer.render(). Saves the image as png file using replace_file().
+	"""
+	# Write the image.
+	replace_file(path, lambda file: plt.imsave(file, image, format="png"))
+
+def persist_images(images: dict, username: str, logger):
+	"""
+	Assumes `images` is a dictionary of RGB arrays as filled by
+	export_plots(). Saves every image to
+	`figures/{username}/{lang}/{plot_name}.png` using save_image(). 
+	Returns a dictionary mapping the language and plot name of every saved
+	image to its path.
+	"""
+	# Create start log message.
+	logger.log_info("Saving rendered plots...")
+
+	# Loop over all images and save them.
+	saved = {}
+	for lang, plots in images.items():
+		for plot_name, image in plots.items():
+			path = f"figures/{username}/{lang}/{plot_name}.png"
+			try:
+				save_image(path, image)
+				saved[(lang, plot_name)] = path
+			except Exception as e:
+				logger.log_error(f"Failed to save plot `{path}`: {e}")
+
+	# Create end log message.
+	logger.log_info(f"Done saving rendered plots ({len(saved)} saved)")
+
+	# Return paths of the saved images.
+	return saved
+
+def replace_file(path: str, write, mode="wb"):
+	"""
+	Assumes `path` is a string and `write` is a callable which writes the
+	contents of the file to the file object it is called with, opened with
+	`mode`. The contents are written to a uniquely named temporary file 
+	first which is moved into place, so concurrent writers never write to 
+	the same temporary file and readers never see a partially written file.
+	"""
+	# Write to a unique temporary file and move it into place, remove the
+	# temporary file if this fails.
+	handle, temp_path = tempfile.mkstemp(suffix=".tmp", \
+		dir=os.path.dirname(path) or ".")
+	try:
+		with os.fdopen(handle, mode) as file:
+			write(file)
+		os.replace(temp_path, path)
+	except BaseException:
+		if os.path.exists(temp_path):
+			os.remove(temp_path)
+		raise
+
+def save_npz_file(path: str, arrays: dict):
+	"""
+	Assumes `path` is a string and `arrays` is a dictionary of numpy arrays.
+	Saves the arrays to the npz file `path` using replace_file().
+	"""
+	# Write the arrays.
+	replace_file(path, lambda file: np.savez(file, **arrays))
+
+def get_frame_cache_path(username: str, lang: str):
+	"""
+	Assumes `username` and `lang` are strings. Returns the path of the frame
+	cache file of the language of the user.
+	"""
+	# Return cache path.
+	return f"cache/{username}/{lang}.npz"
+
+def get_frame_cache_signature(username="", lang="", stat=None):
+	"""
+	Assumes `username` and `lang` are strings. Returns a numpy int64 array
+	containing the frame cache version, and the size and modification time
+	of the csv file of the language, used to check if a cached frame is up
+	to date. If `stat` is not None, the size and modification time are 
+	taken from this os.stat_result instead, such as the one of the file 
+	version which was read.
+	"""
+	# Get size and modification time of the csv file.
+	if stat is None:
+		stat = os.stat(f"data/{username}/{lang}.csv")
+
+	# Return signature.
+	return np.array([FRAME_CACHE_VERSION, stat.st_size, stat.st_mtime_ns], \
+		dtype=np.int64)
+
+def get_checksum(data: bytes):
+	"""
+	Assumes `data` is a bytes object. Returns the sha1 hash of the data as a
+	hexadecimal string.
+	"""
+	# Return hash.
+	return hashlib.sha1(data).hexdigest()
+
+def get_tail_info(file, size: int):
+	"""
+	Assumes `file` is a data file opened in binary mode and `size` is the
+	amount of bytes of the file which are read, its size when it was 
+	opened. Returns a tuple containing a numpy int64 array with `size` and
+	the position at which the last row within these bytes starts, and a 
+	numpy unicode array with the checksums of the header and of the last 
+	row. This is stored in the frame cache, so rows appended to the file 
+	later can be read without reading the entire file, see 
+	read_appended_rows(). Only the header and the end of the file are read.
+	"""
+	# Read header.
+	file.seek(0)
+	header = file.readline()[:size]
+
+	# Read blocks from the end of the file until the line break before the
+	# last row is found, trailing line breaks are skipped. If there is no
+	# such line break, the file has at most one row.
+	last_row_start = len(header)
+	position = size
+	data = b""
+	while position > len(header):
+		block_size = min(TAIL_BLOCK_BYTES, position - len(header))
+		position -= block_size
+		file.seek(position)
+		data = file.read(block_size) + data
+		line_break = data.rstrip(b"\r\n").rfind(b"\n")
+		if line_break >= 0:
+			last_row_start = position + line_break + 1
+			break
+
+	# Read last row.
+	file.seek(last_row_start)
+	last_row = file.read(size - last_row_start)
+
+	# Return positions and checksums.
+	return np.array([size, last_row_start], dtype=np.int64), \
+		np.array([get_checksum(header), get_checksum(last_row)])
+
+def set_frame_source(df, signature, tail, checksums):
+	"""
+	Assumes `df` is a dataframe read from a data file, and `signature`, 
+	`tail` and `checksums` are the arrays returned by 
+	get_frame_cache_signature() and get_tail_info() for the version of the
+	file which was read. Stores them in `df.attrs`, from where 
+	save_cached_frames() stores them in the frame cache.
+	"""
+	# Store the arrays as tuples, which pandas can compare and copy.
+	df.attrs["signature"] = tuple(int(value) for value in signature)
+	df.attrs["tail"] = tuple(int(value) for value in tail)
+	df.attrs["tail_checksums"] = tuple(str(value) for value in checksums)
+
+def read_appended_rows(filename: str, df, tail, checksums, logger):
+	"""
+	Assumes `filename` is a string, `df` is the cached dataframe of the data
+	file and `tail` and `checksums` are the arrays returned by 
+	get_tail_info() when the dataframe was cached. Reads the rows appended
+	to the file since then, adds their `seconds_since_epoch` column and 
+	appends them to the dataframe. If the dates of the dataframe were 
+	reconstructed, see `df.attrs["dates_reconstructed"]`, the dates of all
+	rows are reconstructed again, as they depend on the amount of rows. The
+	file is only read up to the size it had when it was opened, the 
+	signature and tail of that version are stored in the dataframe using
+	set_frame_source(). Returns the new dataframe, or None if the file was
+	not only appended to (it was truncated, or its header or last row 
+	changed), or the appended rows cannot be read, in which case the entire
+	file has to be read.
+	"""
+	# Get the columns read from the file, the date columns of dataframes
+	# with reconstructed dates are not.
+	reconstructed = df.attrs.get("dates_reconstructed", False)
+	file_columns = [column for column in df.columns \
+		if column in DATA_SCHEMA and not (reconstructed and column == "date")]
+
+	# Check the file and read the appended bytes.
+	offset, last_row_start = int(tail[0]), int(tail[1])
+	with open(filename, "rb") as file:
+		stat = os.fstat(file.fileno())
+		header = file.readline()
+		if stat.st_size < offset:
+			logger.log_info(f"File `{filename}` was truncated")
+			return None
+		file.seek(last_row_start)
+		last_row = file.read(offset - last_row_start)
+		appended = file.read(stat.st_size - offset)
+		new_tail, new_checksums = get_tail_info(file, stat.st_size)
+	signature = get_frame_cache_signature(stat=stat)
+
+	# Check that the header and last row did not change, and that the first
+	# appended row does not continue a last row without line break.
+	if get_checksum(header) != checksums[0] \
+		or get_checksum(last_row) != checksums[1] \
+		or (len(appended) > 0 and len(last_row) > 0 \
+		and not last_row.endswith(b"\n") \
+		and not appended.startswith((b"\n", b"\r"))):
+		logger.log_info(f"File `{filename}` was rewritten")
+		return None
+
+	# Parse the appended rows with the header of the file, using the types
+	# of the cached dataframe.
+	dtype = {column: str if df[column].dtype == object else df[column].dtype \
+		for column in file_columns}
+	try:
+		rows = pd.read_csv(io.BytesIO(header + appended), delimiter=";", \
+			usecols=lambda column: column in DATA_SCHEMA, dtype=dtype)
+	except Exception as e:
+		logger.log_info(f"Failed to read appended rows of `{filename}`: {e}")
+		return None
+
+	# The appended rows must have the same columns as the cached dataframe.
+	if set(rows.columns) != set(file_columns):
+		logger.log_info(f"Appended rows of `{filename}` have other columns")
+		return None
+	logger.log_info(f"Read {len(rows)} appended rows from `{filename}` " \
+		f"({len(appended)} bytes)")
+	if len(rows) == 0:
+		set_frame_source(df, signature, new_tail, new_checksums)
+		return df
+
+	# Reconstruct the dates of all rows, or convert the appended dates.
+	if reconstructed:
+		df = pd.concat([df[file_columns], rows[file_columns]], \
+			ignore_index=True)
+		df = reconstruct_dates(df)
+	else:
+		try:
+			rows["seconds_since_epoch"] = \
+				dates_to_seconds_since_epoch(rows["date"])
+		except ValueError as e:
+			logger.log_info(f"Failed to read appended rows of " \
+				f"`{filename}`: {e}")
+			return None
+		df = pd.concat([df, rows[df.columns]], ignore_index=True)
+	df.attrs["dates_reconstructed"] = reconstructed
+	set_frame_source(df, signature, new_tail, new_checksums)
+
+	# Return dataframe with the appended rows.
+	return df
+
+def load_cached_frame(username: str, lang: str, logger):
+	"""
+	Assumes `username` and `lang` are strings. Loads the cached dataframe of
+	the language from `cache/{username}/{lang}.npz`. If the csv file changed
+	since the dataframe was cached and APPEND_ONLY_INGEST is True, the rows
+	appended to the file are added to the dataframe using 
+	read_appended_rows(). Returns None if there is no cached dataframe, or 
+	if it is outdated and the file was not only appended to.
+	"""
+	# Check if the cache file exists.
+	cache_path = get_frame_cache_path(username, lang)
+	if not os.path.isfile(cache_path):
+		return None
+
+	# Load cache file. Catch any error while reading the file and log it.
+	try:
+		with np.load(cache_path, allow_pickle=False) as cache:
+			# Check if the cached frame was written by this version, and if
+			# it is up to date.
+			signature = get_frame_cache_signature(username, lang)
+			if cache["signature"][0] != signature[0]:
+				logger.log_info(f"Frame cache `{cache_path}` is outdated")
+				return None
+			up_to_date = np.array_equal(cache["signature"], signature)
+			if not up_to_date and not APPEND_ONLY_INGEST:
+				logger.log_info(f"Frame cache `{cache_path}` is outdated")
+				return None
+			tail, checksums = cache["tail"], cache["tail_checksums"]
+			reconstructed = bool(cache["dates_reconstructed"])
+
+			# Construct dataframe from the columns. Strings are stored as
+			# fixed width unicode arrays and converted back to objects, as
+			# pandas.read_csv() would return them.
+			columns = {}
+			for index, column in enumerate(cache["columns"]):
+				values = cache[f"column_{index}"]
+				if values.dtype.kind == "U":
+					values = values.astype(object)
+				columns[str(column)] = values
+	except Exception as e:
+		logger.log_error(f"Failed to load frame cache `{cache_path}`: {e}")
+		return None
+
+	# Return dataframe if it is up to date.
+	logger.log_info(f"Loaded dataframe from frame cache `{cache_path}`")
+	df = pd.DataFrame(columns)
+	df.attrs["dates_reconstructed"] = reconstructed
+	if up_to_date:
+		set_frame_source(df, signature, tail, checksums)
+		return df
+
+	# Append the rows appended to the csv file. Catch any error while 
+	# reading the file and log it.
+	filename = f"data/{username}/{lang}.csv"
+	try:
+		df = read_appended_rows(filename, df, tail, checksums, logger)
+	except Exception as e:
+		logger.log_error(f"Failed to read appended rows of `{filename}`: {e}")
+		df = None
+	if df is None:
+		logger.log_info(f"Frame cache `{cache_path}` is outdated")
+
+	# Return dataframe.
+	return df
+
+def save_cached_frames(lang_dict: dict, username: str, logger):
+	"""
+	Assumes `lang_dict` is a dictionary containing dataframes, as returned by
+	the function add_time_column(). Saves every dataframe of which the cache
+	is missing or outdated to `cache/{username}/{lang}.npz` as one numpy
+	array per column, together with the signature and the tail positions
+	and checksums of the version of the csv file which was read, see 
+	set_frame_source(), and whether the dates were reconstructed. 
+	Dataframes without this information, or containing values which cannot
+	be stored as numpy arrays, such as missing values in text columns, are
+	not cached.
+	"""
+	# Create `cache/{username}` folder if it does not exist.
+	os.makedirs(f"cache/{username}", exist_ok=True)
+
+	# Loop over all dataframes.
+	for lang, df in lang_dict.items():
+		cache_path = get_frame_cache_path(username, lang)
+
+		# Get the signature and tail of the csv file version the dataframe
+		# was read from. Taking them from the current file instead would 
+		# mark rows appended since then as cached.
+		if not all(key in df.attrs \
+			for key in ["signature", "tail", "tail_checksums"]):
+			continue
+		signature = np.array(df.attrs["signature"], dtype=np.int64)
+		tail = np.array(df.attrs["tail"], dtype=np.int64)
+		checksums = np.array(df.attrs["tail_checksums"])
+
+		# Skip dataframes of which the cache is up to date.
+		try:
+			if os.path.isfile(cache_path):
+				with np.load(cache_path, allow_pickle=False) as cache:
+					if np.array_equal(cache["signature"], signature):
+						continue
+		except Exception:
+			pass
+
+		# Convert columns to numpy arrays, text columns are converted to
+		# fixed width unicode arrays.
+		arrays = {"signature": signature, "tail": tail, \
+			"tail_checksums": checksums, "dates_reconstructed": \
+			np.array(df.attrs.get("dates_reconstructed", False)), \
+			"columns": np.array([str(column) for column in df.columns])}
+		cacheable = True
+		for index, column in enumerate(df.columns):
+			values = df[column].to_numpy()
+			if values.dtype == object:
+				if pd.api.types.infer_dtype(values) != "string":
+					cacheable = False
+					break
+				values = values.astype(str)
+			arrays[f"column_{index}"] = values
+
+		if not cacheable:
+			logger.log_info(f"Dataframe of language `{lang}` not cached: " \
+				"unsupported column values")
+			continue
+
+		# Write the cache file.
+		try:
+			save_npz_file(cache_path, arrays)
+			logger.log_info(f"Saved dataframe to frame cache `{cache_path}`")
+		except Exception as e:
+			logger.log_error(f"Failed to save frame cache `{cache_path}`: {e}")
+
+def load_frames(username: str, logger, langs=None):
+	"""
+	Assumes `username` is a string. Loads the dataframes of the user using
+	the frame cache where possible, adds the time column to the dataframes
+	loaded from csv files and updates their cache. Then validates the
+	dataframes and adds the derived metrics. `langs` is passed to
+	load_data(). Returns the dictionary of dataframes, or False if the user
+	folder does not exist.
+	"""
+	# Load data, returns false if the userfolder does not exist.
+	with logger.timer("load_data"):
+		lang_dict = load_data(username, logger, langs=langs, use_cache=True)
+	if lang_dict is False:
+		return False
+
+	# Add time column and update the cache.
+	with logger.timer("add_time_column"):
+		lang_dict = add_time_column(lang_dict, logger)
+	with logger.timer("save_cached_frames"):
+		save_cached_frames(lang_dict, username, logger)
+
+	# Validate data and add derived metrics, after caching so the cache only
+	# holds the data read from the csv files.
+	with logger.timer("validate_frames"):
+		lang_dict = validate_frames(lang_dict, logger)
+	with logger.timer("derive_metrics"):
+		lang_dict = derive_metrics(lang_dict, username, logger)
+
+	# Return dictionary.
+	return lang_dict
+
+def get_aggregate_cache_path(username: str):
+	"""
+	Assumes `username` is a string. Returns the path of the aggregate cache
+	file of the user.
+	"""
+	# Return cache path.
+	return f"cache/{username}_aggregate.npz"
+
+def get_aggregate_columns():
+	"""
+	Returns a dictionary mapping every column combined over all languages
+	to its aggregate as specified in PLOT_SPECS.
+	"""
+	# Return columns.
+	return {PLOT_SPECS[plot_name]["column"]: \
+		PLOT_SPECS[plot_name]["aggregate"] \
+		for plot_name in AGGREGATE_PLOT_NAMES}
+
+def align_series(x, values, index, cumulative: bool):
+	"""
+	Assumes `x` and `values` are numpy arrays of equal length and `index` is
+	a sorted numpy array containing all values of `x`. Returns an int64
+	array with the value of every date in `index`. Dates without value are
+	0, or if `cumulative` is True the last known value before the date (0
+	before the first date). Of duplicate dates the last value is used. The
+	array is a copy, so it can be modified in place.
+	"""
+	# Construct series indexed by date, without duplicate dates.
+	series = pd.Series(values, index=x)
+	series = series[~series.index.duplicated(keep="last")]
+
+	# Align series to the index and fill the dates without value.
+	aligned = series.reindex(index)
+	if cumulative:
+		aligned = aligned.ffill()
+	return aligned.fillna(0).to_numpy(dtype=np.int64, copy=True)
+
+def load_aggregate_cache(username: str, logger):
+	"""
+	Assumes `username` is a string. Loads the aggregate cache written by
+	save_aggregate_cache(). Returns None if there is no cache, or it was
+	written by another version or for other columns.
+	"""
+	# Check if the cache file exists.
+	cache_path = get_aggregate_cache_path(username)
+	if not os.path.isfile(cache_path):
+		return None
+
+	# Load cache file. Catch any error while reading the file and log it.
+	columns = list(get_aggregate_columns().keys())
+	try:
+		with np.load(cache_path, allow_pickle=False) as cache:
+			# Check if the cache is compatible.
+			if cache["version"][0] != AGGREGATE_CACHE_VERSION \
+				or cache["columns"].tolist() != columns:
+				logger.log_info(f"Aggregate cache `{cache_path}` is outdated")
+				return None
+
+			# Split the concatenated series of the languages.
+			bounds = np.cumsum(cache["lengths"])[:-1]
+			xs = np.split(cache["x"], bounds)
+			values = [np.split(cache[f"values_{index}"], bounds) \
+				for index in range(len(columns))]
+			langs = {}
+			for lang_index, lang in enumerate(cache["langs"].tolist()):
+				langs[lang] = {"signature": cache["signatures"][lang_index], \
+					"x": xs[lang_index]}
+				for index, column in enumerate(columns):
+					langs[lang][column] = values[index][lang_index]
+
+			# Construct aggregate.
+			aggregate = {"index": cache["index"], "langs": langs, \
+				"sums": {column: cache[f"sum_{index}"] \
+				for index, column in enumerate(columns)}}
+	except Exception as e:
+		logger.log_error(f"Failed to load aggregate cache `{cache_path}`: " \
+			f"{e}")
+		return None
+
+	# Return aggregate.
+	return aggregate
+
+def save_aggregate_cache(aggregate: dict, username: str, logger):
+	"""
+	Assumes `aggregate` is a dictionary as built by update_aggregate().
+	Saves it to `cache/{username}_aggregate.npz`, the series of all 
+	languages are concatenated per column.
+	"""
+	# Create `cache` folder if it does not exist.
+	os.makedirs("cache", exist_ok=True)
+
+	# Construct arrays.
+	columns = list(get_aggregate_columns().keys())
+	langs = list(aggregate["langs"].keys())
+	entries = [aggregate["langs"][lang] for lang in langs]
+	arrays = {
+		"version": np.array([AGGREGATE_CACHE_VERSION], dtype=np.int64),
+		"columns": np.array(columns),
+		"index": aggregate["index"],
+		"langs": np.array(langs, dtype=str),
+		"signatures": np.array([entry["signature"] for entry in entries], \
+			dtype=np.int64).reshape(-1, 3),
+		"lengths": np.array([len(entry["x"]) for entry in entries], \
+			dtype=np.int64),
+		"x": np.concatenate([entry["x"] for entry in entries] \
+			+ [np.empty(0, dtype=np.int64)])
+	}
+	for index, column in enumerate(columns):
+		arrays[f"sum_{index}"] = aggregate["sums"][column]
+		arrays[f"values_{index}"] = np.concatenate( \
+			[entry[column] for entry in entries] \
+			+ [np.empty(0, dtype=np.int64)])
+
+	# Write the cache file.
+	cache_path = get_aggregate_cache_path(username)
+	try:
+		save_npz_file(cache_path, arrays)
+		logger.log_info(f"Saved aggregate cache `{cache_path}`")
+	except Exception as e:
+		logger.log_error(f"Failed to save aggregate cache `{cache_path}`: {e}")
+
+def update_aggregate(username: str, langs: list, logger, lang_dict=None):
+	"""
+	Assumes `username` is a string and `langs` is the list of languages of
+	the user. Returns a dataframe combining the columns specified in 
+	get_aggregate_columns() over all languages, aligned on the dates of all
+	languages in the `seconds_since_epoch` column, or None if there is no
+	language to combine. The combination is cached in 
+	`cache/{username}_aggregate.npz` together with the series of every 
+	language, so only the contributions of languages whose csv file changed
+	or was removed are subtracted and added again. Dataframes of changed
+	languages are taken from `lang_dict` if present, otherwise they are
+	loaded using load_frames().
+	"""
+	# Load the cached aggregate, or start with an empty aggregate.
+	columns = get_aggregate_columns()
+	aggregate = load_aggregate_cache(username, logger)
+	if aggregate is None:
+		aggregate = {"index": np.empty(0, dtype=np.int64), "langs": {}, \
+			"sums": {column: np.empty(0, dtype=np.int64) \
+			for column in columns.keys()}}
+
+	# Get the signatures of the csv files.
+	signatures = {}
+	for lang in langs:
+		try:
+			signatures[lang] = get_frame_cache_signature(username, lang)
+		except OSError:
+			continue
+
+	# Find the languages which were removed or changed since the aggregate
+	# was cached.
+	removed = [lang for lang in aggregate["langs"].keys() \
+		if not lang in signatures]
+	changed = [lang for lang, signature in signatures.items() \
+		if not lang in aggregate["langs"] or not np.array_equal( \
+		aggregate["langs"][lang]["signature"], signature)]
+
+	# Update the aggregate if any language was removed or changed.
+	if len(removed) > 0 or len(changed) > 0:
+		logger.log_info(f"Updating aggregate for user `{username}` " \
+			f"({len(changed)} languages changed, {len(removed)} removed)")
+
+		# Load the dataframes of the changed languages if not supplied.
+		lang_dict = dict(lang_dict) if lang_dict is not None else {}
+		missing = [lang for lang in changed if not lang in lang_dict]
+		if len(missing) > 0:
+			lang_dict.update(load_frames(username, logger, langs=missing) \
+				or {})
+
+		# Construct the new series of the changed languages. Languages of
+		# which the series cannot be constructed are left out.
+		incoming = {}
+		for lang in changed:
+			df = lang_dict.get(lang)
+			required = ["seconds_since_epoch"] + list(columns.keys())
+			if df is None or not all(column in df.columns \
+				for column in required):
+				logger.log_error(f"Language `{lang}` left out of the " \
+					"aggregate: data not available")
+				continue
+			try:
+				# Use the signature of the file version the dataframe was 
+				# read from, so rows appended since then are added later.
+				signature = np.array(df.attrs.get("signature", \
+					signatures[lang]), dtype=np.int64)
+				entry = {"signature": signature, \
+					"x": df["seconds_since_epoch"].to_numpy(dtype=np.int64)}
+				for column in columns.keys():
+					entry[column] = df[column].to_numpy(dtype=np.int64)
+			except (TypeError, ValueError) as e:
+				logger.log_error(f"Language `{lang}` left out of the " \
+					f"aggregate: {e}")
+				continue
+			incoming[lang] = entry
+
+		# Remove the old series of removed and changed languages.
+		outgoing = {lang: aggregate["langs"].pop(lang) \
+			for lang in removed + changed if lang in aggregate["langs"]}
+
+		# Construct the new shared date index from the series of all
+		# remaining languages.
+		aggregate["langs"].update(incoming)
+		index = np.unique(np.concatenate([entry["x"] \
+			for entry in aggregate["langs"].values()] \
+			+ [np.empty(0, dtype=np.int64)]))
+
+		# Align the old sums to the new index, subtract the old series and
+		# add the new series.
+		for column, method in columns.items():
+			cumulative = method == "cumulative_sum"
+			total = align_series(aggregate["index"], \
+				aggregate["sums"][column], index, cumulative)
+			for entry in outgoing.values():
+				total -= align_series(entry["x"], entry[column], index, \
+					cumulative)
+			for entry in incoming.values():
+				total += align_series(entry["x"], entry[column], index, \
+					cumulative)
+			aggregate["sums"][column] = total
+		aggregate["index"] = index
+
+		# Update the cache.
+		save_aggregate_cache(aggregate, username, logger)
+
+	# There is nothing to show without languages.
+	if len(aggregate["langs"]) == 0:
+		return None
+
+	# Return dataframe.
+	return pd.DataFrame({"seconds_since_epoch": aggregate["index"], \
+		**aggregate["sums"]})
+
+def validate_frame(df):
+	"""
+	Assumes `df` is a dataframe containing the `seconds_since_epoch` column.
+	Checks the rows in linear time and quarantines (leaves out) or repairs
+	bad rows. Dates earlier than a previous date are moved forward by one
+	year if that makes all dates ascend, which repairs the date rollover bug
+	described in PLAN.md, otherwise these rows are quarantined. Of rows with
+	the same date only the last row is kept. Rows where a column in 
+	CUMULATIVE_COLUMNS is lower than in any previous kept row are 
+	quarantined, so the kept values never decrease. Negative daily 
+	experience is set to 0. Returns a tuple containing the dataframe without
+	quarantined rows and a dictionary mapping the description of every 
+	finding to its amount of rows.
+	"""
+	# Initialize findings and mask of the rows to keep.
+	findings = {}
+	seconds = df["seconds_since_epoch"].to_numpy(dtype=np.int64)
+	keep = np.ones(len(df), dtype=bool)
+
+	# Find dates earlier than any previous date.
+	backwards = np.zeros(len(df), dtype=bool)
+	backwards[1:] = seconds[1:] < np.maximum.accumulate(seconds)[:-1]
+	if backwards.any():
+		# Move these dates forward by one year and check if all dates
+		# ascend, duplicate dates are handled next.
+		dates = pd.to_datetime(seconds[backwards], unit="s", \
+			origin=pd.Timestamp(EPOCH_DATE)) + pd.DateOffset(years=1)
+		shifted = seconds.copy()
+		shifted[backwards] = (dates - EPOCH_DATE) // pd.Timedelta(seconds=1)
+		if np.all(shifted[1:] >= np.maximum.accumulate(shifted)[:-1]):
+			# Repair dates.
+			seconds = shifted
+			df = df.copy()
+			df["seconds_since_epoch"] = seconds
+			if "date" in df.columns:
+				df.loc[backwards, "date"] = \
+					np.asarray(dates.strftime(DATE_FORMAT))
+			findings["dates moved forward by one year"] = \
+				int(backwards.sum())
+		else:
+			# Quarantine rows.
+			keep &= ~backwards
+			findings["rows quarantined with a date earlier than a " \
+				"previous date"] = int(backwards.sum())
+
+	# Quarantine all but the last row of every date.
+	kept = np.flatnonzero(keep)
+	duplicates = pd.Series(seconds[kept]).duplicated(keep="last").to_numpy()
+	if duplicates.any():
+		keep[kept[duplicates]] = False
+		findings["rows quarantined with a duplicate date"] = \
+			int(duplicates.sum())
+
+	# Quarantine rows where a cumulative column is lower than the maximum
+	# of the previous kept rows. Rows below the maximum are quarantined, so
+	# the maximum of all previous rows equals that of the kept rows. Missing
+	# values are ignored by np.fmax.
+	for column in CUMULATIVE_COLUMNS:
+		if not column in df.columns:
+			continue
+		kept = np.flatnonzero(keep)
+		values = df[column].to_numpy()[kept]
+		decreasing = np.zeros(len(kept), dtype=bool)
+		decreasing[1:] = values[1:] < np.fmax.accumulate(values)[:-1]
+		if decreasing.any():
+			keep[kept[decreasing]] = False
+			findings[f"rows quarantined with decreasing `{column}`"] = \
+				int(decreasing.sum())
+
+	# Remove quarantined rows.
+	if not keep.all():
+		df = df[keep].reset_index(drop=True)
+
+	# Set negative daily experience to 0.
+	if "daily_xp" in df.columns:
+		negative = df["daily_xp"].to_numpy() < 0
+		if negative.any():
+			df = df.copy()
+			df.loc[negative, "daily_xp"] = 0
+			findings["negative daily experience set to 0"] = \
+				int(negative.sum())
+
+	# Return dataframe and findings.
+	return df, findings
+
+def validate_frames(lang_dict: dict, logger):
+	"""
+	Assumes `lang_dict` is a dictionary containing dataframes, as returned by
+	the function add_time_column(). Validates every dataframe using 
+	validate_frame() and logs the findings. Returns a dictionary containing
+	the validated dataframes.
+	"""
+	# Loop over all dataframes.
+	validated = {}
+	for lang, df in lang_dict.items():
+		# Dataframes without time column cannot be validated.
+		if not "seconds_since_epoch" in df.columns:
+			validated[lang] = df
+			continue
+
+		# Validate dataframe and log findings.
+		validated[lang], findings = validate_frame(df)
+		if len(findings) == 0:
+			logger.log_info(f"Validated data of language `{lang}`: no " \
+				"problems found")
+		for description, rows in findings.items():
+			logger.log_error(f"Validated data of language `{lang}`: " \
+				f"{rows} {description}")
+
+	# Return dictionary.
+	return validated
+
+def get_available_metrics(columns):
+	"""
+	Assumes `columns` is an iterable of column names. Returns the list of
+	derived metrics of which all input columns in METRIC_INPUTS, and the
+	`seconds_since_epoch` column, are present.
+	"""
+	# Return metrics of which all inputs are present.
+	if not "seconds_since_epoch" in columns:
+		return []
+	return [metric for metric, inputs in METRIC_INPUTS.items() \
+		if all(column in columns for column in inputs)]
+
+def compute_derived_metrics(columns: dict, start=0, previous=None):
+	"""
+	Assumes `columns` is a dictionary mapping `seconds_since_epoch` and any
+	of the other METRIC_INPUT_COLUMNS to numpy arrays of equal length sorted
+	by date. Computes the derived metrics of the rows from index `start` 
+	onwards: the rolling daily experience averages over ROLLING_WINDOWS 
+	calendar days, the streak in consecutive practiced days, the words 
+	learned per day and the experience per level. Only the metrics of which
+	the input columns in METRIC_INPUTS are present are computed. If `start`
+	is larger than 0, `previous` is a dictionary containing the derived 
+	metrics of the rows before `start`, only the rows needed as context are
+	used. Returns a dictionary mapping the metric columns to arrays 
+	containing the values of the rows from `start` onwards.
+	"""
+	# Get the time column and the metrics which can be computed.
+	seconds = columns["seconds_since_epoch"]
+	available = get_available_metrics(columns.keys())
+	seed = max(start - 1, 0)
+	metrics = {}
+
+	# Compute the rolling averages. The windows of the first rows need the
+	# rows of the preceding days as context.
+	windows = [days for days in ROLLING_WINDOWS \
+		if f"xp_{days}_day_average" in available]
+	if len(windows) > 0:
+		context = 0
+		if start > 0:
+			context = np.searchsorted(seconds[:start], \
+				seconds[start] - 86400 * max(windows), side="right")
+		series = pd.Series(columns["daily_xp"][context:] \
+			.astype(np.float64), index=pd.to_datetime(seconds[context:], \
+			unit="s"))
+		for days in windows:
+			rolling = series.rolling(f"{days}D").sum().to_numpy() / days
+			metrics[f"xp_{days}_day_average"] = rolling[start - context:]
+
+	# Compute the streak. A streak continues if a day was practiced and the
+	# previous row is the preceding day and was practiced. The streak of
+	# every row is the amount of rows since the start of its run. The row 
+	# before `start` is used as context.
+	if "streak" in available:
+		day = seconds[seed:] // 86400
+		practiced = columns["daily_xp"][seed:] > 0
+		continues = np.zeros(len(day), dtype=bool)
+		continues[1:] = practiced[1:] & practiced[:-1] \
+			& (np.diff(day) == 1)
+		row = np.arange(len(day))
+		run_start = np.maximum.accumulate(np.where(continues, 0, row))
+		streak = np.where(practiced, row - run_start + 1, 0)
+		if start > 0:
+			# Continue the streak of the row before `start`.
+			streak[(run_start == 0) & practiced] += \
+				previous["streak"][start - 1] - streak[0]
+			streak = streak[1:]
+		metrics["streak"] = streak
+
+	# Compute the words learned per day, the first row has no previous row
+	# and gets 0. The row before `start` is used as context.
+	if "words_per_day" in available:
+		words = columns["total_words_learned"]
+		if start > 0:
+			metrics["words_per_day"] = np.diff(words[seed:])
+		else:
+			metrics["words_per_day"] = np.diff(words, prepend=words[:1])
+
+	# Compute the experience per level.
+	if "xp_per_level" in available:
+		total_xp = columns["total_xp"][start:].astype(np.float64)
+		level = columns["level"][start:]
+		metrics["xp_per_level"] = np.divide(total_xp, level, \
+			out=np.zeros(len(level)), where=level > 0)
+
+	# Return metrics.
+	return metrics
+
+def get_streaks(df):
+	"""
+	Assumes `df` is a dataframe containing the `streak` column added by
+	derive_metrics(). Returns a tuple containing the current streak, which
+	is the streak of the last entry, and the longest streak in days.
+	"""
+	# Return current and longest streak.
+	if len(df) == 0:
+		return 0, 0
+	return int(df["streak"].iloc[-1]), int(df["streak"].max())
+
+def derive_metrics(lang_dict: dict, username: str, logger):
+	"""
+	Assumes `lang_dict` is a dictionary containing dataframes, as returned by
+	the function add_time_column(). Adds the derived metric columns computed
+	by compute_derived_metrics() to every dataframe, each metric only if 
+	the dataframe contains its input columns (see METRIC_INPUTS). The 
+	metrics are cached per language and input version, the version being
+	the signature of the csv file version the dataframe was read from, see
+	set_frame_source(). If the input changed but only rows were appended,
+	only the metrics of the appended rows are computed. The metrics of at
+	most DERIVED_METRICS_CACHE_USERS users are cached. Returns the 
+	dictionary.
+	"""
+	# Get the cached metrics of the user and mark the user as most recently
+	# used, forget the least recently used users.
+	user_cache = _derived_metrics_cache.setdefault(username, {})
+	_derived_metrics_cache.move_to_end(username)
+	while len(_derived_metrics_cache) > DERIVED_METRICS_CACHE_USERS:
+		_derived_metrics_cache.popitem(last=False)
+
+	# Loop over all dataframes.
+	for lang, df in lang_dict.items():
+		# Log the metrics which cannot be derived due to missing input 
+		# columns, skip dataframes of which no metric can be derived.
+		available = get_available_metrics(df.columns)
+		missing = [metric for metric in METRIC_INPUTS.keys() \
+			if not metric in available]
+		if len(missing) > 0:
+			logger.log_error(f"Failed to derive metrics {missing} for " \
+				f"language `{lang}`: missing input columns")
+		if len(available) == 0:
+			continue
+
+		# Get input version and columns, the metrics are computed in date
+		# order.
+		version = df.attrs.get("signature")
+		columns = {column: df[column].to_numpy() \
+			for column in METRIC_INPUT_COLUMNS if column in df.columns}
+		order = None
+		if np.any(np.diff(columns["seconds_since_epoch"]) < 0):
+			order = np.argsort(columns["seconds_since_epoch"], kind="stable")
+			columns = {column: values[order] \
+				for column, values in columns.items()}
+
+		# Reuse the cached metrics if the input did not change, compute the
+		# appended rows if the cached input is a prefix of the input, and
+		# compute all rows otherwise, or if the input columns changed.
+		cached = user_cache.get(lang)
+		rows = len(df)
+		start = 0
+		if cached is not None and cached["columns"].keys() == columns.keys():
+			cached_rows = len(cached["columns"]["seconds_since_epoch"])
+			if version is not None and np.array_equal(cached["version"], \
+				version) and cached_rows == rows:
+				start = rows
+			elif 0 < cached_rows <= rows and all(np.array_equal( \
+				values[:cached_rows], cached["columns"][column]) \
+				for column, values in columns.items()):
+				start = cached_rows
+
+		if start == rows and rows > 0:
+			metrics = cached["metrics"]
+		elif start > 0:
+			tail = compute_derived_metrics(columns, start=start, \
+				previous=cached["metrics"])
+			metrics = {column: np.concatenate((values, tail[column])) \
+				for column, values in cached["metrics"].items()}
+			logger.log_info(f"Derived metrics of {rows - start} appended " \
+				f"rows for language `{lang}`")
+		else:
+			metrics = compute_derived_metrics(columns)
+		user_cache[lang] = {"version": version, \
+			"columns": columns, "metrics": metrics}
+
+		# Add metric columns in the original row order.
+		for column, values in metrics.items():
+			if order is not None:
+				unsorted = np.empty_like(values)
+				unsorted[order] = values
+				values = unsorted
+			df[column] = values
+
+		# Log streaks.
+		current, longest = get_streaks(df)
+		logger.log_info(f"Language `{lang}` has a current streak of " \
+			f"{current} days, the longest streak is {longest} days")
+
+	# Return dictionary.
+	return lang_dict
+
+def get_render_settings():
+	"""
+	Returns a dictionary containing the settings which influence the
+	rendered plots. Plots rendered with different settings are considered
+	outdated.
+	"""
+	# Return settings dictionary.
+	return {
+		"extra_days": EXTRA_DAYS,
+		"xticks_rotation": XTICKS_ROTATION,
+		"max_xticks": MAX_XTICKS,
+		"plot_dpi": PLOT_DPI,
+		"downsample_method": DOWNSAMPLE_METHOD,
+		"downsample_points_per_pixel": DOWNSAMPLE_POINTS_PER_PIXEL,
+		"plot_specs": PLOT_SPECS
+	}
+
+def get_manifest_path(username: str):
+	"""
+	Assumes `username` is a string. Returns the path of the manifest file of
+	the user, which is stored next to the folder `figures/{username}/`.
+	"""
+	# Return manifest path.
+	return f"figures/{username}_manifest.json"
+
+def get_file_hash(filename: str):
+	"""
+	Assumes `filename` is a string. Returns the sha1 hash of the contents of
+	the file as a hexadecimal string.
+	"""
+	# Read the file in blocks and update the hash.
+	sha1 = hashlib.sha1()
+	with open(filename, "rb") as file:
+		for block in iter(lambda: file.read(1 << 20), b""):
+			sha1.update(block)
+
+	# Return hash.
+	return sha1.hexdigest()
+
+def get_source_signature(filename: str, previous=None):
+	"""
+	Assumes `filename` is a string and `previous` is either None or a
+	signature previously returned by this function. Returns a dictionary
+	containing the size, modification time and content hash of the file. The
+	hash is copied from `previous` if the size and modification time did not
+	change, so unchanged files are not read.
+	"""
+	# Get size and modification time.
+	stat = os.stat(filename)
+	signature = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+	# Reuse the previous hash if size and modification time are unchanged.
+	if previous is not None and previous.get("size") == signature["size"] \
+		and previous.get("mtime_ns") == signature["mtime_ns"]:
+		signature["sha1"] = previous.get("sha1")
+	else:
+		signature["sha1"] = get_file_hash(filename)
+
+	# Return signature.
+	return signature
+
+def load_manifest(username: str, logger):
+	"""
+	Assumes `username` is a string. Loads the manifest of the user. Returns
+	an empty manifest if the file does not exist, cannot be read, or was
+	written with different render settings or manifest version.
+	"""
+	# Define empty manifest.
+	empty_manifest = {"version": MANIFEST_VERSION, \
+		"settings": get_render_settings(), "languages": {}}
+
+	# Check if the manifest exists.
+	manifest_path = get_manifest_path(username)
+	if not os.path.isfile(manifest_path):
+		return empty_manifest
+
+	# Load manifest. Catch any error while reading the file and log it.
+	try:
+		with open(manifest_path, "r") as file:
+			manifest = json.load(file)
+	except Exception as e:
+		logger.log_error(f"Failed to load manifest `{manifest_path}`: {e}")
+		return empty_manifest
+
+	# Discard the manifest if it was written with other settings.
+	if manifest.get("version") != MANIFEST_VERSION \
+		or manifest.get("settings") != get_render_settings():
+		logger.log_info(f"Render settings changed, ignoring manifest " \
+			f"`{manifest_path}`")
+		return empty_manifest
+
+	# Return manifest.
+	return manifest
+
+def save_manifest(username: str, manifest: dict, logger):
+	"""
+	Assumes `username` is a string and `manifest` is a dictionary as returned
+	by load_manifest(). Writes the manifest to disk using replace_file(), so
+	an interrupted write does not leave a corrupt manifest.
+	"""
+	# Create `figures` folder if it does not exist.
+	if not os.path.isdir("figures"):
+		os.mkdir("figures")
+
+	# Write to temporary file and replace the manifest.
+	manifest_path = get_manifest_path(username)
+	try:
+		replace_file(manifest_path, lambda file: json.dump(manifest, file, \
+			indent=4), mode="w")
+	except Exception as e:
+		logger.log_error(f"Failed to save manifest `{manifest_path}`: {e}")
+
+def get_outdated_languages(username: str, manifest: dict):
+	"""
+	Assumes `username` is a string and `manifest` is a dictionary as returned
+	by load_manifest(). Returns a tuple containing a dictionary with the
+	current source signature of every language, and a list of languages
+	which need to be regenerated: the source file changed, the language is
+	not present in the manifest, or one of its plots failed to export or is
+	missing, so failed plots are retried. Plots which are unavailable, 
+	because the data lacks their column, are only retried once the source
+	file or the render settings change.
+	"""
+	# Initialize signatures dictionary and outdated list.
+	signatures = {}
+	outdated = []
+
+	# Loop all csv files in the user folder.
+	userfolder = f"data/{username}/"
+	for file in sorted(os.listdir(userfolder)):
+		if not file.endswith(".csv"):
+			continue
+		lang = file[:-len(".csv")]
+
+		# Compute signature, reusing the hash from the manifest if possible.
+		entry = manifest["languages"].get(lang)
+		previous = entry["source"] if entry is not None else None
+		signatures[lang] = get_source_signature(userfolder + file, previous)
+
+		# Check if the language is new or its source file changed.
+		if entry is None or previous.get("sha1") != signatures[lang]["sha1"]:
+			outdated.append(lang)
+			continue
+
+		# Check if all available plots were exported and still exist.
+		for plot_name in PLOT_NAMES:
+			if plot_name in entry.get("unavailable", []):
+				continue
+			if not plot_name in entry["plots"] or not os.path.isfile( \
+				f"figures/{username}/{lang}/{plot_name}.png"):
+				outdated.append(lang)
+				break
+
+	# Return signatures and outdated languages.
+	return signatures, outdated
+
+def persist_images_async(images: dict, username: str, manifest: dict, \
+	logger, on_persisted=None):
+	"""
+	Assumes `images` is a dictionary of RGB arrays as filled by export_plots()
+	and `manifest` is a dictionary as returned by load_manifest(). Saves the
+	images and then the manifest in a background thread. If `on_persisted`
+	is not None, it is called from that thread with the paths returned by
+	persist_images() once the images are saved, so the caller can release 
+	the arrays. The thread is registered, so the next regeneration of the
+	user waits for it, see wait_for_persisted(). Returns the thread.
+	"""
+	# Define thread function.
+	def persist():
+		saved = persist_images(images, username, logger)
+		save_manifest(username, manifest, logger)
+		if on_persisted is not None:
+			on_persisted(saved)
+
+	# Start, register and return thread.
+	thread = threading.Thread(target=persist)
+	thread.start()
+	_persist_threads[username] = thread
+	return thread
+
+def wait_for_persisted(username: str):
+	"""
+	Assumes `username` is a string. Waits until the images and manifest of
+	the user which are being saved by persist_images_async() are saved.
+	Until then the manifest on disk is outdated, and the same images would
+	be written again.
+	"""
+	# Wait for the thread saving the images of the user.
+	thread = _persist_threads.pop(username, None)
+	if thread is not None:
+		thread.join()
+
+def regenerate_plots(username: str, logger, force=False, workers=1, \
+	progress=None, cancel_event=None, images=None, on_persisted=None, \
+	images_max_bytes=None):
+	"""
+	Assumes `username` is a string. Loads the data of the user, adds the time
+	column and exports the plots, but only for languages whose source file
+	or render settings changed since the last run according to the manifest
+	`figures/{username}_manifest.json`. All languages are regenerated if
+	`force` is True. `workers`, `progress`, `cancel_event`, `images` and
+	`images_max_bytes` are passed to export_plots(). If the plots are 
+	rendered to memory using `images`, they are saved and the manifest is
+	updated in a background thread, so the caller can show them 
+	immediately, `on_persisted` is passed to persist_images_async(). The 
+	next regeneration of the user waits until they are saved. Returns False
+	if the user folder does not exist, otherwise a dictionary containing 
+	the amount of `rebuilt`, `skipped` and `failed` plots, the amount of 
+	`unavailable` plots which cannot be exported from the data (see 
+	export_plots()) and whether the regeneration was `cancelled`.
+	"""
+	# Check if the folder exists.
+	userfolder = f"data/{username}/"
+	if not os.path.exists(userfolder):
+		logger.log_error(f"Userfolder does not exist `{userfolder}`!")
+		return False
+
+	# Wait until the images of the previous regeneration are saved, then
+	# load manifest and determine which languages need to be regenerated,
+	# the user folder may be removed meanwhile.
+	wait_for_persisted(username)
+	manifest = load_manifest(username, logger)
+	try:
+		signatures, outdated = get_outdated_languages(username, manifest)
+	except OSError as e:
+		logger.log_error(f"Failed to read userfolder `{userfolder}`: {e}")
+		return False
+	if force:
+		outdated = list(signatures.keys())
+
+	# Load, process and export only the outdated languages.
+	exported = {}
+	unavailable = {}
+	lang_dict = {}
+	if len(outdated) > 0:
+		# Loading returns false if the user folder was removed meanwhile.
+		lang_dict = load_frames(username, logger, langs=outdated)
+		if lang_dict is False:
+			return False
+		with logger.timer("export_plots"):
+			exported = export_plots(lang_dict, username, logger, \
+				workers=workers, progress=progress, \
+				cancel_event=cancel_event, images=images, \
+				unavailable=unavailable, images_max_bytes=images_max_bytes)
+	elif progress is not None:
+		progress(0, 0)
+
+	# If the export was cancelled, the regenerated languages may be only
+	# partially exported. They are left out of the manifest so they are
+	# regenerated next time.
+	cancelled = cancel_event is not None and cancel_event.is_set()
+
+	# Update and export the plots combining all languages if any language
+	# was regenerated or removed, or the plots failed to export or are
+	# missing.
+	removed = [lang for lang in manifest["languages"].keys() \
+		if not lang in signatures]
+	aggregate_entry = manifest.get("aggregate")
+	aggregate_outdated = len(outdated) > 0 or len(removed) > 0 \
+		or aggregate_entry is None or not all(plot_name \
+		in aggregate_entry.get("unavailable", []) or (plot_name \
+		in aggregate_entry["plots"] and os.path.isfile( \
+		f"figures/{username}/{ALL_LANGUAGES}/{plot_name}.png")) \
+		for plot_name in AGGREGATE_PLOT_NAMES)
+	exported_aggregate = []
+	unavailable_aggregate = []
+	failed_aggregate = 0
+	if aggregate_outdated and not cancelled:
+		with logger.timer("update_aggregate"):
+			aggregate = update_aggregate(username, \
+				list(signatures.keys()), logger, lang_dict=lang_dict)
+		# Without languages to combine, the plots are unavailable.
+		if aggregate is not None:
+			with logger.timer("export_aggregate_plots"):
+				exported_aggregate = export_plots( \
+					{ALL_LANGUAGES: aggregate}, username, logger, \
+					cancel_event=cancel_event, images=images, \
+					unavailable=unavailable, \
+					images_max_bytes=images_max_bytes)[ALL_LANGUAGES]
+			unavailable_aggregate = unavailable.get(ALL_LANGUAGES, [])
+		else:
+			unavailable_aggregate = list(AGGREGATE_PLOT_NAMES)
+		cancelled = cancel_event is not None and cancel_event.is_set()
+		if not cancelled:
+			failed_aggregate = len(AGGREGATE_PLOT_NAMES) \
+				- len(exported_aggregate) - len(unavailable_aggregate)
+
+	# Update the manifest: store the new signatures, exported plots and
+	# unavailable plots of the regenerated languages, and drop languages
+	# whose files were removed.
+	languages = {}
+	for lang, signature in signatures.items():
+		if lang in outdated and cancelled:
+			continue
+		elif lang in outdated:
+			languages[lang] = {"source": signature, \
+				"plots": exported.get(lang, []), \
+				"unavailable": unavailable.get(lang, [])}
+		else:
+			languages[lang] = manifest["languages"][lang]
+	manifest["languages"] = languages
+	if aggregate_outdated and cancelled:
+		manifest.pop("aggregate", None)
+	elif aggregate_outdated:
+		manifest["aggregate"] = {"plots": exported_aggregate, \
+			"unavailable": unavailable_aggregate}
+
+	# Save the manifest. Plots rendered to memory are saved first in a
+	# background thread, the manifest is only saved after them so it never
+	# lists plots which are not on disk yet.
+	if images is not None and len(images) > 0:
+		persist_images_async(images, username, manifest, logger, \
+			on_persisted=on_persisted)
+	else:
+		save_manifest(username, manifest, logger)
+
+	# Log how many languages and plots were skipped and rebuilt.
+	skipped_langs = len(signatures) - len(outdated)
+	skipped_plots = sum(len(languages[lang]["plots"]) \
+		for lang in signatures.keys() if not lang in outdated)
+	rebuilt_plots = sum(len(plots) for plots in exported.values())
+	logger.log_info(f"Regenerated plots for user `{username}`: " \
+		f"{len(outdated)} languages rebuilt ({rebuilt_plots} plots), " \
+		f"{skipped_langs} languages skipped ({skipped_plots} plots), " \
+		f"{len(exported_aggregate)} plots of all languages rebuilt")
+
+	# Return summary. Plots of regenerated languages which were not 
+	# exported, are not unavailable and were not skipped due to cancelling,
+	# have failed. Unavailable plots are counted for all languages, also 
+	# the skipped ones. The plots combining all languages count as well.
+	failed_plots = 0
+	if not cancelled:
+		failed_plots = len(outdated) * len(PLOT_NAMES) - rebuilt_plots \
+			- sum(len(unavailable.get(lang, [])) for lang in outdated) \
+			+ failed_aggregate
+	unavailable_plots = sum(len(entry.get("unavailable", [])) \
+		for entry in languages.values()) \
+		+ len(manifest.get("aggregate", {}).get("unavailable", []))
+	rebuilt_plots += len(exported_aggregate)
+	if not aggregate_outdated:
+		skipped_plots += len(aggregate_entry["plots"])
+	return {"rebuilt": rebuilt_plots, "skipped": skipped_plots, \
+		"failed": failed_plots, "unavailable": unavailable_plots, \
+		"cancelled": cancelled}
@@ -0,0 +1,82 @@
+import wx
+
+class LoadingScreen(wx.Frame):
+	"""
+	This class represents the loading screen which is shown while the plots
+	are being generated. It shows how many plots have been generated, a
+	progress bar and a button to cancel the generation.
+	"""
+	def __init__(self, parent, on_cancel):
+		"""
+		Initialize superclass, add the progress text, progress bar and cancel
+		button, and show the loading screen. Assumes `on_cancel` is a
+		function without parameters which gets called when the cancel button
+		is clicked.
+		"""
+		# Initialize superclass.
+		wx.Frame.__init__(self, parent, title="Generating plots", \
+			size=(460, 180), style=wx.CAPTION | wx.FRAME_FLOAT_ON_PARENT)
+
+		# Save variables.
+		self.on_cancel = on_cancel
+
+		# Create a top level panel so it looks correct on all platforms.
+		panel = wx.Panel(self, wx.ID_ANY)
+
+		# Create progress text.
+		self.progress_text = wx.StaticText(panel, label="Loading data...")
+
+		# Create progress bar and percentage text.
+		self.progress_bar = wx.Gauge(panel, range=100, size=(300, 25))
+		self.percentage_text = wx.StaticText(panel, label="0%")
+
+		# Create cancel button.
+		self.cancel_button = wx.Button(panel, label="Cancel")
+		self.Bind(wx.EVT_BUTTON, self.cancel_event, self.cancel_button)
+
+		# Create sizer for the progress bar and the percentage text.
+		progress_sizer = wx.BoxSizer(wx.HORIZONTAL)
+		progress_sizer.Add(self.progress_bar, proportion=1, \
+			flag=wx.ALIGN_CENTER_VERTICAL)
+		progress_sizer.Add(self.percentage_text, proportion=0, \
+			flag=wx.LEFT | wx.ALIGN_CENTER_VERTICAL, border=10)
+
+		# Create main sizer and add the components to it.
+		main_sizer = wx.BoxSizer(wx.VERTICAL)
+		main_sizer.Add(self.progress_text, flag=wx.ALL, border=10)
+		main_sizer.Add(progress_sizer, flag=wx.ALL | wx.EXPAND, border=10)
+		main_sizer.Add(self.cancel_button, flag=wx.ALL | wx.ALIGN_RIGHT, \
+			border=10)
+
+		# Set panel sizer.
+		panel.SetSizer(main_sizer)
+
+		# Show loading screen.
+		self.Center()
+		self.Show(True)
+
+	def update_progress(self, done, total):
+		"""
+		Assumes `done` and `total` are integers. Updates the progress text,
+		progress bar and percentage text to show that `done` out of `total`
+		plots have been generated.
+		"""
+		# Calculate percentage, an empty generation is done immediately.
+		percentage = int(100 * done / total) if total > 0 else 100
+
+		# Update components.
+		self.progress_text.SetLabel(f"Plots generated: {done}/{total}")
+		self.progress_bar.SetValue(percentage)
+		self.percentage_text.SetLabel(f"{percentage}%")
+
+	def cancel_event(self, event):
+		"""
+		Gets called when the cancel button is clicked. Disables the button
+		and calls the `on_cancel` function.
+		"""
+		# Disable the button and show that the generation is being cancelled.
+		self.cancel_button.Disable()
+		self.progress_text.SetLabel("Cancelling...")
+
+		# Cancel generation.
+		self.on_cancel()
@@ -1,6 +1,14 @@
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
 from enum import Enum
+import functools
+import json
 import os
+import queue
+import threading
+import time
+import tracemalloc
 
 class LogLevel(Enum):
 	"""
@@ -15,14 +23,36 @@ class LogLevel(Enum):
 	# constructing strings from the loglevel.
 	MAX_LENGTH = 5
 
+def format_message(timestamp, loglevel, message):
+	"""
+	Assumes `timestamp` is a time in seconds since the epoch as returned by
+	time.time(), `loglevel` is an instance of LogLevel and `message` is a
+	string. Returns the line representing the message in the console and in
+	the log file, without newline.
+	"""
+	# Construct datetime string.
+	dt_string = datetime.fromtimestamp(timestamp)\
+		.strftime("%Y-%m-%d %H:%M:%S")
+
+	# Construct full line string. The spaces is the amount of spaces between
+	# loglevel and the datetime. The loglevel names have different lengths,
+	# this makes sure the datetimes are aligned.
+	spaces = " " * (LogLevel.MAX_LENGTH.value - len(loglevel.name) + 1)
+	return f"[{loglevel.name}]{spaces}[{dt_string}] {message}"
+
 class Logger:
 	"""
 	Class for collecting, holding and outputting info-, debug- and 
 	error messages.
 	"""
-	def __init__(self, loglevel=LogLevel.INFO):
+	def __init__(self, loglevel=LogLevel.INFO, streaming=False, \
+		buffer_size=10000, timings_size=10000):
 		"""
-		Set loglevel, initialize messages list and construct filename.
+		Set loglevel, initialize messages list and construct filename. If 
+		`streaming` is True, only the last `buffer_size` messages are kept in
+		memory and all messages are written to the log file by a background
+		thread as they arrive, instead of all at once by output_to_file().
+		Only the last `timings_size` timings are kept in memory.
 		"""
 		# Check if loglevel is an instance of LogLevel.
 		assert isinstance(loglevel, LogLevel), "src/logger.py" \
@@ -34,18 +64,42 @@ class Logger:
 		# loglevel of the Logger class.
 		self.loglevel = loglevel
 
-		# Initialize messages list.
-		self.messages = []
-
 		# Get start date and time.
 		self.filename = datetime.now().strftime("LOG_%Y_%m_%d_%H_%M_%S.txt")
 
+		# Initialize messages list. In streaming mode the messages list is a
+		# ring buffer holding the last `buffer_size` messages, and messages
+		# are passed to the writer thread using a queue.
+		self.streaming = streaming
+		if self.streaming:
+			self.messages = deque(maxlen=buffer_size)
+			self.queue = queue.SimpleQueue()
+			self.writer_thread = threading.Thread(target=self.write_messages, \
+				daemon=True)
+			self.writer_thread.start()
+		else:
+			self.messages = []
+
+		# Initialize timings ring buffer, holding a dictionary for each of the
+		# last `timings_size` timed stages, see record_timing(). Without a 
+		# bound the timings of a long running session grow without limit.
+		self.timings = deque(maxlen=timings_size)
+
 		self.log_info("Logger initialized")
 
 	def output_to_file(self):
 		"""
-		Outputs all submitted messages to a log file in the folder `logs`.
+		Outputs all submitted messages to a log file in the folder `logs`. In
+		streaming mode the messages have already been written, the writer
+		thread is stopped after writing the remaining messages.
 		"""
+		# Stop the writer thread in streaming mode.
+		if self.streaming:
+			if self.writer_thread.is_alive():
+				self.queue.put(None)
+				self.writer_thread.join()
+			return
+
 		# Check if logs folder already exists, if not: create it.
 		if not os.path.isdir("logs/"):
 			os.mkdir("logs/")
@@ -53,51 +107,69 @@ class Logger:
 		# Write to log file.
 		with open(f"logs/{self.filename}", "w") as file:
 			# Loop over all messages.
-			for message_tuple in self.messages:
-				# Extract tuple components.
-				dt_object, loglevel, message = message_tuple
+			for timestamp, loglevel, message in self.messages:
+				# Write to file.
+				file.write(f"{format_message(timestamp, loglevel, message)}\n")
 
-				# Construct datetime string.
-				dt_string = dt_object.strftime("%Y-%m-%d %H:%M:%S")
+	def write_messages(self):
+		"""
+		Runs in the writer thread in streaming mode. Appends the messages
+		from the queue to the log file as they arrive. All messages available
+		at once are written together and flushed, so a crash loses at most 
+		the messages which have not been written yet. Stops when it receives
+		None.
+		"""
+		# Check if logs folder already exists, if not: create it.
+		os.makedirs("logs/", exist_ok=True)
 
-				# Construct full line string. The spaces is the amount of 
-				# spaces between loglevel and the datetime. The loglevel 
-				# names have different lengths, this makes sure the datetimes
-				# are aligned.
-				spaces = \
-					" " * (LogLevel.MAX_LENGTH.value - len(loglevel.name) + 1)
-				line = f"[{loglevel.name}]{spaces}[{dt_string}] {message}\n"
+		# Open log file.
+		with open(f"logs/{self.filename}", "a") as file:
+			while True:
+				# Wait for a message, then collect all other waiting messages.
+				records = [self.queue.get()]
+				while True:
+					try:
+						records.append(self.queue.get_nowait())
+					except queue.Empty:
+						break
 
-				# Write to file.
-				file.write(line)
+				# Write and flush the messages, stop at None.
+				lines = [f"{format_message(*record)}\n" for record in records \
+					if record is not None]
+				file.write("".join(lines))
+				file.flush()
+				if None in records:
+					return
 
-	def add_message(self, loglevel, message):
+	def add_message(self, loglevel, message, timestamp=None):
 		"""
 		Adds the message with the loglevel and timestamp to the messages
 		list. Outputs the message to the console if the loglevel parameter
-		is less than or equal to self.loglevel.
+		is less than or equal to self.loglevel. The message line is only
+		formatted when the message is output, the timestamp is stored as a
+		number. The current time is used if `timestamp` is None, a timestamp
+		can be supplied for messages collected elsewhere, such as in a worker
+		process.
 		"""
 		# Check if loglevel is an instance of LogLevel.
 		assert isinstance(loglevel, LogLevel), "src/logger.py" \
 			":add_message(): Parameter `loglevel` must be an instance of " \
 			"the enum class LogLevel."
 
-		# Construct datetime object.
-		dt_object = datetime.now()
+		# Construct record.
+		if timestamp is None:
+			timestamp = time.time()
+		record = (timestamp, loglevel, message)
 
-		# Add to messages list.
-		self.messages.append((dt_object, loglevel, message))
+		# Add to messages list, and pass to the writer thread in streaming
+		# mode.
+		self.messages.append(record)
+		if self.streaming:
+			self.queue.put(record)
 
 		# Output message if required.
 		if loglevel.value <= self.loglevel.value:
-			# Construct datetime string from datetime object.
-			dt_string = dt_object.strftime("%Y-%m-%d %H:%M:%S")
-			# The spaces is the amount of spaces between loglevel and the 
-			# datetime. The loglevel names have different lengths, this makes 
-			# sure the datetimes are aligned.
-			spaces = \
-				" " * (LogLevel.MAX_LENGTH.value - len(loglevel.name) + 1)
-			print(f"[{loglevel.name}]{spaces}[{dt_string}] {message}")
+			print(format_message(*record))
 
 	def log_info(self, message):
 		"""
@@ -137,4 +209,158 @@ class Logger:
 			"the enum class LogLevel."
 
 		# Set loglevel.
-		self.loglevel = loglevel
\ No newline at end of file
+		self.loglevel = loglevel
+
+	@contextmanager
+	def timer(self, name, track_memory=False, details=None):
+		"""
+		Context manager timing the stage `name`, the code inside the with
+		statement. Records the wall time and the cpu time of the process, 
+		and if `track_memory` is True also the peak memory allocated by 
+		Python during the stage using tracemalloc. Memory is not tracked for
+		a stage inside another stage which tracks memory. `details` is an
+		optional dictionary stored with the timing.
+		"""
+		# Start tracing memory allocations if requested and not yet tracing.
+		tracing = track_memory and not tracemalloc.is_tracing()
+		if tracing:
+			tracemalloc.start()
+
+		# Get start times.
+		start_wall = time.perf_counter()
+		start_cpu = time.process_time()
+
+		# Run stage and record timing, also if the stage raised an error.
+		try:
+			yield
+		finally:
+			wall_time = time.perf_counter() - start_wall
+			cpu_time = time.process_time() - start_cpu
+
+			# Get peak memory and stop tracing.
+			peak_memory = None
+			if tracing:
+				peak_memory = tracemalloc.get_traced_memory()[1]
+				tracemalloc.stop()
+
+			# Record timing.
+			self.record_timing(name, wall_time, cpu_time, peak_memory, \
+				details)
+
+	def timed(self, name=None, track_memory=False):
+		"""
+		Decorator timing every call of the decorated function as the stage
+		`name` using timer(). The name of the function is used if `name` is
+		None.
+		"""
+		# Define decorator.
+		def decorator(function):
+			stage_name = name if name is not None else function.__name__
+
+			@functools.wraps(function)
+			def wrapper(*args, **kwargs):
+				with self.timer(stage_name, track_memory=track_memory):
+					return function(*args, **kwargs)
+
+			return wrapper
+
+		# Return decorator.
+		return decorator
+
+	def record_timing(self, name, wall_time, cpu_time, peak_memory=None, \
+		details=None):
+		"""
+		Records the timing of the stage `name`: the wall time and cpu time in
+		seconds, the peak memory in bytes or None, and an optional dictionary
+		of details. Also adds a debug message, so the timing is written to 
+		the log file. Used by timer(), and directly for stages timed 
+		elsewhere, such as in worker processes.
+		"""
+		# Add timing.
+		self.timings.append({"name": name, "start": time.time() - wall_time, \
+			"wall_time": wall_time, "cpu_time": cpu_time, \
+			"peak_memory": peak_memory, "details": details})
+
+		# Add debug message.
+		message = f"Timing `{name}`: {wall_time:.4f} s wall, " \
+			f"{cpu_time:.4f} s cpu"
+		if peak_memory is not None:
+			message += f", {peak_memory / 1024 / 1024:.1f} MB peak"
+		self.log_debug(message)
+
+	def get_timing_summary(self):
+		"""
+		Returns a dictionary containing a summary for every timed stage name:
+		the amount of calls, the total, mean and maximum wall time, the total
+		cpu time and the maximum peak memory (None if memory was not 
+		tracked). Only the timings still kept in memory are summarized. The
+		stages are ordered by their first call.
+		"""
+		# Initialize summary.
+		summary = {}
+
+		# Loop over all timings and update the summary of their stage.
+		for timing in list(self.timings):
+			stage = summary.setdefault(timing["name"], {"calls": 0, \
+				"total_wall_time": 0.0, "max_wall_time": 0.0, \
+				"total_cpu_time": 0.0, "max_peak_memory": None})
+			stage["calls"] += 1
+			stage["total_wall_time"] += timing["wall_time"]
+			stage["max_wall_time"] = \
+				max(stage["max_wall_time"], timing["wall_time"])
+			stage["total_cpu_time"] += timing["cpu_time"]
+			if timing["peak_memory"] is not None:
+				stage["max_peak_memory"] = max(stage["max_peak_memory"] or 0, \
+					timing["peak_memory"])
+
+		# Calculate mean wall times.
+		for stage in summary.values():
+			stage["mean_wall_time"] = stage["total_wall_time"] / stage["calls"]
+
+		# Return summary.
+		return summary
+
+	def log_timing_summary(self):
+		"""
+		Adds an info message containing a table with the summary of all timed
+		stages, as returned by get_timing_summary().
+		"""
+		# Construct table header.
+		lines = ["Timing summary:", f"{'stage':<40} {'calls':>6} " \
+			f"{'total (s)':>10} {'mean (s)':>10} {'max (s)':>10} " \
+			f"{'cpu (s)':>10} {'peak (MB)':>10}"]
+
+		# Construct a row for every stage.
+		for name, stage in self.get_timing_summary().items():
+			peak = "-" if stage["max_peak_memory"] is None \
+				else f"{stage['max_peak_memory'] / 1024 / 1024:.1f}"
+			lines.append(f"{name:<40} {stage['calls']:>6} " \
+				f"{stage['total_wall_time']:>10.4f} " \
+				f"{stage['mean_wall_time']:>10.4f} " \
+				f"{stage['max_wall_time']:>10.4f} " \
+				f"{stage['total_cpu_time']:>10.4f} {peak:>10}")
+
+		# Submit message.
+		self.log_info("\n".join(lines))
+
+	def export_timings(self, filename=None):
+		"""
+		Exports the timings kept in memory and their summary as json to the
+		folder `logs`, to the file `filename` or, if it is None, to a file 
+		named after the log file. Returns the path of the written file.
+		"""
+		# Check if logs folder already exists, if not: create it.
+		os.makedirs("logs/", exist_ok=True)
+
+		# Construct path.
+		if filename is None:
+			filename = f"{self.filename[:-len('.txt')]}_TIMINGS.json"
+		path = f"logs/{filename}"
+
+		# Write timings and summary to file.
+		with open(path, "w") as file:
+			json.dump({"timings": list(self.timings), \
+				"summary": self.get_timing_summary()}, file, indent=4)
+
+		# Return path.
+		return path
@@ -0,0 +1,262 @@
+from datetime import timedelta
+
+from matplotlib.backends.backend_wxagg import FigureCanvasWxAgg
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+import numpy as np
+import wx
+
+import generate_plots as gp
+
+# Factor by which the visible date range shrinks or grows per mouse wheel
+# step.
+ZOOM_FACTOR = 1.25
+
+# Smallest visible date range in days.
+MIN_RANGE_DAYS = 7
+
+# Time in milliseconds after the last pan or zoom step before the canvas is
+# fully redrawn. While panning and zooming only the line is redrawn using
+# blitting, the ticks and y-limits are updated by the full redraw.
+REDRAW_DEBOUNCE_MS = 150
+
+def format_date_tick(seconds, position):
+	"""
+	Assumes `seconds` is the amount of seconds since gp.EPOCH_DATE. Returns
+	the tick label of the date, in the format used by the exported plots.
+	"""
+	# Return month and year.
+	return (gp.EPOCH_DATE + timedelta(seconds=seconds)).strftime("%m/%Y")
+
+class PlotCanvas(FigureCanvasWxAgg):
+	"""
+	This class represents an interactive plot, rendered by matplotlib at the
+	size of the canvas. Dragging with the left mouse button pans the date
+	range, the mouse wheel zooms in and out around the cursor and double
+	clicking shows the entire date range. Only the points in the visible
+	date range are plotted, reduced to the width of the canvas using
+	gp.downsample().
+	"""
+	def __init__(self, parent):
+		"""
+		Initialize superclass with a new figure, set up the axes and an empty
+		line, and bind the mouse events.
+		"""
+		# Initialize superclass.
+		FigureCanvasWxAgg.__init__(self, parent, wx.ID_ANY, Figure())
+
+		# Create axes and empty line. The line is animated, so it is not
+		# part of the background used for blitting.
+		self.ax = self.figure.add_subplot()
+		self.line, = self.ax.plot([], [], animated=True)
+
+		# Set up the parts which are identical for every plot.
+		self.ax.set_xlabel("Date")
+		self.ax.xaxis.set_major_locator(MaxNLocator(nbins=8))
+		self.ax.xaxis.set_major_formatter(FuncFormatter(format_date_tick))
+
+		# Series of the plot, sorted by date.
+		self.x = np.empty(0, dtype=np.int64)
+		self.y = np.empty(0)
+
+		# Background without the line, the pan start and the timer which
+		# triggers the full redraw after panning or zooming.
+		self.background = None
+		self.pan_start = None
+		self.redraw_timer = None
+
+		# Bind matplotlib events.
+		self.mpl_connect("draw_event", self.on_draw)
+		self.mpl_connect("button_press_event", self.on_button_press)
+		self.mpl_connect("button_release_event", self.on_button_release)
+		self.mpl_connect("motion_notify_event", self.on_motion)
+		self.mpl_connect("scroll_event", self.on_scroll)
+
+	def set_data(self, x, y, plot_name: str):
+		"""
+		Assumes `x` and `y` are numpy arrays of equal length and `plot_name`
+		is one of gp.PLOT_NAMES. Shows the series over its entire date range.
+		"""
+		# Sort series by date, so the visible range can be found using a
+		# binary search.
+		if np.any(np.diff(x) < 0):
+			order = np.argsort(x, kind="stable")
+			x, y = x[order], y[order]
+		self.x, self.y = x, y
+
+		# Set style, title and y-label.
+		spec = gp.PLOT_SPECS[plot_name]
+		self.line.set(**spec["style"])
+		self.ax.set_title(spec["title"])
+		self.ax.set_ylabel(spec["ylabel"])
+
+		# Show entire date range.
+		self.reset_range()
+
+	def clear(self):
+		"""
+		Removes the series, title and y-label.
+		"""
+		# Remove series and labels.
+		self.x = np.empty(0, dtype=np.int64)
+		self.y = np.empty(0)
+		self.ax.set_title("")
+		self.ax.set_ylabel("")
+
+		# Redraw canvas.
+		self.redraw()
+
+	def reset_range(self):
+		"""
+		Sets the x-limits to the entire date range of the series, with
+		gp.EXTRA_DAYS days added to both sides, and redraws the canvas.
+		"""
+		# Set x-limits if there is data.
+		if len(self.x) > 0:
+			self.ax.set_xlim(self.x[0] - 86400 * gp.EXTRA_DAYS, \
+				self.x[-1] + 86400 * gp.EXTRA_DAYS)
+
+		# Redraw canvas.
+		self.redraw()
+
+	def update_line(self):
+		"""
+		Sets the data of the line to the points in the visible date range,
+		including the closest point on both sides so the line reaches the
+		edges. The points are reduced to the width of the axes in pixels.
+		"""
+		# Find the visible points.
+		xmin, xmax = self.ax.get_xlim()
+		start = max(np.searchsorted(self.x, xmin, side="left") - 1, 0)
+		end = np.searchsorted(self.x, xmax, side="right") + 1
+
+		# Reduce and set visible points.
+		width = max(int(self.ax.bbox.width), 1)
+		x, y = gp.downsample(self.x[start:end], self.y[start:end], width)
+		self.line.set_data(x, y)
+
+	def redraw(self):
+		"""
+		Updates the line, rescales the y-axis to the visible points and
+		fully redraws the canvas, which stores a new background for blitting.
+		"""
+		# The canvas may have been destroyed in the meantime.
+		if not self:
+			return
+
+		# Update line and rescale the y-axis to the visible points.
+		self.update_line()
+		self.ax.relim()
+		self.ax.autoscale_view(scalex=False)
+
+		# Redraw canvas, this triggers on_draw().
+		self.draw()
+
+	def schedule_redraw(self):
+		"""
+		Fully redraws the canvas once no pan or zoom step was made for
+		REDRAW_DEBOUNCE_MS milliseconds.
+		"""
+		# Start or restart the timer.
+		if self.redraw_timer is None or not self.redraw_timer.IsRunning():
+			self.redraw_timer = wx.CallLater(REDRAW_DEBOUNCE_MS, self.redraw)
+		else:
+			self.redraw_timer.Restart(REDRAW_DEBOUNCE_MS)
+
+	def blit_line(self):
+		"""
+		Updates the line and draws it on top of the stored background,
+		without redrawing the rest of the figure. Schedules a full redraw
+		to update the ticks and y-limits.
+		"""
+		# Without background the canvas has to be redrawn fully.
+		if self.background is None:
+			self.redraw()
+			return
+
+		# Restore background, update and draw line, and show the result.
+		self.restore_region(self.background)
+		self.update_line()
+		self.ax.draw_artist(self.line)
+		self.blit(self.ax.bbox)
+
+		# Schedule full redraw.
+		self.schedule_redraw()
+
+	def on_draw(self, event):
+		"""
+		Gets called after the figure has been drawn, which happens when the
+		canvas is redrawn or resized. Stores the background and draws the
+		line on top of it.
+		"""
+		# Store background and draw line.
+		self.background = self.copy_from_bbox(self.ax.bbox)
+		self.ax.draw_artist(self.line)
+		self.blit(self.ax.bbox)
+
+	def on_button_press(self, event):
+		"""
+		Gets called when a mouse button is pressed. Starts panning when the
+		left button is pressed in the axes, shows the entire date range on a
+		double click.
+		"""
+		# Only handle the left mouse button in the axes.
+		if event.button != 1 or event.inaxes is not self.ax:
+			return
+
+		# Show the entire date range on a double click.
+		if event.dblclick:
+			self.pan_start = None
+			self.reset_range()
+			return
+
+		# Start panning.
+		self.pan_start = (event.x, self.ax.get_xlim())
+
+	def on_button_release(self, event):
+		"""
+		Gets called when a mouse button is released. Stops panning and fully
+		redraws the canvas.
+		"""
+		# Stop panning.
+		if self.pan_start is not None:
+			self.pan_start = None
+			self.redraw()
+
+	def on_motion(self, event):
+		"""
+		Gets called when the mouse moves. Pans the date range while the left
+		mouse button is held down.
+		"""
+		# Only pan if panning was started.
+		if self.pan_start is None:
+			return
+
+		# Shift the x-limits by the distance moved since the pan started.
+		start_x, (xmin, xmax) = self.pan_start
+		shift = (event.x - start_x) * (xmax - xmin) / self.ax.bbox.width
+		self.ax.set_xlim(xmin - shift, xmax - shift)
+
+		# Draw the line at its new position.
+		self.blit_line()
+
+	def on_scroll(self, event):
+		"""
+		Gets called when the mouse wheel is used. Zooms in or out around the
+		date under the cursor.
+		"""
+		# Only zoom in the axes.
+		if event.inaxes is not self.ax:
+			return
+
+		# Calculate new x-limits around the date under the cursor, the
+		# visible range is never smaller than MIN_RANGE_DAYS days.
+		xmin, xmax = self.ax.get_xlim()
+		factor = 1 / ZOOM_FACTOR if event.button == "up" else ZOOM_FACTOR
+		factor = max(factor, 86400 * MIN_RANGE_DAYS / (xmax - xmin))
+		center = event.xdata
+		self.ax.set_xlim(center - (center - xmin) * factor, \
+			center + (xmax - center) * factor)
+
+		# Draw the line at its new position.
+		self.blit_line()
@@ -0,0 +1,99 @@
+import os
+
+# Definitions of the users and plots, kept apart from generate_plots so the
+# user interface can use them without importing matplotlib, numpy and
+# pandas, which makes up most of the startup time.
+
+# Specification of every plot exported for every language: the plotted
+# column, the title, the y-axis label, the line style passed to matplotlib
+# and how the column is combined over all languages: "sum" adds the values
+# of every date, "cumulative_sum" adds the last known value of every 
+# language, None if the plot is not shown for all languages combined. A new
+# plot only needs an entry here.
+PLOT_SPECS = {
+	"daily_xp": {
+		"column": "daily_xp",
+		"title": "Daily Experience",
+		"ylabel": "Experience",
+		"style": {"color": "b", "linestyle": "-", "linewidth": 1},
+		"aggregate": "sum"
+	},
+	"total_xp": {
+		"column": "total_xp",
+		"title": "Total Experience",
+		"ylabel": "Experience",
+		"style": {"color": "b", "linestyle": "-", "linewidth": 1},
+		"aggregate": "cumulative_sum"
+	},
+	"total_words_learned": {
+		"column": "total_words_learned",
+		"title": "Total Words Learned",
+		"ylabel": "Words",
+		"style": {"color": "b", "linestyle": "-", "linewidth": 1},
+		"aggregate": "cumulative_sum"
+	},
+	"level": {
+		"column": "level",
+		"title": "Level",
+		"ylabel": "Level",
+		"style": {"color": "b", "linestyle": "-", "linewidth": 1},
+		"aggregate": None
+	},
+	"xp_7_day_average": {
+		"column": "xp_7_day_average",
+		"title": "Daily Experience (7 Day Average)",
+		"ylabel": "Experience",
+		"style": {"color": "b", "linestyle": "-", "linewidth": 1},
+		"aggregate": None
+	},
+	"xp_30_day_average": {
+		"column": "xp_30_day_average",
+		"title": "Daily Experience (30 Day Average)",
+		"ylabel": "Experience",
+		"style": {"color": "b", "linestyle": "-", "linewidth": 1},
+		"aggregate": None
+	},
+	"streak": {
+		"column": "streak",
+		"title": "Streak",
+		"ylabel": "Days",
+		"style": {"color": "b", "linestyle": "-", "linewidth": 1},
+		"aggregate": None
+	},
+	"words_per_day": {
+		"column": "words_per_day",
+		"title": "Words Learned Per Day",
+		"ylabel": "Words",
+		"style": {"color": "b", "linestyle": "-", "linewidth": 1},
+		"aggregate": None
+	},
+	"xp_per_level": {
+		"column": "xp_per_level",
+		"title": "Experience Per Level",
+		"ylabel": "Experience",
+		"style": {"color": "b", "linestyle": "-", "linewidth": 1},
+		"aggregate": None
+	}
+}
+
+# Names of the plots exported for every language.
+PLOT_NAMES = list(PLOT_SPECS.keys())
+
+# Name of the plots combining all languages, they are exported as if they
+# belong to a language with this name.
+ALL_LANGUAGES = "all languages"
+AGGREGATE_PLOT_NAMES = [plot_name for plot_name, spec in PLOT_SPECS.items() \
+	if spec["aggregate"] is not None]
+
+def find_usernames():
+	"""
+	Returns a sorted list containing the name of every user folder in
+	`data/`.
+	"""
+	# Check if the data folder exists.
+	if not os.path.isdir("data"):
+		return []
+
+	# Return folder names.
+	return sorted(folder for folder in os.listdir("data") \
+		if os.path.isdir(f"data/{folder}"))
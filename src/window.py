@@ -1,17 +1,55 @@
+from collections import OrderedDict
 import os
+import queue
+import threading
+import time
 
 import wx
 
-import generate_plots as gp
+import bitmap_cache as bc
+import data_watcher as dw
+import loading_screen as ls
+import plot_catalog as cat
+
+# If True, regenerated plots are rendered to memory and shown directly,
+# saving them to disk happens in the background. If False, the plots are
+# saved to disk and loaded from there.
+RENDER_IN_MEMORY = True
+
+# Maximum memory used by the cache of scaled plot bitmaps in bytes.
+SCALED_BITMAP_CACHE_BYTES = 64 * 1024 * 1024
+
+# Maximum memory used by the cache of decoded plot images in bytes.
+DECODED_IMAGE_CACHE_BYTES = 256 * 1024 * 1024
+
+# Maximum amount of users of which the images are kept when switching users.
+USER_CACHE_SIZE = 4
+
+# Maximum amount of images decoded in the background after selecting a plot.
+PREFETCH_LIMIT = 6
+
+# Time in milliseconds after the last resize event before the plot image is
+# scaled in high quality. During resizing a cheap preview scale is used.
+RESIZE_DEBOUNCE_MS = 150
+
+# If True, the data folder of the current user is watched and the plots are
+# regenerated automatically when a data file changes.
+WATCH_DATA_FOLDER = True
+
+# Target time in seconds from the start of the application until the window
+# is first painted, exceeding it is logged as an error.
+FIRST_PAINT_TARGET = 1.0
 
 class MainWindow(wx.Frame):
 	"""
 	This class represents the main window and its contents.
 	"""
-	def __init__(self, parent, title, username, logger):
+	def __init__(self, parent, title, username, logger, start_time=None):
 		"""
 		Initialize superclass, add sizers with content returned from 
-		functions, and show the window.
+		functions, and show the window. `start_time` is the value of 
+		time.perf_counter() when the application started, used to report the
+		time until the window is first painted.
 		"""
 		# Initialize superclass.
 		wx.Frame.__init__(self, parent, title=title, size=(1280, 720))
@@ -21,6 +59,7 @@ class MainWindow(wx.Frame):
 		self.title = title
 		self.username = username
 		self.logger = logger
+		self.start_time = start_time
 
 		# Show message that the user interface has been started.
 		self.logger.log_info("User interface started")
@@ -28,8 +67,57 @@ class MainWindow(wx.Frame):
 		# Global variable indicating the user data has been loaded correctly.
 		self.user_data_ok = True
 
-		# Regenerate plots, sets the self.user_data_ok variable accordingly.
-		self.regenerate_plots(called_from_constructor=True)
+		# Global variable indicating the user interface has been initialized.
+		self.ui_initialized = False
+
+		# Background regeneration thread, the event used to cancel it and the
+		# loading screen shown while it runs.
+		self.regeneration_thread = None
+		self.cancel_regeneration = None
+		self.loading_screen = None
+
+		# Watcher of the data folder of the current user, and whether a 
+		# change was reported while a regeneration was running, in which case
+		# the plots are regenerated again once it is done.
+		self.data_watcher = None
+		self.regeneration_pending = False
+
+		# Images and dropdown options of recently viewed users, the least
+		# recently viewed user first, so switching back to a user does not
+		# require reloading its images.
+		self.user_plots = OrderedDict()
+
+		# Cache of scaled plot bitmaps, keyed by user, language, plot and 
+		# size, and the timer which triggers the high quality scale after 
+		# resizing.
+		self.bitmap_cache = bc.BitmapCache(SCALED_BITMAP_CACHE_BYTES)
+		self.resize_timer = None
+
+		# Cache of decoded plot images, keyed by user, language and plot. 
+		# Images are decoded when they are first shown, or in advance by the
+		# prefetch thread. The generation is increased whenever the images are
+		# reloaded, so images prefetched before that are discarded.
+		self.image_cache = bc.BitmapCache(DECODED_IMAGE_CACHE_BYTES)
+		self.image_generation = 0
+		self.plot_image = None
+		self.prefetch_queue = queue.Queue()
+		self.prefetch_thread = threading.Thread( \
+			target=self.prefetch_worker, daemon=True)
+		self.prefetch_thread.start()
+
+		# Dataframes of the current user shown by the interactive plot, keyed
+		# by capitalized language, the user and image generation they were
+		# loaded for, and the user and image generation of the dataframes
+		# being loaded. They are loaded in a background thread when first
+		# needed.
+		self.frames = None
+		self.frames_key = None
+		self.frames_loading = None
+
+		# Lock held while loading data or regenerating plots in a background
+		# thread, as both write the frame and aggregate caches and use the
+		# caches of generate_plots.
+		self.data_lock = threading.Lock()
 
 		# Bind close event before initializing user interface. This is done to
 		# make sure the `user interface stopped` is shown when the window is 
@@ -37,28 +125,22 @@ class MainWindow(wx.Frame):
 		# Bind window close event.
 		self.Bind(wx.EVT_CLOSE, self.on_close)
 
-		# Only initialize the user interface if the user data was ok.
-		if self.user_data_ok:
-			# Load plot images from figures/ folder and create choice option
-			# list.
-			self.load_images(username)
-
-			# Init UI.
-			self.init_ui()
-
-			# Show window.
-			self.Center()
-			self.Show(True)
-
-			# Initial image update.
-			self.update_image()
-		# If the user data was not ok, close the window.
-		else:
-			self.Close()
-
 		# Bind window resize event.
 		self.Bind(wx.EVT_SIZE,  self.on_resize)
 
+		# Show the images of the previous run right away if there are any,
+		# and regenerate the plots in the background without loading screen.
+		# Otherwise regenerate the plots first, once this is done the images
+		# are loaded, the user interface is initialized and the window is
+		# shown, or the window is closed if the user data was not ok.
+		with self.logger.timer("startup/load_cached_images"):
+			self.load_images()
+		if len(self.plots_dict) > 0:
+			self.show_window()
+			self.regenerate_plots(show_loading_screen=False)
+		else:
+			self.regenerate_plots()
+
 	def init_ui(self):
 		"""
 		Initialize UI.
@@ -87,6 +169,59 @@ class MainWindow(wx.Frame):
 		# Create end log message.
 		self.logger.log_info("Done initializing UI")
 
+	def show_window(self):
+		"""
+		Initializes the user interface, shows the window with the selected
+		plot and starts watching the data folder of the user.
+		"""
+		# Init UI.
+		with self.logger.timer("startup/init_ui"):
+			self.init_ui()
+		self.ui_initialized = True
+
+		# Report the time to first paint once the panel is painted.
+		self.panel.Bind(wx.EVT_PAINT, self.on_first_paint)
+
+		# Show window.
+		self.Center()
+		self.Show(True)
+
+		# Watch the data folder of the user.
+		self.start_watcher()
+
+		# Update the image.
+		self.update_image()
+
+	def on_first_paint(self, event):
+		"""
+		Gets called when the panel is painted for the first time. Records the
+		time since the start of the application as the stage 
+		`startup/first_paint` and logs a report of the startup stages.
+		"""
+		# Paint the panel as usual and stop listening.
+		event.Skip()
+		self.panel.Unbind(wx.EVT_PAINT, handler=self.on_first_paint)
+		if self.start_time is None:
+			return
+
+		# Record time to first paint, the cpu time is the cpu time of the
+		# process so far.
+		first_paint = time.perf_counter() - self.start_time
+		self.logger.record_timing("startup/first_paint", first_paint, \
+			time.process_time())
+
+		# Log report of the startup stages.
+		lines = [f"Startup report (target {FIRST_PAINT_TARGET:.2f} s):"]
+		for name, stage in self.logger.get_timing_summary().items():
+			if name.startswith("startup/"):
+				lines.append(f"{name:<40} {stage['total_wall_time']:>10.4f} s")
+		self.logger.log_info("\n".join(lines))
+
+		# Log an error if the target was not met.
+		if first_paint > FIRST_PAINT_TARGET:
+			self.logger.log_error(f"Time to first paint {first_paint:.3f} s " \
+				f"exceeds target of {FIRST_PAINT_TARGET:.2f} s")
+
 	def get_title_sizer(self, title):
 		"""
 		Assumes title is a string. Creates and returns a horizontal sizer 
@@ -142,6 +277,17 @@ class MainWindow(wx.Frame):
 		# Create input grid.
 		input_grid = wx.GridBagSizer(vgap=0, hgap=20)
 
+		# Create user label and dropdown.
+		user_options = cat.find_usernames()
+		user_select_label = wx.StaticText(self.panel, label="User")
+		self.user_select_dropdown = wx.Choice(self.panel, \
+			choices=user_options, size=wx.Size(150, 25))
+		if self.username in user_options:
+			self.user_select_dropdown.SetSelection( \
+				user_options.index(self.username))
+		self.Bind(wx.EVT_CHOICE, self.user_select_event, \
+			self.user_select_dropdown)
+
 		# Create language label and dropdown.
 		language_options = list(self.language_options.keys())
 		language_select_label = wx.StaticText(self.panel, label="Language", \
@@ -161,22 +307,46 @@ class MainWindow(wx.Frame):
 		self.Bind(wx.EVT_CHOICE, self.plot_select_event, \
 			self.plot_select_dropdown)
 
-		# Create `Regenerate plots` button.
-		regen_plots_button = wx.Button(self.panel, label="Regenerate plots", \
-			size=(106, 27))
+		# Create checkbox to switch between the static plot image and the
+		# interactive plot.
+		self.interactive_checkbox = wx.CheckBox(self.panel, \
+			label="Interactive plot")
+		self.Bind(wx.EVT_CHECKBOX, self.interactive_select_event, \
+			self.interactive_checkbox)
+
+		# Create checkbox to regenerate the plots automatically when the data
+		# of the user changes.
+		self.watch_checkbox = wx.CheckBox(self.panel, \
+			label="Watch data folder")
+		self.watch_checkbox.SetValue(WATCH_DATA_FOLDER)
+		self.Bind(wx.EVT_CHECKBOX, self.watch_select_event, \
+			self.watch_checkbox)
+
+		# Create `Regenerate plots` button, make member to be able to disable
+		# it while regenerating.
+		self.regen_plots_button = wx.Button(self.panel, \
+			label="Regenerate plots", size=(106, 27))
 		self.Bind(wx.EVT_BUTTON, self.regenerate_plots_event, \
-			regen_plots_button)
+			self.regen_plots_button)
 
 		# Add components to input grid.
-		input_grid.Add(language_select_label, pos=(0, 0), \
+		input_grid.Add(user_select_label, pos=(0, 0), \
+			flag=wx.ALIGN_LEFT | wx.ALIGN_CENTER_VERTICAL)
+		input_grid.Add(self.user_select_dropdown, pos=(0, 1), \
+			flag=wx.ALIGN_RIGHT)
+		input_grid.Add(language_select_label, pos=(1, 0), \
 			flag=wx.ALIGN_LEFT | wx.ALIGN_CENTER_VERTICAL)
-		input_grid.Add(self.language_select_dropdown, pos=(0, 1), \
+		input_grid.Add(self.language_select_dropdown, pos=(1, 1), \
 			flag=wx.ALIGN_RIGHT)
-		input_grid.Add(plot_select_label, pos=(1, 0), \
+		input_grid.Add(plot_select_label, pos=(2, 0), \
 			flag=wx.ALIGN_LEFT | wx.ALIGN_CENTER_VERTICAL)
-		input_grid.Add(self.plot_select_dropdown, pos=(1, 1), \
+		input_grid.Add(self.plot_select_dropdown, pos=(2, 1), \
 			flag=wx.ALIGN_RIGHT)
-		input_grid.Add(regen_plots_button, pos=(2, 0), span=(1, 2), \
+		input_grid.Add(self.interactive_checkbox, pos=(3, 0), span=(1, 2), \
+			flag=wx.ALIGN_LEFT | wx.TOP | wx.BOTTOM, border=5)
+		input_grid.Add(self.watch_checkbox, pos=(4, 0), span=(1, 2), \
+			flag=wx.ALIGN_LEFT | wx.BOTTOM, border=5)
+		input_grid.Add(self.regen_plots_button, pos=(5, 0), span=(1, 2), \
 			flag=wx.ALIGN_CENTER_HORIZONTAL)
 
 		# Add input grid to user input sizer.
@@ -195,6 +365,10 @@ class MainWindow(wx.Frame):
 		# Create image control, make member to be able to update the image.
 		self.plot_image_holder = wx.StaticBitmap(self.panel)
 
+		# The interactive plot is created when it is first selected, see
+		# get_plot_canvas().
+		self.plot_canvas = None
+
 		# Add image control to plot sizer.
 		self.plot_sizer.Add(self.plot_image_holder, flag=wx.EXPAND | wx.ALL, \
 			border=5)
@@ -202,10 +376,32 @@ class MainWindow(wx.Frame):
 		# Return plot sizer.
 		return self.plot_sizer
 
-	def load_images(self, username=""):
+	def get_plot_canvas(self):
+		"""
+		Returns the interactive plot, creates it and adds it to the plot 
+		sizer if it does not exist yet.
 		"""
-		Reloads plot images from disk, changes the username if it's not empty.
-		Updates the self.plots_dict dictionary. Also updates dropdown options.
+		# Create interactive plot. The module is imported here, as it 
+		# imports matplotlib, which takes long and is not needed to show the
+		# plot images.
+		if self.plot_canvas is None:
+			import plot_canvas as pc
+			self.plot_canvas = pc.PlotCanvas(self.panel)
+			self.plot_sizer.Add(self.plot_canvas, proportion=1, \
+				flag=wx.EXPAND | wx.ALL, border=5)
+
+		# Return interactive plot.
+		return self.plot_canvas
+
+	def load_images(self, username="", images=None):
+		"""
+		Finds the plot images on disk, changes the username if it's not 
+		empty. Images present in `images`, a dictionary of RGB arrays rendered
+		to memory by generate_plots.export_plots(), are used instead of the
+		files on disk. The images are not decoded here, but when they are 
+		first shown or prefetched, see get_plot_image(). Updates the 
+		self.plots_dict dictionary, which maps every language and plot to the
+		path or array of the image. Also updates dropdown options.
 		"""
 		# Create start log message.
 		self.logger.log_info("Loading images...")
@@ -218,48 +414,190 @@ class MainWindow(wx.Frame):
 		base_folder = f"figures/{self.username}"
 
 		# Initialize language dropdown dictionary and plot image dictionary.
-		self.plots_dict = {}
-		self.language_options = {}
-
-		# Set up variables to count how many images loaded successfully, and 
-		# how many failed.
+		# The images are loaded into new dictionaries which replace the
+		# current ones once all images are loaded, so the displayed images
+		# are swapped at once.
+		plots_dict = {}
+		language_options = {}
+
+		# Set up variables to count how many images were found, and how many
+		# are missing.
 		successful = 0
 		failed = 0 
 
-		# Load plot images from figures/ folder and create choice option list.
-		language_folders = os.listdir(base_folder)
+		# Find plot images in figures/ folder and create choice option list.
+		language_folders = os.listdir(base_folder) \
+			if os.path.isdir(base_folder) else []
 		for lang in language_folders:
 			# Create language entry.
 			lang_capitalized = f"{lang[0].upper()}{lang[1:]}"
-			self.plots_dict[lang_capitalized] = {}
-			self.language_options[lang_capitalized] = []
+			plots_dict[lang_capitalized] = {}
+			language_options[lang_capitalized] = []
 
-			# Load images.
-			for plot_name \
-				in ["daily_xp", "total_xp", "total_words_learned", "level"]:
+			# Find images.
+			plot_names = cat.AGGREGATE_PLOT_NAMES \
+				if lang == cat.ALL_LANGUAGES else cat.PLOT_NAMES
+			for plot_name in plot_names:
 				plot_name_capitalized = f"{plot_name[0].upper()}" \
 					f"{plot_name[1:]}".replace("_", " ")
-				image = wx.Image(f"{base_folder}/{lang}/{plot_name}.png", \
-					wx.BITMAP_TYPE_ANY)
-
-				if not image.IsOk():
-					self.logger.log_error(f"Failed to load image " \
-						f"`{base_folder}/{lang}/{plot_name}.png`!")
+				path = f"{base_folder}/{lang}/{plot_name}.png"
+
+				# Use the image rendered to memory if available, otherwise
+				# use the image on disk.
+				if images is not None and plot_name in images.get(lang, {}):
+					source = images[lang][plot_name]
+				elif os.path.isfile(path):
+					source = path
+				else:
+					self.logger.log_error(f"Failed to find image `{path}`!")
 					failed += 1
 					continue
 
-				self.plots_dict[lang_capitalized][plot_name_capitalized] = \
-					image
-				self.language_options[lang_capitalized]\
+				plots_dict[lang_capitalized][plot_name_capitalized] = source
+				language_options[lang_capitalized]\
 					.append(plot_name_capitalized)
-				self.logger.log_info("Succesfully loaded image " \
-					f"`{base_folder}/{lang}/{plot_name}.png`")
 				successful += 1
 
+		# Swap in the new images and dropdown options, and remove the decoded
+		# images and scaled bitmaps of the previous images of this user.
+		self.plots_dict = plots_dict
+		self.language_options = language_options
+		self.remove_cached_images(self.username)
+		self.image_generation += 1
+
+		# Store the images and dropdown options of this user as most recently
+		# viewed, and forget the least recently viewed users.
+		self.user_plots[self.username] = (plots_dict, language_options)
+		self.user_plots.move_to_end(self.username)
+		while len(self.user_plots) > USER_CACHE_SIZE:
+			evicted_username, _ = self.user_plots.popitem(last=False)
+			self.remove_cached_images(evicted_username)
+
 		# Create end log message.
 		self.logger.log_info("Done loading images " \
 			f"({successful} successful, {failed} failed)")
 
+	def remove_cached_images(self, username):
+		"""
+		Removes the decoded images and scaled bitmaps of the user from the
+		caches.
+		"""
+		# Remove all entries of which the key starts with the username.
+		self.image_cache.remove_where(lambda key: key[0] == username)
+		self.bitmap_cache.remove_where(lambda key: key[0] == username)
+
+	def decode_image(self, source):
+		"""
+		Assumes `source` is either the path of an image file or an RGB array
+		as rendered by generate_plots.export_plots(). Returns the decoded 
+		wx.Image, or None if the image could not be decoded. A wx.Image 
+		created from an array uses the array as its buffer without copying.
+		"""
+		# Create image from the path or from the array.
+		if isinstance(source, str):
+			image = wx.Image(source, wx.BITMAP_TYPE_ANY)
+		else:
+			image = wx.ImageFromBuffer(source.shape[1], source.shape[0], \
+				source)
+
+		# Return image if it is ok.
+		return image if image.IsOk() else None
+
+	def get_plot_image(self, key):
+		"""
+		Assumes `key` is a tuple containing the current user, and a language
+		and plot present in self.plots_dict. Returns the decoded image from 
+		the cache, or decodes it and adds it to the cache. Returns None if the
+		image could not be decoded.
+		"""
+		# Get image from the cache.
+		image = self.image_cache.get(key)
+		if image is not None:
+			return image
+
+		# Decode the image and add it to the cache.
+		with self.logger.timer("decode_image"):
+			image = self.decode_image(self.plots_dict[key[1]][key[2]])
+		if image is None:
+			self.logger.log_error(f"Failed to load image for language " \
+				f"`{key[1]}` and plot `{key[2]}`!")
+			return None
+		self.image_cache.put(key, image)
+
+		# Return image.
+		self.logger.log_info(f"Succesfully loaded image for language " \
+			f"`{key[1]}` and plot `{key[2]}`")
+		return image
+
+	def prefetch_images(self, key):
+		"""
+		Assumes `key` is a tuple containing the user, and the selected 
+		language and plot. Requests the prefetch thread to decode the images
+		most likely to be selected next: the other plots of the selected 
+		language, followed by the selected plot of the other languages. 
+		Requests for previous selections which have not been handled yet are
+		dropped.
+		"""
+		# Drop previous requests.
+		while not self.prefetch_queue.empty():
+			try:
+				self.prefetch_queue.get_nowait()
+			except queue.Empty:
+				break
+
+		# Construct list of candidates.
+		username, lang, plot = key
+		candidates = [(username, lang, other_plot) \
+			for other_plot in self.language_options[lang]]
+		candidates += [(username, other_lang, plot) \
+			for other_lang, plots in self.language_options.items() \
+			if plot in plots]
+
+		# Request the candidates which are not decoded yet and are stored on
+		# disk, images rendered to memory do not need to be decoded.
+		requested = 0
+		for candidate in candidates:
+			if requested >= PREFETCH_LIMIT:
+				break
+			source = self.plots_dict[candidate[1]][candidate[2]]
+			if candidate == key or candidate in self.image_cache \
+				or not isinstance(source, str):
+				continue
+			self.prefetch_queue.put((self.image_generation, candidate, source))
+			requested += 1
+
+	def prefetch_worker(self):
+		"""
+		Runs in the prefetch thread. Decodes the requested images and posts
+		them to the user interface thread using wx.CallAfter(). Stops when it
+		receives None.
+		"""
+		while True:
+			# Wait for the next request.
+			request = self.prefetch_queue.get()
+			if request is None:
+				return
+
+			# Decode image and post it to the user interface thread.
+			generation, key, path = request
+			image = wx.Image(path, wx.BITMAP_TYPE_ANY)
+			wx.CallAfter(self.on_image_prefetched, generation, key, image)
+
+	def on_image_prefetched(self, generation, key, image):
+		"""
+		Gets called in the user interface thread when the prefetch thread 
+		decoded an image. Adds the image to the cache, unless the images have
+		been reloaded since it was requested.
+		"""
+		# The window may have been closed in the meantime.
+		if not self:
+			return
+
+		# Add image to the cache if it is still current.
+		if generation == self.image_generation and image.IsOk() \
+			and not key in self.image_cache:
+			self.image_cache.put(key, image)
+
 	def on_resize(self, event):
 		"""
 		Gets called when the window is resized.
@@ -267,8 +605,20 @@ class MainWindow(wx.Frame):
 		# Run normal window resize event stuff.
 		event.Skip()
 
-		# Rescale and update image.
-		self.rescale_image()
+		# There is no image to rescale before the user interface has been
+		# initialized, and the interactive plot resizes itself.
+		if not self.ui_initialized or self.interactive_checkbox.IsChecked():
+			return
+
+		# Show a cheap preview scale during resizing, and scale in high
+		# quality once no resize event was received for RESIZE_DEBOUNCE_MS
+		# milliseconds.
+		self.rescale_image(high_quality=False)
+		if self.resize_timer is None:
+			self.resize_timer = wx.CallLater(RESIZE_DEBOUNCE_MS, \
+				self.rescale_image)
+		else:
+			self.resize_timer.Restart(RESIZE_DEBOUNCE_MS)
 
 	def on_close(self, event):
 		"""
@@ -277,6 +627,21 @@ class MainWindow(wx.Frame):
 		# Run normal window close event stuff.
 		event.Skip()
 
+		# Stop the resize timer and the prefetch thread.
+		if self.resize_timer is not None:
+			self.resize_timer.Stop()
+		self.prefetch_queue.put(None)
+
+		# Stop watching the data folder.
+		self.stop_watcher()
+
+		# Cancel a running regeneration and close the loading screen.
+		if self.cancel_regeneration is not None:
+			self.cancel_regeneration.set()
+		if self.loading_screen is not None:
+			self.loading_screen.Destroy()
+			self.loading_screen = None
+
 		# Show message that the user interface has been stopped.
 		self.logger.log_info("User interface stopped")
 
@@ -288,11 +653,18 @@ class MainWindow(wx.Frame):
 		choice does not exist for the new language. Then update the plot
 		image.
 		"""
-		# Get currently selected plot.
+		# There are no plot options if the user has no languages.
+		if self.language_select_dropdown.GetSelection() == wx.NOT_FOUND:
+			self.plot_select_dropdown.Clear()
+			self.update_image()
+			return
+
+		# Get currently selected plot, there is none if the previous user had
+		# no languages.
 		selected_plot_index = \
 			self.plot_select_dropdown.GetSelection()
-		selected_plot_string = \
-			self.plot_select_dropdown.GetString(selected_plot_index)
+		selected_plot_string = "" if selected_plot_index == wx.NOT_FOUND \
+			else self.plot_select_dropdown.GetString(selected_plot_index)
 
 		# Get currently selected language.
 		selected_lang_index = \
@@ -322,6 +694,142 @@ class MainWindow(wx.Frame):
 		# Update the plot image.
 		self.update_image()
 
+	def user_select_event(self, event):
+		"""
+		Gets called when the user choice menu triggers an event. Switches to
+		the selected user. If the images of the user are still loaded they
+		are shown immediately. The plots of the user are regenerated in the
+		background, which only rebuilds plots of which the data changed.
+		"""
+		# Get selected user.
+		selected_user_index = self.user_select_dropdown.GetSelection()
+		username = self.user_select_dropdown.GetString(selected_user_index)
+		if username == self.username:
+			return
+
+		# Switch user.
+		self.logger.log_info(f"Switching to user `{username}`")
+		self.username = username
+
+		# Show the loaded images of the user immediately if available.
+		if username in self.user_plots:
+			self.user_plots.move_to_end(username)
+			self.plots_dict, self.language_options = self.user_plots[username]
+		else:
+			self.plots_dict, self.language_options = {}, {}
+		self.update_dropdowns()
+
+		# Watch the data folder of the new user.
+		self.start_watcher()
+
+		# Regenerate the plots of the user. The loading screen is only shown
+		# if no images of the user are loaded yet, otherwise the loaded images
+		# stay usable while changed plots are rebuilt in the background.
+		self.regenerate_plots(show_loading_screen=not \
+			username in self.user_plots)
+
+	def update_dropdowns(self):
+		"""
+		Updates the language dropdown options to the languages of the current
+		user, keeping the selected language if the user has it. Then updates
+		the plot options and the plot image using language_select_event().
+		"""
+		# Get currently selected language.
+		selected_lang_index = self.language_select_dropdown.GetSelection()
+		selected_lang_string = "" if selected_lang_index == wx.NOT_FOUND \
+			else self.language_select_dropdown.GetString(selected_lang_index)
+
+		# Update language options dropdown.
+		language_options = list(self.language_options.keys())
+		self.language_select_dropdown.Set(language_options)
+
+		# Keep the selected language if available, otherwise select the first
+		# language.
+		if selected_lang_string in language_options:
+			self.language_select_dropdown.SetSelection( \
+				language_options.index(selected_lang_string))
+		elif len(language_options) > 0:
+			self.language_select_dropdown.SetSelection(0)
+
+		# Update plot options and image.
+		self.language_select_event(None)
+
+	def interactive_select_event(self, event):
+		"""
+		Gets called when the interactive plot checkbox is toggled. Shows 
+		either the static plot image or the interactive plot, and updates it.
+		"""
+		# Show the selected plot view.
+		interactive = self.interactive_checkbox.IsChecked()
+		self.plot_image_holder.Show(not interactive)
+		if interactive:
+			self.get_plot_canvas().Show()
+		elif self.plot_canvas is not None:
+			self.plot_canvas.Hide()
+		self.plot_sizer.Layout()
+
+		# Update the plot.
+		self.update_image()
+
+	def watch_select_event(self, event):
+		"""
+		Gets called when the watch data folder checkbox is toggled. Starts or
+		stops watching the data folder of the current user.
+		"""
+		# Start or stop the watcher.
+		if self.watch_checkbox.IsChecked():
+			self.start_watcher()
+		else:
+			self.stop_watcher()
+
+	def start_watcher(self):
+		"""
+		Starts watching the data folder of the current user if watching is
+		enabled, replacing the watcher of the previous user. Changes are 
+		posted to on_data_changed() in the user interface thread.
+		"""
+		# Stop the previous watcher.
+		self.stop_watcher()
+		if not self.watch_checkbox.IsChecked():
+			return
+
+		# Start watcher, the username is passed along so changes reported
+		# for a previous user can be ignored.
+		username = self.username
+		self.data_watcher = dw.DataWatcher(f"data/{username}", \
+			lambda langs: wx.CallAfter(self.on_data_changed, username, langs))
+		self.data_watcher.start()
+
+	def stop_watcher(self):
+		"""
+		Stops watching the data folder.
+		"""
+		# Stop watcher.
+		if self.data_watcher is not None:
+			self.data_watcher.stop()
+			self.data_watcher = None
+
+	def on_data_changed(self, username, langs):
+		"""
+		Gets called in the user interface thread when the watcher reports
+		that the data files of `langs` of user `username` changed. 
+		Regenerates the plots without loading screen, only the plots of the
+		changed languages are rebuilt. If a regeneration is running, the 
+		plots are regenerated again once it is done.
+		"""
+		# The window may have been closed or the user switched in the 
+		# meantime.
+		if not self or username != self.username or self.data_watcher is None:
+			return
+
+		# Regenerate plots, or mark the regeneration as pending.
+		self.logger.log_info(f"Data of user `{username}` changed: " \
+			f"{', '.join(langs)}")
+		if self.regeneration_thread is not None:
+			self.regeneration_pending = True
+		else:
+			self.regenerate_plots(show_loading_screen=False)
+
 	def plot_select_event(self, event):
 		"""
 		Gets called when the plot choice menu triggers an event. Updates the
@@ -335,6 +843,14 @@ class MainWindow(wx.Frame):
 		Update the bitmap component of the plot image holder to the selected
 		plot.
 		"""
+		# Clear the image if there is no plot to select.
+		if self.plot_select_dropdown.GetSelection() == wx.NOT_FOUND:
+			self.plot_image = None
+			self.plot_image_holder.SetBitmap(wx.NullBitmap)
+			if self.interactive_checkbox.IsChecked():
+				self.plot_canvas.clear()
+			return
+
 		# Get selected language in string format.
 		selected_language_index = \
 			self.language_select_dropdown.GetSelection()
@@ -347,17 +863,151 @@ class MainWindow(wx.Frame):
 		selected_plot = \
 			self.plot_select_dropdown.GetString(selected_plot_index)
 
-		# Set plot_image to image object from dictionary.
-		self.plot_image = self.plots_dict[selected_language][selected_plot]
+		# Update the interactive plot instead if it is shown.
+		if self.interactive_checkbox.IsChecked():
+			self.update_canvas(selected_language, selected_plot)
+			return
 
+		# Set plot_image to the decoded image, and save the key used to cache
+		# scaled bitmaps of it.
+		self.plot_image_key = (self.username, selected_language, \
+			selected_plot)
+		self.plot_image = self.get_plot_image(self.plot_image_key)
+
+		# Clear the image if it could not be decoded.
+		if self.plot_image is None:
+			self.plot_image_holder.SetBitmap(wx.NullBitmap)
 		# Rescale the image.
-		self.rescale_image()
+		else:
+			self.rescale_image()
+
+		# Decode the images likely to be selected next in the background.
+		self.prefetch_images(self.plot_image_key)
+
+	def get_frames(self):
+		"""
+		Returns a dictionary mapping every capitalized language of the 
+		current user to its dataframe, or None if the dataframes are not
+		loaded yet. When the user or the images changed since they were last
+		loaded, the dataframes are loaded in a background thread by
+		load_frames_worker(), and the image is updated once they are loaded.
+		"""
+		# Return the loaded dataframes if they are current.
+		frames_key = (self.username, self.image_generation)
+		if self.frames_key == frames_key:
+			return self.frames
+
+		# Start loading the dataframes if they are not being loaded yet.
+		if self.frames_loading != frames_key:
+			self.frames_loading = frames_key
+			threading.Thread(target=self.load_frames_worker, \
+				args=(frames_key,), daemon=True).start()
+
+		# The dataframes are not loaded yet.
+		return None
 
-	def rescale_image(self):
+	def load_frames_worker(self, frames_key):
+		"""
+		Runs in a background thread. Loads the dataframes of the user in 
+		`frames_key` and the combination of all languages using 
+		generate_plots.load_frames(), holding the data lock so this does not
+		run at the same time as a regeneration. Posts the dataframes to 
+		on_frames_loaded() in the user interface thread.
+		"""
+		# Load dataframes and the combination of all languages, languages
+		# without time column cannot be plotted. Catch any error, so the 
+		# dataframes are always posted.
+		username = frames_key[0]
+		frames = {}
+		try:
+			# Imported here, as it imports matplotlib, numpy and pandas, 
+			# which takes long.
+			import generate_plots as gp
+
+			with self.data_lock:
+				with self.logger.timer("load_frames"):
+					lang_dict = gp.load_frames(username, self.logger)
+				if lang_dict is False:
+					lang_dict = {}
+				with self.logger.timer("update_aggregate"):
+					aggregate = gp.update_aggregate(username, \
+						list(lang_dict.keys()), self.logger, \
+						lang_dict=lang_dict)
+			if aggregate is not None:
+				lang_dict[cat.ALL_LANGUAGES] = aggregate
+			frames = {f"{lang[0].upper()}{lang[1:]}": df \
+				for lang, df in lang_dict.items() \
+				if "seconds_since_epoch" in df.columns}
+		except Exception as e:
+			self.logger.log_error(f"Failed to load data of user " \
+				f"`{username}`: {e}")
+		finally:
+			# Post dataframes to the user interface thread.
+			wx.CallAfter(self.on_frames_loaded, frames_key, frames)
+
+	def on_frames_loaded(self, frames_key, frames):
+		"""
+		Gets called in the user interface thread when load_frames_worker()
+		is done. Stores the dataframes if they are still current and updates
+		the interactive plot.
+		"""
+		# The window may have been closed in the meantime.
+		if not self:
+			return
+
+		# Discard the dataframes if the user or the images changed in the 
+		# meantime, get_frames() then loads them again.
+		if self.frames_loading == frames_key:
+			self.frames_loading = None
+		if frames_key != (self.username, self.image_generation):
+			return
+
+		# Store dataframes and update the interactive plot.
+		self.frames = frames
+		self.frames_key = frames_key
+		if self.interactive_checkbox.IsChecked():
+			self.update_image()
+
+	def update_canvas(self, language, plot):
+		"""
+		Assumes `language` and `plot` are the selected language and plot as
+		shown in the dropdowns. Shows the series of the plot in the 
+		interactive plot.
+		"""
+		# Clear the interactive plot while the dataframes are loaded, it is
+		# updated once they are loaded.
+		frames = self.get_frames()
+		if frames is None:
+			self.plot_canvas.clear()
+			return
+
+		# Get dataframe and column of the plot.
+		df = frames.get(language)
+		plot_name = plot.lower().replace(" ", "_")
+		column = cat.PLOT_SPECS[plot_name]["column"]
+		if df is None or not column in df.columns:
+			self.logger.log_error(f"Failed to show interactive plot " \
+				f"`{plot}` for language `{language}`: data not available!")
+			self.plot_canvas.clear()
+			return
+
+		# Show series.
+		self.plot_canvas.set_data(df["seconds_since_epoch"].to_numpy(), \
+			df[column].to_numpy(), plot_name)
+
+	def rescale_image(self, high_quality=True):
 		"""
 		Scales the set plot_image to match either the width or the height of
-		the plot_sizer, whichever makes the image be entirely visible.
+		the plot_sizer, whichever makes the image be entirely visible. High
+		quality scaled bitmaps are cached per user, language, plot and size,
+		so returning to a previous plot or size does not scale again. If
+		`high_quality` is False a cheap preview scale is used, which is not
+		cached.
 		"""
+		# There is nothing to scale if the image could not be decoded.
+		if self.plot_image is None:
+			return
+
 		# Get width and height of plot sizer.
 		sizer_width, sizer_height = self.plot_sizer.GetSize()
 
@@ -376,14 +1026,35 @@ class MainWindow(wx.Frame):
 		# Check if scaling by height makes the image not too wide.
 		if sh_image_width <= sizer_width:
 			# Scale to match height.
-			image = self.plot_image.Scale(sh_image_width, sh_image_height)
+			width, height = sh_image_width, sh_image_height
 		# Check if scaling by width makes the image not too tall.
 		else:
 			# Scale to match width.
-			image = self.plot_image.Scale(sw_image_width, sw_image_height)
+			width, height = sw_image_width, sw_image_height
+
+		# Images cannot be scaled to an empty size.
+		if width <= 0 or height <= 0:
+			return
+
+		# Get the scaled bitmap from the cache.
+		key = (*self.plot_image_key, width, height)
+		bitmap = self.bitmap_cache.get(key)
+
+		# Scale the image if the bitmap was not cached.
+		if bitmap is None and high_quality:
+			with self.logger.timer("rescale_image"):
+				image = self.plot_image.Scale(width, height, \
+					wx.IMAGE_QUALITY_HIGH)
+				bitmap = wx.Bitmap(image)
+			self.bitmap_cache.put(key, bitmap)
+		elif bitmap is None:
+			with self.logger.timer("rescale_image_preview"):
+				image = self.plot_image.Scale(width, height, \
+					wx.IMAGE_QUALITY_NORMAL)
+				bitmap = wx.Bitmap(image)
 
 		# Update the bitmap image component of the plot_image_holder.
-		self.plot_image_holder.SetBitmap(wx.Bitmap(image))
+		self.plot_image_holder.SetBitmap(bitmap)
 
 	def regenerate_plots_event(self, event):
 		"""
@@ -394,26 +1065,158 @@ class MainWindow(wx.Frame):
 		# Regenerate plots.
 		self.regenerate_plots()
 
-	def regenerate_plots(self, called_from_constructor=False):
+	def regenerate_plots(self, show_loading_screen=True):
 		"""
 		Creates the plot images and saves them to the folder 
-		figures/{self.username}. The `after_creation` flag serves to indicate
-		whether this function is called from the Frame constructor or from an
-		event. If this function is called from the Frame constructor it does 
-		not need to reload the images and update the image, because this is 
-		done separately at specific moments in the constructor.
-		"""
-		# Load data, returns false if the userfolder does not exist.
-		lang_dict = gp.load_data(self.username, self.logger)
-		# Update user_data_ok variable.
-		self.user_data_ok = not not lang_dict
-		# If the data is not ok, show dialog and don't try to export.
-		if self.user_data_ok:
-			# Add time in seconds since epoch column.
-			lang_dict = gp.add_time_column(lang_dict, self.logger)
-			# Export plots as images.
-			gp.export_plots(lang_dict, self.username, self.logger)
-		else:
+		figures/{self.username} in a background thread, so the window keeps
+		responding. Plots of languages whose data did not change since the 
+		last run are not regenerated. If `show_loading_screen` is True, a 
+		loading screen shows the progress and allows cancelling. Once the 
+		thread is done, on_regenerate_done() reloads the images, and 
+		initializes the user interface if this is the first regeneration.
+		"""
+		# Do not start a second regeneration while one is running.
+		if self.regeneration_thread is not None:
+			return
+
+		# Disable the `Regenerate plots` button and the user dropdown while 
+		# regenerating.
+		if self.ui_initialized:
+			self.regen_plots_button.Disable()
+			self.user_select_dropdown.Disable()
+
+		# Clear pending regeneration and show loading screen.
+		self.regeneration_pending = False
+		self.cancel_regeneration = threading.Event()
+		if show_loading_screen:
+			self.loading_screen = ls.LoadingScreen(self, \
+				self.cancel_regeneration.set)
+
+		# Start background thread.
+		self.regeneration_thread = threading.Thread( \
+			target=self.regenerate_plots_worker, \
+			args=(self.username, self.cancel_regeneration), daemon=True)
+		self.regeneration_thread.start()
+
+	def regenerate_plots_worker(self, username, cancel_event):
+		"""
+		Runs in the background regeneration thread. Loads the data and 
+		exports the plots, posts progress updates and the result back to the
+		user interface thread using wx.CallAfter(), as wx components may only
+		be changed from the user interface thread. The result is always
+		posted, it is None if regenerating failed with an error. The images
+		rendered to memory and waiting to be saved are limited to 
+		DECODED_IMAGE_CACHE_BYTES, further images are saved right away.
+		"""
+		# Initialize dictionary for the images rendered to memory.
+		images = {} if RENDER_IN_MEMORY else None
+
+		# Load data and export plots for the languages whose data changed,
+		# returns false if the userfolder does not exist. Catch any error, so
+		# the user interface is not left waiting for the result.
+		result = None
+		try:
+			# Imported here, so matplotlib, numpy and pandas are imported in
+			# this thread after the window is shown.
+			import generate_plots as gp
+
+			# Hold the data lock, so the dataframes are not loaded for the
+			# interactive plot at the same time.
+			with self.data_lock:
+				result = gp.regenerate_plots(username, self.logger, \
+					progress=lambda done, total: wx.CallAfter( \
+					self.on_regenerate_progress, done, total), \
+					cancel_event=cancel_event, images=images, \
+					images_max_bytes=DECODED_IMAGE_CACHE_BYTES, \
+					on_persisted=lambda saved: wx.CallAfter( \
+					self.on_images_persisted, username, images, saved))
+		except Exception as e:
+			self.logger.log_error(f"Failed to regenerate plots for user " \
+				f"`{username}`: {e}")
+		finally:
+			# Post result to the user interface thread.
+			wx.CallAfter(self.on_regenerate_done, result, \
+				cancel_event.is_set(), images)
+
+	def on_images_persisted(self, username, images, saved):
+		"""
+		Gets called in the user interface thread once the images rendered to
+		memory in `images` have been saved, `saved` maps the language and 
+		plot name of every saved image to its path. Removes the saved arrays
+		from `images`, so on_regenerate_done() loads them from disk if it 
+		runs after this, and replaces the arrays which are still installed
+		in the loaded images of the user by their paths. The arrays are 
+		released and the images are decoded from disk when needed, counting
+		against the decoded image cache.
+		"""
+		# The window may have been closed in the meantime.
+		if not self:
+			return
+
+		# Remove the saved arrays from the rendered images.
+		arrays = []
+		for (lang, plot_name), path in saved.items():
+			array = images.get(lang, {}).pop(plot_name, None)
+			if array is not None:
+				arrays.append((array, path))
+
+		# The images of the user may have been forgotten in the meantime.
+		if not username in self.user_plots:
+			return
+
+		# Replace the installed arrays by their paths. Arrays of images
+		# which were reloaded since are not installed anymore.
+		plots_dict, _ = self.user_plots[username]
+		for plots in plots_dict.values():
+			for plot, source in plots.items():
+				for array, path in arrays:
+					if source is array:
+						plots[plot] = path
+						break
+
+	def on_regenerate_progress(self, done, total):
+		"""
+		Gets called in the user interface thread when the regeneration thread
+		reports progress. Updates the loading screen.
+		"""
+		# The window may have been closed in the meantime.
+		if not self:
+			return
+
+		# Update the loading screen if it is still shown.
+		if self.loading_screen is not None:
+			self.loading_screen.update_progress(done, total)
+
+	def on_regenerate_done(self, result, cancelled, images=None):
+		"""
+		Gets called in the user interface thread when the regeneration thread
+		is done. Closes the loading screen, shows a dialog if the user data 
+		was not ok, and otherwise swaps in the new images, using the images
+		rendered to memory in `images` where available. `result` is the 
+		return value of generate_plots.regenerate_plots(), or None if it
+		failed with an error. If no plots were rebuilt or regenerating 
+		failed, and the images of the user are still loaded, they are kept.
+		If the user interface has not been initialized yet, it is initialized
+		and the window is shown, or the window is closed if there is nothing
+		to show.
+		"""
+		# The window may have been closed in the meantime.
+		if not self:
+			return
+
+		# Reset regeneration state and close the loading screen.
+		self.regeneration_thread = None
+		self.cancel_regeneration = None
+		if self.loading_screen is not None:
+			self.loading_screen.Destroy()
+			self.loading_screen = None
+
+		# Update user_data_ok variable, false if the userfolder does not
+		# exist.
+		self.user_data_ok = result is not False
+
+		# If the data is not ok, show dialog.
+		if not self.user_data_ok:
 			# Show dialog that the data was not ok.
 			userfolder_not_exist_dialog = \
 				wx.MessageDialog(parent=self, \
@@ -423,11 +1226,44 @@ class MainWindow(wx.Frame):
 					caption="Failed to load data files", style=wx.OK)
 			userfolder_not_exist_dialog.ShowModal()
 
-		# If not called from the constructor, reload the images and update the
-		# image on the screen.
-		if not called_from_constructor:
-			# Reload the images.
-			self.load_images()
-
-			# Update the image.
-			self.update_image()
\ No newline at end of file
+			# Close the window if the user interface was never initialized.
+			if not self.ui_initialized:
+				self.Close()
+			else:
+				self.regen_plots_button.Enable()
+				self.user_select_dropdown.Enable()
+			return
+
+		if cancelled:
+			self.logger.log_info("Regenerating plots cancelled")
+
+		# Reload the images, the new images are swapped in at once. Keep the
+		# loaded images if nothing changed or regenerating failed, the 
+		# images on disk are shown if none are loaded.
+		rebuilt = result is not None and result["rebuilt"] > 0
+		if rebuilt or not self.username in self.user_plots:
+			with self.logger.timer("load_images"):
+				self.load_images(images=images)
+
+		# If this was the first regeneration, initialize the user interface
+		# and show the window.
+		if not self.ui_initialized:
+			# Close the window if there are no images to show.
+			if len(self.plots_dict) == 0:
+				self.logger.log_error("No plot images to show for user " \
+					f"`{self.username}`!")
+				self.Close()
+				return
+
+			# Init UI and show window.
+			self.show_window()
+		else:
+			# Enable the `Regenerate plots` button and user dropdown again,
+			# and update the dropdown options and the image.
+			self.regen_plots_button.Enable()
+			self.user_select_dropdown.Enable()
+			self.update_dropdowns()
+
+		# Regenerate again if the data changed during the regeneration.
+		if self.regeneration_pending:
+			self.regenerate_plots(show_loading_screen=False)
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# The modules in `src/` import each other by name, as the application is run
+# from within that folder.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), \
+	"..", "src"))
+
+@pytest.fixture
+def user_folder(tmp_path, monkeypatch):
+	"""
+	Assumes the test works on the data of user `user`. Changes the working
+	directory to a temporary folder and returns the path of the data folder
+	of user `user` within it.
+	"""
+	monkeypatch.chdir(tmp_path)
+	folder = tmp_path / "data" / "user"
+	folder.mkdir(parents=True)
+	return folder
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+import generate_plots as gp
+from logger import Logger, LogLevel
+
+def make_frame(days):
+	"""
+	Returns a dataframe with the METRIC_INPUT_COLUMNS for `days` consecutive
+	days since gp.EPOCH_DATE.
+	"""
+	day = np.arange(days, dtype=np.int64)
+	return pd.DataFrame({"seconds_since_epoch": day * 86400, \
+		"daily_xp": day % 3, "total_xp": day * 10, \
+		"total_words_learned": day * 2, "level": day // 10 + 1})
+
+def test_metrics_of_least_recently_used_users_are_forgotten(monkeypatch):
+	monkeypatch.setattr(gp, "_derived_metrics_cache", gp.OrderedDict())
+	monkeypatch.setattr(gp, "DERIVED_METRICS_CACHE_USERS", 2)
+	logger = Logger(LogLevel.ERROR)
+
+	for user in ["ann", "bob", "cat", "bob"]:
+		gp.derive_metrics({"en": make_frame(10)}, user, logger)
+
+	assert list(gp._derived_metrics_cache.keys()) == ["cat", "bob"]
+
+def test_metrics_are_derived_from_the_columns_they_need(monkeypatch):
+	monkeypatch.setattr(gp, "_derived_metrics_cache", gp.OrderedDict())
+	df = make_frame(10).drop(columns=["level"])
+
+	df = gp.derive_metrics({"en": df}, "user", Logger(LogLevel.ERROR))["en"]
+
+	assert not "xp_per_level" in df.columns
+	for metric in ["xp_7_day_average", "xp_30_day_average", "streak", \
+		"words_per_day"]:
+		assert metric in df.columns
+	assert df["streak"].tolist() == [0, 1, 2, 0, 1, 2, 0, 1, 2, 0]
+
+def test_appended_rows_match_a_full_computation(monkeypatch):
+	monkeypatch.setattr(gp, "_derived_metrics_cache", gp.OrderedDict())
+	logger = Logger(LogLevel.ERROR)
+	gp.derive_metrics({"en": make_frame(40).drop(columns=["level"])}, \
+		"user", logger)
+
+	df = gp.derive_metrics({"en": make_frame(50).drop(columns=["level"])}, \
+		"user", logger)["en"]
+
+	columns = {column: df[column].to_numpy() \
+		for column in gp.METRIC_INPUT_COLUMNS if column in df.columns}
+	for metric, values in gp.compute_derived_metrics(columns).items():
+		np.testing.assert_allclose(df[metric].to_numpy(), values)
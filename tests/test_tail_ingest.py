@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+import generate_plots as gp
+from logger import Logger, LogLevel
+
+HEADER = "date;daily_xp;total_xp;total_words_learned;level\n"
+
+def make_rows(first_day, amount, with_date=True):
+	"""
+	Returns `amount` csv rows starting at day `first_day` of January 2020,
+	without the date column if `with_date` is False.
+	"""
+	rows = ""
+	for day in range(first_day, first_day + amount):
+		date = f"{day + 1:02d}-01-2020;" if with_date else ""
+		rows += f"{date}{day};{day * 10};{day * 2};{day // 10}\n"
+	return rows
+
+def load(logger):
+	"""
+	Returns the dataframe of the language `en` of user `user` loaded from
+	the current working directory, updating the frame cache.
+	"""
+	lang_dict = gp.load_data("user", logger, use_cache=True)
+	lang_dict = gp.add_time_column(lang_dict, logger)
+	gp.save_cached_frames(lang_dict, "user", logger)
+	return lang_dict["en"]
+
+def appended_messages(logger):
+	"""
+	Returns the messages of the logger reporting appended rows.
+	"""
+	return [message for _, _, message in logger.messages \
+		if "appended rows" in message]
+
+@pytest.fixture
+def data_file(user_folder):
+	"""
+	Returns the path of the data file of the language `en` of user `user` in
+	the temporary working directory.
+	"""
+	return user_folder / "en.csv"
+
+def test_append_reads_only_the_new_rows(data_file):
+	data_file.write_text(HEADER + make_rows(0, 5))
+	load(Logger(LogLevel.ERROR))
+	appended = make_rows(5, 2)
+	with open(data_file, "a") as file:
+		file.write(appended)
+
+	logger = Logger(LogLevel.ERROR)
+	df = load(logger)
+
+	assert appended_messages(logger) == ["Read 2 appended rows from " \
+		f"`data/user/en.csv` ({len(appended)} bytes)"]
+	assert df["daily_xp"].tolist() == list(range(7))
+	assert np.all(np.diff(df["seconds_since_epoch"].to_numpy()) == 86400)
+
+@pytest.mark.parametrize("rewrite", [
+	lambda text: text.replace("daily_xp", "xp_today"),
+	lambda text: HEADER + make_rows(0, 4),
+	lambda text: HEADER + make_rows(0, 4) + make_rows(9, 2)
+], ids=["header changed", "truncated", "last row rewritten"])
+def test_changed_file_is_read_entirely(data_file, rewrite):
+	data_file.write_text(HEADER + make_rows(0, 5))
+	load(Logger(LogLevel.ERROR))
+	data_file.write_text(rewrite(data_file.read_text()))
+
+	logger = Logger(LogLevel.ERROR)
+	df = load(logger)
+
+	assert appended_messages(logger) == []
+	assert len(df) == len(data_file.read_text().splitlines()) - 1
+
+def test_append_to_file_without_dates_reconstructs_dates(data_file):
+	header = HEADER.replace("date;", "")
+	data_file.write_text(header + make_rows(0, 5, with_date=False))
+	before = load(Logger(LogLevel.ERROR))
+	with open(data_file, "a") as file:
+		file.write(make_rows(5, 2, with_date=False))
+
+	logger = Logger(LogLevel.ERROR)
+	df = load(logger)
+
+	assert len(appended_messages(logger)) == 1
+	assert not any("Failed" in message for _, _, message in logger.messages)
+	assert df["daily_xp"].tolist() == list(range(7))
+	assert df["date"].iloc[-1] == before["date"].iloc[-1]
+	assert df["seconds_since_epoch"].iloc[-1] == \
+		before["seconds_since_epoch"].iloc[-1]
+	assert np.all(np.diff(df["seconds_since_epoch"].to_numpy()) == 86400)
+
+@pytest.mark.parametrize("append_only_ingest", [True, False])
+def test_rows_appended_before_saving_are_read(data_file, monkeypatch, \
+	append_only_ingest):
+	monkeypatch.setattr(gp, "APPEND_ONLY_INGEST", append_only_ingest)
+	data_file.write_text(HEADER + make_rows(0, 2))
+	logger = Logger(LogLevel.ERROR)
+	lang_dict = gp.load_data("user", logger, use_cache=True)
+	with open(data_file, "a") as file:
+		file.write(make_rows(2, 1))
+	gp.save_cached_frames(gp.add_time_column(lang_dict, logger), "user", \
+		logger)
+	with open(data_file, "a") as file:
+		file.write(make_rows(3, 1))
+
+	df = load(Logger(LogLevel.ERROR))
+
+	assert df["daily_xp"].tolist() == list(range(4))
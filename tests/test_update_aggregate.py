@@ -0,0 +1,91 @@
+import os
+
+import pandas as pd
+import pytest
+
+import generate_plots as gp
+from logger import Logger, LogLevel
+
+HEADER = "date;daily_xp;total_xp;total_words_learned;level\n"
+
+def write_language(lang, first_day, amount):
+	"""
+	Writes the data file of language `lang` of user `user` with `amount`
+	rows starting at day `first_day` of January 2020.
+	"""
+	rows = ""
+	for day in range(first_day, first_day + amount):
+		rows += f"{day + 1:02d}-01-2020;{day};{day * 10};{day * 2};1\n"
+	with open(f"data/user/{lang}.csv", "w") as file:
+		file.write(HEADER + rows)
+
+def recompute(langs):
+	"""
+	Returns the aggregate of `langs` computed from scratch, without the
+	aggregate cache.
+	"""
+	os.remove(gp.get_aggregate_cache_path("user"))
+	return gp.update_aggregate("user", langs, Logger(LogLevel.ERROR))
+
+def updates(logger):
+	"""
+	Returns the messages of the logger reporting aggregate updates.
+	"""
+	return [message for _, _, message in logger.messages \
+		if message.startswith("Updating aggregate")]
+
+@pytest.fixture
+def user(user_folder):
+	"""
+	Writes the data files of the languages `de` and `fr` of user `user` in
+	the temporary working directory, and caches their aggregate.
+	"""
+	write_language("de", 0, 10)
+	write_language("fr", 5, 10)
+	gp.update_aggregate("user", ["de", "fr"], Logger(LogLevel.ERROR))
+
+def test_unchanged_languages_use_the_cache(user):
+	logger = Logger(LogLevel.ERROR)
+
+	aggregate = gp.update_aggregate("user", ["de", "fr"], logger)
+
+	assert updates(logger) == []
+	pd.testing.assert_frame_equal(aggregate, recompute(["de", "fr"]))
+
+def test_added_language(user):
+	write_language("es", 12, 10)
+	logger = Logger(LogLevel.ERROR)
+
+	aggregate = gp.update_aggregate("user", ["de", "es", "fr"], logger)
+
+	assert updates(logger) == ["Updating aggregate for user `user` " \
+		"(1 languages changed, 0 removed)"]
+	pd.testing.assert_frame_equal(aggregate, recompute(["de", "es", "fr"]))
+
+def test_changed_language(user):
+	write_language("fr", 3, 20)
+	logger = Logger(LogLevel.ERROR)
+
+	aggregate = gp.update_aggregate("user", ["de", "fr"], logger)
+
+	assert updates(logger) == ["Updating aggregate for user `user` " \
+		"(1 languages changed, 0 removed)"]
+	pd.testing.assert_frame_equal(aggregate, recompute(["de", "fr"]))
+
+def test_removed_language(user):
+	os.remove("data/user/de.csv")
+	logger = Logger(LogLevel.ERROR)
+
+	aggregate = gp.update_aggregate("user", ["fr"], logger)
+
+	assert updates(logger) == ["Updating aggregate for user `user` " \
+		"(0 languages changed, 1 removed)"]
+	pd.testing.assert_frame_equal(aggregate, recompute(["fr"]))
+	assert aggregate["total_xp"].tolist() == \
+		[day * 10 for day in range(5, 15)]
+
+def test_removing_all_languages_returns_none(user):
+	os.remove("data/user/de.csv")
+	os.remove("data/user/fr.csv")
+
+	assert gp.update_aggregate("user", [], Logger(LogLevel.ERROR)) is None
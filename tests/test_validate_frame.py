@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+import generate_plots as gp
+
+def make_frame(days, **columns):
+	"""
+	Returns a dataframe with the `seconds_since_epoch` column of the given
+	days since gp.EPOCH_DATE and the other columns in `columns`.
+	"""
+	return pd.DataFrame({"seconds_since_epoch": \
+		np.asarray(days, dtype=np.int64) * 86400, **columns})
+
+def test_cumulative_dip_with_partial_recovery_is_quarantined():
+	df = make_frame(range(5), total_xp=[10, 20, 5, 15, 30])
+
+	validated, findings = gp.validate_frame(df)
+
+	assert validated["total_xp"].tolist() == [10, 20, 30]
+	assert validated["seconds_since_epoch"].tolist() == [0, 86400, 86400 * 4]
+	assert findings == {"rows quarantined with decreasing `total_xp`": 2}
+
+def test_cumulative_columns_never_decrease_after_validation():
+	rng = np.random.default_rng(0)
+	df = make_frame(range(1000), total_xp=rng.integers(0, 100, size=1000), \
+		level=rng.integers(0, 10, size=1000))
+
+	validated, _ = gp.validate_frame(df)
+
+	for column in ["total_xp", "level"]:
+		assert np.all(np.diff(validated[column].to_numpy()) >= 0)
+
+def test_duplicate_dates_keep_last_row():
+	df = make_frame([0, 1, 1, 2], total_xp=[1, 2, 3, 4])
+
+	validated, findings = gp.validate_frame(df)
+
+	assert validated["total_xp"].tolist() == [1, 3, 4]
+	assert findings == {"rows quarantined with a duplicate date": 1}
+
+def test_backwards_dates_are_quarantined_if_shift_does_not_help():
+	df = make_frame([10, 11, 2, 12], total_xp=[1, 2, 3, 4])
+
+	validated, findings = gp.validate_frame(df)
+
+	assert validated["seconds_since_epoch"].tolist() == \
+		[86400 * 10, 86400 * 11, 86400 * 12]
+	assert findings == {"rows quarantined with a date earlier than a " \
+		"previous date": 1}
+
+def test_negative_daily_xp_is_set_to_zero():
+	df = make_frame(range(3), daily_xp=[5, -3, 7])
+
+	validated, findings = gp.validate_frame(df)
+
+	assert validated["daily_xp"].tolist() == [5, 0, 7]
+	assert findings == {"negative daily experience set to 0": 1}